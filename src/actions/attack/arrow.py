@@ -29,13 +29,11 @@ class ArrowAction(SplitDamageAction):
         if not enough_ammo:
             raise Impossible(f"Not enough arrows!")
         
-        targets = []
         neighbor_tiles = self.engine.game_map.get_neighbors_at_elevations(self.entity.x,
                                                                           self.entity.y,
                                                                           elevations='all')
         neighbor_tiles.append((entity.x, entity.y))
-        for tile_x, tile_y in neighbor_tiles:
-            targets.extend(self.engine.game_map.get_targets_at_location(tile_x, tile_y))
+        targets = self.engine.game_map.get_targets_in_region(neighbor_tiles)
         if self.entity in targets:
             targets.remove(self.entity)
         if len(targets) < 1:
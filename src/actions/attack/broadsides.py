@@ -35,11 +35,8 @@ class BroadsideAction(SplitDamageAction):
                 enough_ammo = False
         if not enough_ammo:
             raise Impossible(f"Not enough ammo to fire {direction.name.lower().capitalize()} Broadsides")
-        targets = []
         hexes = get_cone_target_hexes_at_location(entity.x, entity.y, entity.facing, direction, distance)
-        for x, y in hexes:
-            if (x, y) in entity.view.fov:
-                targets.extend(self.engine.game_map.get_targets_at_location(x, y))
+        targets = self.engine.game_map.get_targets_in_region([(x, y) for x, y in hexes if (x, y) in entity.view.fov])
         if self.entity in targets:
             targets.remove(self.entity)
         if len(targets) < 1:
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from actions.base.base import Action
+from constants.enums import ProfileKeys
+
+if TYPE_CHECKING:
+    from entity import Entity
+
+profile_paths = ('data/profile.csv', 'data/profile.json')
+
+
+class ProfileAction(Action):
+    def __init__(self, entity: Entity, event: ProfileKeys):
+        """
+        this action shows or hides the profiler overlay, or writes the profiler timings to files - no time passes
+        :param entity: acting Entity
+        :param event: ProfileKeys overlay or export
+        """
+        self.event = event
+        super().__init__(entity)
+    
+    def perform(self) -> bool:
+        profiler = self.engine.profiler
+        if self.event == ProfileKeys.OVERLAY:
+            profiler.show = not profiler.show
+            self.engine.mark_dirty('status')
+        else:
+            for file_path in profile_paths:
+                profiler.export(file_path)
+            self.engine.message_log.add_message(f"Profile written to {' and '.join(profile_paths)}",
+                                                text_color='gray')
+        return False
@@ -44,11 +44,8 @@ class Scryer(Action):
                                                      self.entity.y,
                                                      elevation=Elevation.ALL,
                                                      mist_view=distance)
-        for (x, y) in visible_tiles:
-            if self.entity.name == "Player" \
-                    and self.entity.game_map.in_bounds(x, y) \
-                    and not self.entity.game_map.terrain[x][y].explored:
-                self.entity.game_map.terrain[x][y].explored = True
+        if self.entity.name == "Player":
+            self.entity.game_map.terrain.mark_explored(visible_tiles)
         
         self.engine.message_log.add_message(f"{self.crewman.name} views from on high!", text_color='yellow')
         self.engine.message_log.add_message(f"Used 1 {used}")
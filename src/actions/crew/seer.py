@@ -45,11 +45,8 @@ class Seer(Action):
                                                      self.entity.y,
                                                      elevation=Elevation.ALL,
                                                      mist_view=distance)
-        for (x, y) in visible_tiles:
-            entities = self.entity.game_map.get_targets_at_location(x, y)
-            for entity in entities:
-                if entity.is_alive:
-                    self.entity.view.fov.add((x, y))
+        for entity in self.entity.game_map.get_targets_in_region(visible_tiles):
+            self.entity.view.fov.add((entity.x, entity.y))
         
         self.engine.message_log.add_message(f"{self.crewman.name} connects with enemy minds!", text_color='yellow')
         self.engine.message_log.add_message(f"Used 1 {used}")
@@ -0,0 +1,3 @@
+"""
+Benchmarks of world generation and the turn pipeline on seeded maps - see __main__ for usage
+"""
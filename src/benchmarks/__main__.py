@@ -0,0 +1,82 @@
+"""
+usage, from the src directory:
+    python -m benchmarks run [--sizes 48 128 512] [--densities default dense] [--cases get_fov end_turn]
+                             [--budget 2.0] [--out run.json]
+    python -m benchmarks compare base.json new.json [--threshold 0.1]
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import sys
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from json import dump, load
+
+import pygame
+
+from benchmarks.cases import case_calls, cases
+from benchmarks.fixtures import Fixture, densities, fixture_seed, sizes
+from benchmarks.runner import compare, environment, format_comparison, format_results, measure
+
+
+def run(args) -> int:
+    pygame.init()
+    results = {}
+    for size in args.sizes:
+        for density in args.densities:
+            with redirect_stdout(sys.stderr):  # the engine prints its seed
+                fixture = Fixture(size, density, args.seed)
+                for name in args.cases:
+                    print(f"{name}/{fixture.name}", end=' ', flush=True)
+                    result = measure(cases[name](fixture), case_calls[name], args.budget)
+                    results[f'{name}/{fixture.name}'] = result
+                    print(f"{result['p50_ms']:.3f} ms")
+    pygame.quit()
+    
+    print('\n'.join(format_results(results)))
+    if args.out:
+        with open(args.out, 'w') as out_file:
+            dump({'environment': environment(), 'seed': args.seed, 'results': results}, out_file, indent=4)
+    return 0
+
+
+def compare_runs(args) -> int:
+    with open(args.base) as base_file:
+        base = load(base_file)
+    with open(args.new) as new_file:
+        new = load(new_file)
+    rows, regressions = compare(base, new, args.threshold, args.metric)
+    print('\n'.join(format_comparison(rows, args.metric)))
+    if regressions:
+        print(f"{len(regressions)} of {len(rows)} benchmarks regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = ArgumentParser(prog='python -m benchmarks', description="Benchmark the Isles of Mist turn pipeline")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="time the benchmark cases on seeded maps")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=list(sizes))
+    run_parser.add_argument('--densities', nargs='+', choices=list(densities), default=['default'])
+    run_parser.add_argument('--cases', nargs='+', choices=list(cases), default=list(cases))
+    run_parser.add_argument('--seed', type=int, default=fixture_seed)
+    run_parser.add_argument('--budget', type=float, default=2.0, help="seconds of timed calls per case")
+    run_parser.add_argument('--out', help="json file for the results, to compare runs later")
+    compare_parser = commands.add_parser('compare', help="flag regressions between two runs")
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help="allowed slowdown, 0.1 for 10%%")
+    compare_parser.add_argument('--metric', default='p50_ms',
+                                choices=['mean_ms', 'min_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms'])
+    args = parser.parse_args()
+    
+    if args.command == 'run':
+        return run(args)
+    return compare_runs(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
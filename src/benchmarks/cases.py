@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from itertools import cycle
+from typing import Callable, Dict
+
+from benchmarks.fixtures import Fixture, densities
+from constants.constants import hunt_detour
+from constants.enums import Elevation
+from distance_field import DistanceField
+from game import new_game, serialize_game
+from headless import HeadlessClock
+from render.mini_map import mini_map_render
+from render.status_panel import status_panel_render
+from render.viewport import viewport_render
+from save_format import compress
+from save_journal import SaveJournal
+from utilities import get_distance
+
+sample_count = 64  # cells or cell pairs each case cycles through
+
+
+def generate(fixture: Fixture) -> Callable[[], None]:
+    def run():
+        new_game(fixture.ui_layout, seed=fixture.seed, clock=HeadlessClock(), width=fixture.size,
+                 height=fixture.size, entity_density=densities[fixture.density])
+    return run
+
+
+def fov(fixture: Fixture) -> Callable[[], None]:
+    game_map = fixture.game_map
+    distance = fixture.player.view.distance
+    cells = cycle(fixture.sample_cells(sample_count))
+    
+    def run():
+        x, y = next(cells)
+        game_map.get_fov(distance, x, y, Elevation.SHALLOWS)
+    return run
+
+
+def path(fixture: Fixture) -> Callable[[], None]:
+    game_map = fixture.game_map
+    pairs = cycle(zip(fixture.sample_cells(sample_count), fixture.sample_cells(sample_count)))
+    
+    def run():
+        (x, y), (target_x, target_y) = next(pairs)
+        game_map.get_path(x, y, target_x, target_y, 'water')
+    return run
+
+
+def distance_field(fixture: Fixture) -> Callable[[], None]:
+    game_map = fixture.game_map
+    distance = fixture.player.view.distance
+    # hunters only ask for a field while the target is in their view, so each target comes with a hunter in range
+    pairs = cycle(fixture.sample_hunts(sample_count, distance))
+    
+    def run():
+        (x, y), (hunter_x, hunter_y) = next(pairs)
+        # built directly, the game map would hand out cached fields
+        field = DistanceField.build(game_map, x, y, 'water')
+        field.reach(game_map, hunter_x, hunter_y, get_distance(hunter_x, hunter_y, x, y) + hunt_detour)
+    return run
+
+
+def roll_mist(fixture: Fixture) -> Callable[[], None]:
+    player, engine = fixture.restore()
+    game_map = engine.game_map
+    return lambda: game_map.weather.roll_mist(game_map)
+
+
+def end_turn(fixture: Fixture) -> Callable[[], None]:
+    player, engine = fixture.restore()
+    return engine.end_turn
+
+
+def save(fixture: Fixture) -> Callable[[], None]:
+    return lambda: serialize_game(fixture.engine, fixture.game_map, fixture.player)
+
+
+def autosave(fixture: Fixture) -> Callable[[], None]:
+    player, engine = fixture.restore()
+    game_map = engine.game_map
+    journal = SaveJournal()
+    full, body = journal.record(engine, game_map, player)
+    save_size = len(compress(body))  # the save writer compresses on its own thread, so only once here
+    
+    def run():
+        # a turn, then what Game.autosave does on the main thread - compare with end_turn for the journal's share
+        engine.end_turn()
+        journal.record(engine, game_map, player, save_size)
+    return run
+
+
+def load(fixture: Fixture) -> Callable[[], None]:
+    return fixture.restore
+
+
+def render_viewport(fixture: Fixture) -> Callable[[], None]:
+    engine = fixture.engine
+    return lambda: viewport_render(game_map=fixture.game_map, main_display=fixture.surface,
+                                   weather=fixture.game_map.weather, ui_layout=fixture.ui_layout, camera=engine.camera)
+
+
+def render_mini_map(fixture: Fixture) -> Callable[[], None]:
+    return lambda: mini_map_render(game_map=fixture.game_map, main_display=fixture.surface,
+                                   ui_layout=fixture.ui_layout)
+
+
+def render_status(fixture: Fixture) -> Callable[[], None]:
+    engine = fixture.engine
+    return lambda: status_panel_render(console=fixture.surface, entity=fixture.player,
+                                       weather=fixture.game_map.weather, time=engine.time,
+                                       ui_layout=fixture.ui_layout)
+
+
+def render_all(fixture: Fixture) -> Callable[[], None]:
+    engine = fixture.engine
+    
+    def run():
+        engine.mark_dirty()
+        engine.render_all(fixture.surface)
+    return run
+
+
+"""
+Benchmark cases by name, and the most calls each one is timed for - the runner stops early once a case has used up
+    its time budget
+"""
+cases: Dict[str, Callable[[Fixture], Callable[[], None]]] = {
+    'generate_map': generate,
+    'get_fov': fov,
+    'get_path': path,
+    'distance_field': distance_field,
+    'save_game': save,
+    'autosave': autosave,
+    'load_game': load,
+    'render_viewport': render_viewport,
+    'render_mini_map': render_mini_map,
+    'render_status': render_status,
+    'render_all': render_all,
+    'roll_mist': roll_mist,
+    'end_turn': end_turn,
+}
+case_calls = {
+    'generate_map': 5,
+    'get_fov': 500,
+    'get_path': 200,
+    'distance_field': 100,
+    'save_game': 50,
+    'autosave': 200,
+    'load_game': 50,
+    'render_viewport': 200,
+    'render_mini_map': 200,
+    'render_status': 200,
+    'render_all': 100,
+    'roll_mist': 200,
+    'end_turn': 200,
+}
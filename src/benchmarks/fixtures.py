@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from random import Random
+from typing import List, Tuple, TYPE_CHECKING
+
+from pygame import Surface
+
+from constants.constants import tile_size
+from game import new_game, restore_game, serialize_game
+from headless import HeadlessClock
+from save_format import decode
+from ui import DisplayInfo
+from utilities import get_distance
+
+if TYPE_CHECKING:
+    from engine import Engine
+    from entity import Entity
+
+"""
+Map sizes (width and height) and entity densities (map cells per spawned entity) the benchmarks run at
+"""
+sizes = (48, 128, 512)
+densities = {
+    'sparse': 200,
+    'default': 50,
+    'dense': 12,
+}
+fixture_seed = 8617
+
+
+class Fixture:
+    def __init__(self, size: int, density: str = 'default', seed: int = fixture_seed):
+        """
+        A seeded game for the benchmarks - the same size, density and seed always build the same world
+        :param size: int width and height of the map
+        :param density: str key of densities
+        :param seed: int map seed
+        """
+        self.size = size
+        self.density = density
+        self.seed = seed
+        self.ui_layout = DisplayInfo(size, size)
+        self.player, self.engine = new_game(self.ui_layout, seed=seed, clock=HeadlessClock(), width=size,
+                                            height=size, entity_density=densities[density])
+        self.game_map = self.engine.game_map
+        self.surface = Surface((self.ui_layout.display_width, self.ui_layout.display_height))
+        # the camera starts where it would settle after easing toward the player
+        self.engine.camera.x = self.player.x * tile_size
+        self.engine.camera.y = self.player.y * tile_size + ((self.player.x % 2) * tile_size // 2)
+        self.rng = Random(seed)  # picks benchmark inputs without touching the game's random generator
+        self.save_blob = serialize_game(self.engine, self.game_map, self.player)
+    
+    @property
+    def name(self) -> str:
+        return f'{self.size}x{self.size}/{self.density}'
+    
+    def sample_cells(self, count: int, elevations: str = 'water') -> List[Tuple[int, int]]:
+        """
+        Picks cells a movement class can enter, the same cells for every run of a fixture
+        :param count: int number of cells
+        :param elevations: str of Elevation lookup
+        :return: list of tuple (x, y) coordinates
+        """
+        height = self.game_map.height
+        cells = [divmod(index, height) for index, passable in enumerate(self.game_map.passable(elevations))
+                 if passable]
+        return [self.rng.choice(cells) for _ in range(count)]
+    
+    def sample_hunts(self, count: int, distance: int, elevations: str = 'water') -> List[Tuple[Tuple[int, int],
+                                                                                            Tuple[int, int]]]:
+        """
+        Picks target and hunter cell pairs a movement class can enter, the hunter within distance of the target
+        :param count: int number of pairs
+        :param distance: int most hexes between hunter and target
+        :param elevations: str of Elevation lookup
+        :return: list of tuple of (x, y) target and (x, y) hunter coordinates
+        """
+        game_map = self.game_map
+        targets = self.sample_cells(count, elevations)
+        hunts = []
+        for x, y in targets:
+            cells = [(hunter_x, hunter_y)
+                     for hunter_x in range(max(0, x - distance), min(game_map.width, x + distance + 1))
+                     for hunter_y in range(max(0, y - distance), min(game_map.height, y + distance + 1))
+                     if game_map.can_move_to(hunter_x, hunter_y, elevations)
+                     and get_distance(hunter_x, hunter_y, x, y) <= distance]
+            hunts.append(((x, y), self.rng.choice(cells)))
+        return hunts
+    
+    def restore(self) -> Tuple[Entity, Engine]:
+        """
+        Loads a copy of the game as it was generated, for cases that change the game - they then measure the same
+            turns whichever cases ran before them
+        :return: player Entity and Engine of the copy
+        """
+        data, terrain = decode(self.save_blob)
+        return restore_game(self.ui_layout, data, terrain)
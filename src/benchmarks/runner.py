@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import platform
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import pygame
+
+alloc_calls = 3  # calls traced by tracemalloc after the timed calls - tracing slows every allocation down
+min_calls = 3
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """
+    Nearest rank percentile
+    :param ordered: sorted list of values
+    :param fraction: float between 0 and 1
+    :return: float value, 0.0 for no values
+    """
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def measure(func: Callable[[], None], calls: int, budget: float) -> Dict:
+    """
+    Times a function, then traces the memory it allocates
+    :param func: function to benchmark, called with no arguments
+    :param calls: int most calls timed
+    :param budget: float seconds after which no more calls are timed, once min_calls were made
+    :return: dict of statistics, times in ms and memory in KiB
+    """
+    func()  # warm up caches the game keeps between frames and turns
+    
+    times = []
+    start = perf_counter()
+    while len(times) < calls and (len(times) < min_calls or perf_counter() - start < budget):
+        call_start = perf_counter()
+        func()
+        times.append((perf_counter() - call_start) * 1000)
+    
+    peaks = []
+    retained = []
+    tracemalloc.start()
+    for _ in range(alloc_calls):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        after, peak = tracemalloc.get_traced_memory()
+        peaks.append((peak - before) / 1024)
+        retained.append((after - before) / 1024)
+    tracemalloc.stop()
+    
+    ordered = sorted(times)
+    return {
+        'calls': len(times),
+        'total_ms': sum(times),
+        'mean_ms': sum(times) / len(times),
+        'min_ms': ordered[0],
+        'p50_ms': percentile(ordered, 0.5),
+        'p90_ms': percentile(ordered, 0.9),
+        'p99_ms': percentile(ordered, 0.99),
+        'max_ms': ordered[-1],
+        'alloc_peak_kib': max(peaks),
+        'alloc_retained_kib': sum(retained) / len(retained),
+    }
+
+
+def environment() -> Dict:
+    return {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+
+def compare(base: Dict, new: Dict, threshold: float, metric: str = 'p50_ms',
+            noise_ms: float = 0.05) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Compares two benchmark runs - a result is a regression when the new run is more than threshold slower, or
+        allocates more than threshold more at its peak. Differences under noise_ms are never regressions
+    :param base: dict of a benchmark run to compare against
+    :param new: dict of the benchmark run to check
+    :param threshold: float allowed slowdown, 0.1 for 10%
+    :param metric: str time statistic compared
+    :param noise_ms: float smallest time difference that counts
+    :return: list of rows for every result both runs have, and the rows that regressed
+    """
+    rows = []
+    regressions = []
+    for key, result in new['results'].items():
+        previous = base['results'].get(key)
+        if previous is None:
+            continue
+        ratio = result[metric] / previous[metric] if previous[metric] else 1.0
+        alloc_ratio = result['alloc_peak_kib'] / previous['alloc_peak_kib'] if previous['alloc_peak_kib'] else 1.0
+        row = {
+            'key': key,
+            'base': previous[metric],
+            'new': result[metric],
+            'ratio': ratio,
+            'alloc_ratio': alloc_ratio,
+            'regressed': (ratio > 1 + threshold and result[metric] - previous[metric] > noise_ms)
+                         or (alloc_ratio > 1 + threshold and result['alloc_peak_kib'] - previous['alloc_peak_kib'] > 1),
+        }
+        rows.append(row)
+        if row['regressed']:
+            regressions.append(row)
+    return rows, regressions
+
+
+def format_results(results: Dict[str, Dict]) -> Iterable[str]:
+    yield f"{'benchmark':<36}{'calls':>7}{'p50 ms':>11}{'p90 ms':>11}{'p99 ms':>11}{'max ms':>11}{'peak KiB':>11}"
+    for key, result in results.items():
+        yield f"{key:<36}{result['calls']:>7}{result['p50_ms']:>11.3f}{result['p90_ms']:>11.3f}" \
+              f"{result['p99_ms']:>11.3f}{result['max_ms']:>11.3f}{result['alloc_peak_kib']:>11.1f}"
+
+
+def format_comparison(rows: List[Dict], metric: str = 'p50_ms') -> Iterable[str]:
+    yield f"{'benchmark':<36}{'base ' + metric:>13}{'new ' + metric:>13}{'time':>9}{'memory':>9}"
+    for row in rows:
+        flag = '  REGRESSED' if row['regressed'] else ''
+        yield f"{row['key']:<36}{row['base']:>13.3f}{row['new']:>13.3f}{row['ratio']:>8.2f}x" \
+              f"{row['alloc_ratio']:>8.2f}x{flag}"
@@ -10,8 +10,9 @@ from actions.move.wander import WanderAction
 from utilities import get_distance, closest_rotation, get_neighbor
 
 if TYPE_CHECKING:
+    from distance_field import DistanceField
     from entity import Entity
-    from typing import Dict
+    from typing import Dict, Optional
 
 
 class BaseAI(Action):
@@ -77,12 +78,19 @@ class HostileEnemy(BaseAI):
         # in player in view, set new target location at player's location and generate distance map
         if (self.engine.player.x, self.engine.player.y) in self.entity.view.fov:
             self.target = (self.engine.player.x, self.engine.player.y)
-            # we have a target hex, find a path
+            # we have a target hex, find a path guided by the distance field every hunter of this target shares
+            distance_field = self.engine.game_map.get_distance_field(self.target[0],
+                                                                     self.target[1],
+                                                                     self.entity.elevations,
+                                                                     self.entity.x,
+                                                                     self.entity.y)
             self.path = self.engine.game_map.get_path(self.entity.x,
                                                       self.entity.y,
                                                       self.target[0],
                                                       self.target[1],
-                                                      self.entity.elevations)
+                                                      self.entity.elevations,
+                                                      facing=self.entity.facing,
+                                                      distance_field=distance_field)
             distance = get_distance(self.entity.x, self.entity.y, self.target[0], self.target[1])
             # if in view and close enough to melee attack
             if distance <= 1:
@@ -114,41 +122,17 @@ class HostileEnemy(BaseAI):
 
 
 class HostileFlyingEnemy(BaseAI):
-    def __init__(self, entity: Entity, target=None, distance_map=None):
+    def __init__(self, entity: Entity, target=None):
         super().__init__(entity)
         self.target = target
-        if distance_map is None:
-            self.distance_map = {}
-        else:
-            self.distance_map = distance_map.distance_map_from_json(distance_map)
+        self.distance_map: Optional[DistanceField] = None
     
     def to_json(self) -> Dict:
         return {
             'ai_cls': self.__class__.__name__,
-            'target': self.target,
-            'distance_map': self.dist_map_to_json()
-        }
-    
-    def dist_map_to_json(self):
-        keys = []
-        values = []
-        for key in self.distance_map.keys():
-            keys.append(key)
-            values.append(self.distance_map[key])
-        return {
-            'keys': keys,
-            'values': values
+            'target': self.target
         }
     
-    @staticmethod
-    def distance_map_from_json(json_dist_map):
-        distance_map = {}
-        keys = json_dist_map['keys']
-        values = json_dist_map['values']
-        for i in range(len(keys)):
-            distance_map[keys[i]] = values[i]
-        return distance_map
-    
     def perform(self) -> bool:
         """
         Hostile flyer will wander randomly until player is spotted, making that location its target
@@ -159,19 +143,19 @@ class HostileFlyingEnemy(BaseAI):
         """
         # if player is in port, stop hunting
         if (self.engine.player.x, self.engine.player.y) == self.engine.game_map.port:
-            self.distance_map = {}
+            self.distance_map = None
             return WanderAction(self.entity).perform()
         
-        # in player in view, set new target location at player's location and generate distance map
+        # in player in view, set new target location at player's location and fetch the shared distance map
         if (self.engine.player.x, self.engine.player.y) in self.entity.view.fov:
             target = (self.engine.player.x, self.engine.player.y)
             
             # we have a target hex, find a path
-            self.distance_map = self.engine.game_map.get_distance_map(self.entity.x,
-                                                                      self.entity.y,
-                                                                      target[0],
-                                                                      target[1],
-                                                                      self.entity.elevations)
+            self.distance_map = self.engine.game_map.get_distance_field(target[0],
+                                                                        target[1],
+                                                                        self.entity.elevations,
+                                                                        self.entity.x,
+                                                                        self.entity.y)
             distance = get_distance(self.entity.x, self.entity.y, target[0], target[1])
             # if in view and close enough to melee attack
             if distance <= 1:
@@ -180,27 +164,32 @@ class HostileFlyingEnemy(BaseAI):
             # elif distance <= entity.ranged_attacks and entity can_attack:
             #     return RangedAction
         
-        if len(self.distance_map.keys()) > 0:
+        if self.distance_map is not None:
             # find shortest distance neighbor
-            shortest = self.distance_map[self.entity.x, self.entity.y]
+            shortest = self.distance_map.distance(self.entity.x, self.entity.y)
+            if shortest is None:
+                # target can't be reached from here - give up the hunt
+                self.target = None
+                self.distance_map = None
+                return WanderAction(self.entity).perform()
             target = (self.entity.x, self.entity.y)
             for neighbor in self.engine.game_map.get_neighbors_at_elevations(self.entity.x,
                                                                              self.entity.y,
                                                                              self.entity.elevations):
-                if self.distance_map.get(neighbor) < shortest:
+                neighbor_distance = self.distance_map.distance(neighbor[0], neighbor[1])
+                if neighbor_distance is not None and neighbor_distance < shortest:
                     target = neighbor
-                    shortest = self.distance_map[neighbor]
+                    shortest = neighbor_distance
             
             # if we're facing the target hex:
             next_hex = get_neighbor(self.entity.x, self.entity.y, self.entity.facing)
-            if self.engine.game_map.in_bounds(next_hex[0], next_hex[1]) \
-                    and self.distance_map[next_hex] == shortest:
+            if self.distance_map.distance(next_hex[0], next_hex[1]) == shortest:
                 # just move forward
                 return MovementAction(self.entity).perform()  # and move to it
             # can't move forward, so lets rotate
             elif shortest == 0:
                 self.target = None
-                self.distance_map = {}
+                self.distance_map = None
                 return WanderAction(self.entity).perform()
             else:
                 return RotateAction(self.entity, closest_rotation(target,
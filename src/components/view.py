@@ -4,6 +4,7 @@ from typing import Dict, TYPE_CHECKING
 
 from components.base import BaseComponent
 from constants.enums import Elevation
+from fov import FovCache
 
 if TYPE_CHECKING:
     from entity import Entity
@@ -19,6 +20,7 @@ class View(BaseComponent):
         """
         self.distance = distance
         self.fov = {}
+        self.fov_cache = FovCache()
     
     def to_json(self) -> Dict:
         return {
@@ -40,15 +42,14 @@ class View(BaseComponent):
             elevation = Elevation.JUNGLE
         else:
             elevation = Elevation.SHALLOWS
-        visible_tiles = self.parent.game_map.get_fov(distance,
-                                                     self.parent.x,
-                                                     self.parent.y,
-                                                     elevation=elevation)
+        # entities that did not move and whose surroundings did not change reuse their last result
+        visible_tiles = set(self.fov_cache.get_fov(self.parent.game_map,
+                                                   distance,
+                                                   self.parent.x,
+                                                   self.parent.y,
+                                                   elevation=elevation))
         if self.parent.name != "Player" and self.parent.game_map.port.location in visible_tiles:
             visible_tiles.remove(self.parent.game_map.port.location)
-        for (x, y) in visible_tiles:
-            if self.parent.name == "Player" \
-                    and self.parent.game_map.in_bounds(x, y) \
-                    and not self.parent.game_map.terrain[x][y].explored:
-                self.parent.game_map.terrain[x][y].explored = True
+        if self.parent.name == "Player" and self.fov_cache.computed:
+            self.parent.game_map.terrain.mark_explored(visible_tiles)
         self.fov = visible_tiles
@@ -1,6 +1,6 @@
 from pygame import font
 
-from constants.enums import Elevation
+from constants.enums import Compression, Elevation, FramePolicy
 
 font.init()
 
@@ -16,6 +16,12 @@ message_count = 10
 
 time_tick = 2
 FPS = 30
+frame_policy = FramePolicy.BALANCED
+frame_stats_window = 300  # frames kept for frame time statistics
+save_compression = Compression.ZLIB
+journal_compaction = 100  # autosave journal entries between full saves
+profile_window = 300  # timings kept per profiled phase for percentiles and histograms
+hunt_detour = 12  # moves beyond the straight line distance a hunter's distance field first floods around obstacles
 
 wind_min_count = 25
 conditions_min_count = 50
@@ -162,3 +162,29 @@ class Elevation(Enum):
         if self.__class__ is other.__class__:
             return self.value != other.value
         return NotImplemented
+
+
+class FramePolicy(Enum):
+    """
+    Enum of frame scheduling policies, from lowest input latency to lowest power use
+    """
+    LATENCY = auto()
+    BALANCED = auto()
+    POWER = auto()
+
+
+class Compression(Enum):
+    """
+    Enum of save file compressions - values are written into save files, so they must never change
+    """
+    NONE = 0
+    ZLIB = 1
+    LZMA = 2
+
+
+class ProfileKeys(Enum):
+    """
+    Enum of the profiler keys - show or hide the overlay, write the timings to files
+    """
+    OVERLAY = auto()
+    EXPORT = auto()
@@ -1,4 +1,7 @@
-from pygame import image
+from collections.abc import Mapping
+from typing import Dict, Iterator
+
+from pygame import image, Surface
 from yaml import load, Loader
 
 
@@ -23,12 +26,39 @@ def get_images():
             for sprite in data['assets'][key]:
                 icon = image.load(f"assets/{key}/{sprite}.png")
                 image_dicts[key][sprite] = icon
-        _entity_icons = image_dicts['entities']
-        _terrain_icons = image_dicts['terrain']
-        _cargo_icons = image_dicts['cargo']
-        _misc_icons = image_dicts['misc']
     
-    return _entity_icons, _terrain_icons, _cargo_icons, _misc_icons
+    return image_dicts
+
+
+_image_dicts: Dict[str, Dict[str, Surface]] = {}
+
+
+class ImageGroup(Mapping):
+    def __init__(self, key: str):
+        """
+        Read only dict of the icons in one assets folder - every icon is loaded from disk the first time any icon
+            is looked up, so code that never draws (headless runs) never touches the assets
+        :param key: str assets folder name
+        """
+        self.key = key
+    
+    @property
+    def images(self) -> Dict[str, Surface]:
+        if not _image_dicts:
+            _image_dicts.update(get_images())
+        return _image_dicts[self.key]
+    
+    def __getitem__(self, name: str) -> Surface:
+        return self.images[name]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.images)
+    
+    def __len__(self) -> int:
+        return len(self.images)
 
 
-entity_icons, terrain_icons, cargo_icons, misc_icons = get_images()
+entity_icons = ImageGroup('entities')
+terrain_icons = ImageGroup('terrain')
+cargo_icons = ImageGroup('cargo')
+misc_icons = ImageGroup('misc')
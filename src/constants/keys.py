@@ -1,5 +1,5 @@
-from pygame import K_UP, K_DOWN, K_LEFT, K_RIGHT
-from constants.enums import KeyMod, Location, MenuKeys, ShipConfig, PortVisit
+from pygame import K_UP, K_DOWN, K_LEFT, K_RIGHT, K_F3, K_F4
+from constants.enums import KeyMod, Location, MenuKeys, ProfileKeys, ShipConfig, PortVisit
 
 
 MODIFIERS = {
@@ -58,3 +58,8 @@ REPAIR_KEYS = {
     K_LEFT: "crew",  # TODO: remove this once "hire crew" implemented in port_keys - this becomes tavern (for rumors)
     K_DOWN: "engineer",
 }
+
+PROFILE_KEYS = {
+    K_F3: ProfileKeys.OVERLAY,
+    K_F4: ProfileKeys.EXPORT,
+}
@@ -1,27 +1,55 @@
-from pygame import image
-from constants.constants import tile_size
+from collections.abc import Mapping
+from typing import Dict, Iterator, List
 
+from pygame import image, Surface
 
-sprite_sheet = image.load("assets/entities/sprite_sheet.png")
+from constants.constants import tile_size
 
 sprite_count = 4
 animation_speed = 2.0
 flicker_timer = 0.0
 sprite_image = 0
 
-bat_sprite = []
-serpent_sprite = []
-turtle_sprite = []
-mermaid_sprite = []
-for i in range(sprite_count):
-    bat_sprite.append(sprite_sheet.subsurface(i * tile_size, tile_size * 0, tile_size, tile_size))
-    serpent_sprite.append(sprite_sheet.subsurface(i * tile_size, tile_size * 1, tile_size, tile_size))
-    turtle_sprite.append(sprite_sheet.subsurface(i * tile_size, tile_size * 2, tile_size, tile_size))
-    mermaid_sprite.append(sprite_sheet.subsurface(i * tile_size, tile_size * 3, tile_size, tile_size))
-
-sprites = {
-    'turtle_sprite': turtle_sprite,
-    'serpent_sprite': serpent_sprite,
-    'bat_sprite': bat_sprite,
-    'mermaid_sprite': mermaid_sprite,
+"""
+Row of each animation on the sprite sheet
+"""
+sprite_rows = {
+    'bat_sprite': 0,
+    'serpent_sprite': 1,
+    'turtle_sprite': 2,
+    'mermaid_sprite': 3,
 }
+
+
+def get_sprites() -> Dict[str, List[Surface]]:
+    sprite_sheet = image.load("assets/entities/sprite_sheet.png")
+    return {name: [sprite_sheet.subsurface(i * tile_size, tile_size * row, tile_size, tile_size)
+                   for i in range(sprite_count)]
+            for name, row in sprite_rows.items()}
+
+
+_frames: Dict[str, List[Surface]] = {}
+
+
+class SpriteFrames(Mapping):
+    """
+    Read only dict of animation frames by sprite name - the sprite sheet is loaded the first time a sprite is looked up
+    """
+    
+    @property
+    def frames(self) -> Dict[str, List[Surface]]:
+        if not _frames:
+            _frames.update(get_sprites())
+        return _frames
+    
+    def __getitem__(self, name: str) -> List[Surface]:
+        return self.frames[name]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.frames)
+    
+    def __len__(self) -> int:
+        return len(self.frames)
+
+
+sprites = SpriteFrames()
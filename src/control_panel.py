@@ -38,13 +38,11 @@ def get_keys(key_mod: KeyMod, game_state: GameStates, player: Entity):
                     elif player.cargo.manifest[ammo_type] - ammo[ammo_type] < 0:
                         enough_ammo = False
                 enough_targets = True
-                targets = []
                 neighbor_tiles = player.game_map.get_neighbors_at_elevations(player.x,
                                                                              player.y,
                                                                              elevations='all')
                 neighbor_tiles.append((player.x, player.y))
-                for tile_x, tile_y in neighbor_tiles:
-                    targets.extend(player.game_map.get_targets_at_location(tile_x, tile_y))
+                targets = player.game_map.get_targets_in_region(neighbor_tiles)
                 if player in targets:
                     targets.remove(player)
                 if len(targets) < 1:
@@ -67,15 +65,13 @@ def get_keys(key_mod: KeyMod, game_state: GameStates, player: Entity):
                                 enough_ammo = False
                         if enough_ammo:
                             enough_targets = True
-                            targets = []
                             hexes = get_cone_target_hexes_at_location(player.x,
                                                                       player.y,
                                                                       player.facing,
                                                                       side,
                                                                       distance)
-                            for x, y in hexes:
-                                if (x, y) in player.view.fov:
-                                    targets.extend(player.game_map.get_targets_at_location(x, y))
+                            targets = player.game_map.get_targets_in_region(
+                                [(x, y) for x, y in hexes if (x, y) in player.view.fov])
                             if player in targets:
                                 targets.remove(player)
                             if len(targets) < 1:
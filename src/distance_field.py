@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from array import array
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game_map import GameMap
+
+
+class DistanceField:
+    def __init__(self, width: int, height: int, target: Tuple[int, int], elevations: str, distances: array,
+                 frontier: List[int] = None, head: int = 0):
+        """
+        Number of moves from the hexes around one target hex to that target for one movement class
+        The field is flooded outward only as far as the hunters using it need (see reach)
+        :param width: width of the game map
+        :param height: height of the game map
+        :param target: (x, y) coordinates the distances lead to
+        :param elevations: str of Elevation lookup the field was built for
+        :param distances: array of moves per cell id (x * height + y), -1 where the target cannot be reached
+            or the flood has not got to yet
+        :param frontier: list of cell ids in the order they were reached
+        :param head: int index in frontier of the next cell to expand
+        """
+        self.width = width
+        self.height = height
+        self.target = target
+        self.elevations = elevations
+        self.distances = distances
+        self.frontier = frontier if frontier is not None else []
+        self.head = head
+    
+    @staticmethod
+    def build(game_map: GameMap, target_x: int, target_y: int, elevations: str) -> DistanceField:
+        """
+        Starts a breadth first flood from the target over the hexes the movement class can enter
+            the target itself does not need to be enterable. Only the target is settled until reach is called
+        :param game_map: GameMap to flood
+        :param target_x: x int coordinate of target on game map
+        :param target_y: y int coordinate of target on game map
+        :param elevations: str of Elevation lookup
+        :return: DistanceField
+        """
+        height = game_map.height
+        distances = array('i', [-1]) * (game_map.width * height)
+        goal = target_x * height + target_y
+        distances[goal] = 0
+        return DistanceField(width=game_map.width, height=height, target=(target_x, target_y),
+                             elevations=elevations, distances=distances, frontier=[goal])
+    
+    def reach(self, game_map: GameMap, x: int, y: int, limit: int) -> Optional[int]:
+        """
+        Continues the flood until (x, y) is settled, no cell closer than limit moves is left to expand,
+            or everything the target can be reached from is settled
+        Breadth first order means every cell closer to the target than (x, y) is settled along with it,
+            so path_from can walk down from (x, y) once it is reached
+        :param game_map: GameMap the field was built on
+        :param x: x int coordinate of the hunter on game map
+        :param y: y int coordinate of the hunter on game map
+        :param limit: int most moves from the target to flood out to
+        :return: int moves from (x, y) to the target, or None if it is not reached within limit
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        cell = x * self.height + y
+        distances = self.distances
+        frontier = self.frontier
+        if distances[cell] < 0 and self.head < len(frontier):
+            table = game_map.neighbor_table
+            mask = game_map.passable(self.elevations)
+            head = self.head
+            while head < len(frontier):  # frontier grows while it is walked, so this is a queue without pops
+                current = frontier[head]
+                next_distance = distances[current] + 1
+                if next_distance > limit:
+                    break
+                for neighbor in table[6 * current:6 * current + 6]:
+                    if neighbor >= 0 and mask[neighbor] and distances[neighbor] < 0:
+                        distances[neighbor] = next_distance
+                        frontier.append(neighbor)
+                head += 1
+                if distances[cell] >= 0:
+                    break
+            self.head = head
+        return self.distance(x, y)
+    
+    @property
+    def flooded(self) -> bool:
+        """
+        :return: bool True once every cell the target can be reached from is settled
+        """
+        return self.head >= len(self.frontier)
+    
+    def distance(self, x: int, y: int) -> Optional[int]:
+        """
+        Returns the number of moves from (x, y) to the target
+        :param x: x int coordinate of game map
+        :param y: y int coordinate of game map
+        :return: int moves, or None if (x, y) is off the map, cannot reach the target or is not settled yet
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        distance = self.distances[x * self.height + y]
+        return distance if distance >= 0 else None
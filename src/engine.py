@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 import random
-from typing import Dict, TYPE_CHECKING
+from typing import Dict, List, Optional, Set, TYPE_CHECKING
 
-from pygame import Surface, time
+from pygame import Rect, Surface, time
 
 from actions.move.movement import MovementAction
 from camera import Camera
 from constants.constants import time_tick
-from constants.enums import GameStates
+from constants.enums import Conditions, GameStates
 from custom_exceptions import Impossible
 from event_handlers.cargo_config import CargoConfigurationHandler
 from event_handlers.crew_config import CrewConfigurationHandler
@@ -17,6 +17,7 @@ from event_handlers.merchant import MerchantHandler
 from event_handlers.player_dead import GameOverEventHandler
 from event_handlers.weapon_config import WeaponConfigurationHandler
 from message_log import MessageLog
+from profiler import Profiler
 from render.cargo import cargo_render
 from render.controls import control_panel_render
 from render.crew import crew_render
@@ -32,6 +33,7 @@ from time_of_day import Time
 from ui import DisplayInfo
 
 if TYPE_CHECKING:
+    from pygame.event import Event
     from entity import Entity
     from game_map import GameMap
 
@@ -45,19 +47,27 @@ class Engine:
                  message_log: MessageLog = None,
                  time_of_day: Time = None,
                  camera: Camera = None,
-                 game_state: GameStates = None):
+                 game_state: GameStates = None,
+                 clock: time.Clock = None):
         self.event_handler: MainEventHandler = MainEventHandler(self)
         self.player = player
         self.seed = random.randint(0, 10000) if seed is None else seed  # 8617
         self.mouse_location = (0, 0)
         self.ui_layout = ui_layout
         self.message_log = MessageLog(parent=self) if message_log is None else message_log
-        self.clock = time.Clock()
+        self.clock = time.Clock() if clock is None else clock
         self.time = Time() if time_of_day is None else time_of_day
         self.time.parent = self
         self.key_mod = None
         self.camera = Camera() if camera is None else camera
         self.game_state = GameStates.ACTION if game_state is None else game_state
+        self.dirty: Set[str] = set(ui_layout.panels)  # names of the panels to redraw on the next render
+        self.rendered_mouse = None  # mouse location at the last render
+        self.frame_time = 0.0  # seconds since the previous frame
+        self.animating = False  # camera easing or rain falling at the last render - frames are needed at full rate
+        self.next_flicker: Optional[float] = None  # seconds until a sprite in view changes picture
+        self.held_events: List[Event] = []  # taken off the queue by the frame scheduler, handled before the rest
+        self.profiler = Profiler()
         
         random.seed(self.seed)
         print(self.seed)
@@ -82,17 +92,27 @@ class Engine:
                       time_of_day=time_of_day, camera=camera, game_state=game_state)
     
     def end_turn(self):
-        self.player.view.set_fov()
-        if self.player.broadsides:
-            self.player.broadsides.tick_cooldown()
-        self.player.crew.tick_cooldowns()
-        self.handle_bonus_movement()
-        self.handle_enemy_turns()
-        self.time.roll_min(time_tick)
-        self.handle_weather()
-        for entity in self.game_map.entities:
-            if entity.is_alive:
-                entity.view.set_fov()
+        phase = self.profiler.phase
+        with phase('turn'):
+            with phase('turn.player_fov'):
+                self.player.view.set_fov()
+            with phase('turn.cooldowns'):
+                if self.player.broadsides:
+                    self.player.broadsides.tick_cooldown()
+                self.player.crew.tick_cooldowns()
+            with phase('turn.bonus_movement'):
+                self.handle_bonus_movement()
+            with phase('turn.enemies'):
+                self.handle_enemy_turns()
+            with phase('turn.time'):
+                self.time.roll_min(time_tick)
+            with phase('turn.weather'):
+                self.handle_weather()
+            with phase('turn.entity_fov'):
+                for entity in self.game_map.entities:
+                    if entity.is_alive:
+                        entity.view.set_fov()
+        self.mark_dirty()
 
     def get_handler(self):
         if self.game_state == GameStates.ACTION:
@@ -111,12 +131,14 @@ class Engine:
         #     self.event_handler = UpgradeHandler(self)
     
     def handle_enemy_turns(self) -> None:
-        for entity in self.game_map.entities - {self.player}:
+        # entities are a set ordered by memory address - sorted, a seed plays out the same way every run
+        for entity in sorted(self.game_map.entities - {self.player}, key=lambda e: (e.x, e.y, e.name, e.facing)):
             if entity.is_alive and entity.ai is not None:
-                try:
-                    entity.ai.perform()
-                except Impossible:
-                    pass
+                with self.profiler.phase(f'ai.{type(entity.ai).__name__}'):
+                    try:
+                        entity.ai.perform()
+                    except Impossible:
+                        pass
     
     def handle_bonus_movement(self) -> None:
         if self.player.sails.raised:
@@ -130,46 +152,144 @@ class Engine:
         self.game_map.weather.roll_wind()
         self.game_map.weather.roll_mist(self.game_map)
     
-    def render_all(self, main_surface: Surface) -> None:
-        mini_map_render(game_map=self.game_map, main_display=main_surface, ui_layout=self.ui_layout)
+    def mark_dirty(self, *panels: str) -> None:
+        """
+        Marks panels to be redrawn on the next render
+        :param panels: str names of panels in DisplayInfo.panels - every panel if none are given
+        :return: None
+        """
+        self.dirty.update(panels or self.ui_layout.panels)
+    
+    def check_mouse(self) -> None:
+        """
+        Marks the panels that follow the mouse dirty - the viewport shows info on the entity under the mouse and the
+            message log grows over the viewport while the mouse is over it
+        :return: None
+        """
+        if self.mouse_location == self.rendered_mouse:
+            return
+        if self.rendered_mouse is None \
+                or self.ui_layout.in_messages(*self.mouse_location) != self.ui_layout.in_messages(*self.rendered_mouse):
+            self.mark_dirty()
+        elif self.ui_layout.in_viewport(*self.mouse_location) or self.ui_layout.in_viewport(*self.rendered_mouse):
+            # entity info near the bottom of the viewport can hang over the message log
+            self.mark_dirty('viewport', 'messages')
+        self.rendered_mouse = self.mouse_location
+    
+    def update_animations(self) -> None:
+        """
+        Advances the sprites in the player's view by the last frame time and eases the camera toward the player
+            marks the viewport dirty when a sprite changes picture, the camera moves or rain is falling
+        :return: None
+        """
+        fov = self.player.view.fov
+        for entity in self.game_map.entities:
+            if entity.sprite and (entity.x, entity.y) in fov:
+                if entity.sprite.update(self.frame_time):
+                    self.mark_dirty('viewport')
+                flicker = entity.sprite.flicker_speed - entity.sprite.flicker_timer
+                if self.next_flicker is None or flicker < self.next_flicker:
+                    self.next_flicker = flicker
         
-        status_panel_render(console=main_surface, entity=self.player, weather=self.game_map.weather, time=self.time,
-                            ui_layout=self.ui_layout)
+        camera = (self.camera.x, self.camera.y)
+        self.camera.update(self.player)
+        if camera != (self.camera.x, self.camera.y):
+            self.mark_dirty('viewport')
+            self.animating = True
+        
+        weather = self.game_map.weather
+        if weather.rain and weather.conditions in [Conditions.RAINY, Conditions.STORMY]:
+            self.mark_dirty('viewport')
+            self.animating = True
+    
+    def render_all(self, main_surface: Surface) -> List[Rect]:
+        """
+        Redraws the panels marked dirty since the last render. Key presses, clicks and turns mark every panel,
+            mouse motion and animation only the panels they show in
+        :param main_surface: display Surface
+        :return: list of Rects of the display that were redrawn
+        """
+        self.check_mouse()
+        messages_max = self.ui_layout.in_messages(self.mouse_location[0], self.mouse_location[1])
+        shows_map = not messages_max and self.game_state in [GameStates.ACTION, GameStates.PLAYER_DEAD]
+        self.animating = False
+        self.next_flicker = None
+        if shows_map:
+            self.update_animations()
+        if not self.dirty:
+            return []
         
-        control_panel_render(console=main_surface, key_mod=self.key_mod, game_state=self.game_state,
-                             player=self.player, ui_layout=self.ui_layout, sky=self.time.get_sky_color)
+        panels = self.ui_layout.panels
+        phase = self.profiler.phase
+        rects = []
+        if 'mini_map' in self.dirty:
+            with phase('render.mini_map'):
+                mini_map_render(game_map=self.game_map, main_display=main_surface, ui_layout=self.ui_layout)
+            rects.append(panels['mini_map'])
+        
+        if 'status' in self.dirty:
+            with phase('render.status'):
+                status_panel_render(console=main_surface, entity=self.player, weather=self.game_map.weather,
+                                    time=self.time, ui_layout=self.ui_layout, profiler=self.profiler)
+            rects.append(panels['status'])
+        
+        if 'controls' in self.dirty:
+            with phase('render.controls'):
+                control_panel_render(console=main_surface, key_mod=self.key_mod, game_state=self.game_state,
+                                     player=self.player, ui_layout=self.ui_layout, sky=self.time.get_sky_color)
+            rects.append(panels['controls'])
         
         # viewport/messages depending on mouse
-        if self.ui_layout.in_messages(self.mouse_location[0], self.mouse_location[1]):
-            self.message_log.render_max(console=main_surface, ui_layout=self.ui_layout)
+        if messages_max:
+            if 'messages' in self.dirty or 'viewport' in self.dirty:
+                with phase('render.messages'):
+                    self.message_log.render_max(console=main_surface, ui_layout=self.ui_layout)
+                rects.append(self.ui_layout.messages_max)
         else:
-            self.message_log.render(console=main_surface, ui_layout=self.ui_layout)
-            if self.game_state in [GameStates.ACTION, GameStates.PLAYER_DEAD]:
-                self.camera.update(self.player)
-                viewport_render(game_map=self.game_map, main_display=main_surface, weather=self.game_map.weather,
-                                ui_layout=self.ui_layout, camera=self.camera)
-                if self.ui_layout.in_viewport(self.mouse_location[0], self.mouse_location[1]):
-                    render_entity_info(console=main_surface,
-                                       game_map=self.game_map,
-                                       player=self.player,
-                                       mouse_x=self.mouse_location[0] - self.ui_layout.mini_width,
-                                       mouse_y=self.mouse_location[1],
-                                       ui=self.ui_layout)
-            elif self.game_state == GameStates.CARGO_CONFIG:
-                cargo_render(console=main_surface, player=self.player, time=self.time,
-                             ui_layout=self.ui_layout)
-            elif self.game_state == GameStates.CREW_CONFIG:
-                crew_render(console=main_surface, crew=self.player.crew, time=self.time,
+            if 'messages' in self.dirty:
+                with phase('render.messages'):
+                    self.message_log.render(console=main_surface, ui_layout=self.ui_layout)
+                rects.append(panels['messages'])
+            if 'viewport' in self.dirty:
+                with phase('render.viewport'):
+                    self.render_viewport(main_surface, shows_map)
+                rects.append(panels['viewport'])
+        
+        self.dirty.clear()
+        return rects
+    
+    def render_viewport(self, main_surface: Surface, shows_map: bool) -> None:
+        """
+        Draws the map, or the configuration or port screen of the game state, in the viewport
+        :param main_surface: display Surface
+        :param shows_map: bool True if the game state shows the map
+        :return: None
+        """
+        if shows_map:
+            viewport_render(game_map=self.game_map, main_display=main_surface, weather=self.game_map.weather,
+                            ui_layout=self.ui_layout, camera=self.camera)
+            if self.ui_layout.in_viewport(self.mouse_location[0], self.mouse_location[1]):
+                render_entity_info(console=main_surface,
+                                   game_map=self.game_map,
+                                   player=self.player,
+                                   mouse_x=self.mouse_location[0] - self.ui_layout.mini_width,
+                                   mouse_y=self.mouse_location[1],
+                                   ui=self.ui_layout)
+        elif self.game_state == GameStates.CARGO_CONFIG:
+            cargo_render(console=main_surface, player=self.player, time=self.time,
+                         ui_layout=self.ui_layout)
+        elif self.game_state == GameStates.CREW_CONFIG:
+            crew_render(console=main_surface, crew=self.player.crew, time=self.time,
+                        ui_layout=self.ui_layout)
+        elif self.game_state == GameStates.WEAPON_CONFIG:
+            weapon_render(console=main_surface, broadsides=self.player.broadsides, time=self.time,
+                          ui_layout=self.ui_layout)
+        elif self.game_state == GameStates.MERCHANT:
+            merchant_render(console=main_surface, player=self.player, time=self.time,
                             ui_layout=self.ui_layout)
-            elif self.game_state == GameStates.WEAPON_CONFIG:
-                weapon_render(console=main_surface, broadsides=self.player.broadsides, time=self.time,
-                              ui_layout=self.ui_layout)
-            elif self.game_state == GameStates.MERCHANT:
-                merchant_render(console=main_surface, player=self.player, time=self.time,
-                                ui_layout=self.ui_layout)
-            elif self.game_state == GameStates.SMITHY:
-                smithy_render(console=main_surface, player=self.player, time=self.time,
-                              ui_layout=self.ui_layout)
-            elif self.game_state == GameStates.TAVERN:
-                tavern_render(console=main_surface, player=self.player, time=self.time,
-                              ui_layout=self.ui_layout)
+        elif self.game_state == GameStates.SMITHY:
+            smithy_render(console=main_surface, player=self.player, time=self.time,
+                          ui_layout=self.ui_layout)
+        elif self.game_state == GameStates.TAVERN:
+            tavern_render(console=main_surface, player=self.player, time=self.time,
+                          ui_layout=self.ui_layout)
@@ -54,7 +54,7 @@ class Entity:
         self.ai = ai_class[ai_cls_name](self) if ai_cls_name is not None else None
         if parent:
             self.parent = parent
-            parent.entities.add(self)
+            parent.add_entity(self)
         self.fighter = fighter
         if self.fighter:
             self.fighter.parent = self
@@ -145,24 +145,33 @@ class Entity:
         clone.y = y
         clone.facing = facing
         clone.parent = game_map
-        game_map.entities.add(clone)
+        game_map.add_entity(clone)
         return clone
     
     def place(self, x: int, y: int, game_map: Optional[GameMap] = None) -> None:
         """Place this entity at a new location.  Handles moving across GameMaps."""
-        self.x = x
-        self.y = y
         if game_map:
             if hasattr(self, "parent"):  # Possibly uninitialized
-                self.game_map.entities.remove(self)
+                self.game_map.remove_entity(self)
+            elif self in game_map.entities:  # handed to the GameMap constructor before it had a parent
+                game_map.remove_entity(self)
+            self.x = x
+            self.y = y
             self.parent = game_map
-            game_map.entities.add(self)
+            game_map.add_entity(self)
+        else:
+            old_x, old_y = self.x, self.y
+            self.x = x
+            self.y = y
+            self.game_map.move_entity(self, old_x, old_y)
     
     def move(self) -> None:
+        old_x, old_y = self.x, self.y
         old_cube = hex_to_cube(Hex(self.x, self.y))
         new_hex = cube_to_hex(cube_neighbor(old_cube, self.facing))
         self.x = new_hex.col
         self.y = new_hex.row
+        self.game_map.move_entity(self, old_x, old_y)
     
     def rotate(self, direction: int):
         self.facing += direction
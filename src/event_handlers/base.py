@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import List, TYPE_CHECKING
 
+from pygame import MOUSEMOTION
+from pygame import event as pygame_event
 
 if TYPE_CHECKING:
     from engine import Engine
+    from pygame.event import Event
     
     
 class EventHandler:
@@ -13,3 +16,17 @@ class EventHandler:
     
     def handle_events(self):
         raise NotImplementedError()
+    
+    def get_events(self) -> List[Event]:
+        """
+        Returns the pending pygame events - anything but mouse motion can change what any panel shows, so it marks
+            every panel dirty. Mouse motion is checked against the panels when the engine renders
+        Events the frame scheduler took off the queue while waiting come first, they arrived before the others
+        :return: list of pygame Events
+        """
+        # noinspection PyArgumentList
+        events = self.engine.held_events + pygame_event.get(pump=True)
+        self.engine.held_events.clear()
+        if any(event.type != MOUSEMOTION for event in events):
+            self.engine.mark_dirty()
+        return events
@@ -3,7 +3,6 @@ from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
 
 from pygame import QUIT, KEYUP, KEYDOWN, KMOD_NONE, K_ESCAPE, MOUSEMOTION, mouse
-from pygame import event as pygame_event
 
 from actions.base.mouse import MouseMoveAction
 from actions.base.quit import ActionQuit
@@ -33,8 +32,7 @@ class CargoConfigurationHandler(EventHandler):
     
     def handle_events(self):
         something_happened = False
-        # noinspection PyArgumentList
-        events = pygame_event.get(pump=True)
+        events = self.get_events()
         if len(events) > 0:
             for event in events:
                 action = self.process_event(event)
@@ -49,7 +47,7 @@ class CargoConfigurationHandler(EventHandler):
             if something_happened:
                 if isinstance(something_happened, dict):
                     if something_happened.get('name') == 'Chest':
-                        self.engine.game_map.entities.add(
+                        self.engine.game_map.add_entity(
                             Entity(x=something_happened.get('x'),
                                    y=something_happened.get('y'),
                                    elevations=something_happened.get('elevations'),
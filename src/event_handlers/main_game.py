@@ -3,11 +3,11 @@ from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
 
 from pygame import QUIT, KEYUP, KEYDOWN, KMOD_NONE, K_ESCAPE, MOUSEMOTION, mouse
-from pygame import event as pygame_event
 
 from actions.attack.attack_choice import AttackAction
 from actions.auto.auto import AutoAction
 from actions.base.mouse import MouseMoveAction
+from actions.base.profile import ProfileAction
 from actions.base.quit import ActionQuit
 from actions.crew.crew import CrewAction
 from actions.move.movement import MovementAction
@@ -17,7 +17,7 @@ from actions.repair.repair_choice import RepairAction
 from actions.ship_config.ship import ShipAction
 from constants.enums import GameStates, KeyMod
 from constants.keys import MODIFIERS, ATTACK_KEYS, REPAIR_KEYS, PORT_KEYS, SHIP_KEYS, AUTO_KEYS, MOVEMENT_KEYS, \
-    ROTATE_KEYS, MENU_KEYS
+    ROTATE_KEYS, MENU_KEYS, PROFILE_KEYS
 from custom_exceptions import Impossible
 from event_handlers.base import EventHandler
 
@@ -36,8 +36,7 @@ class MainEventHandler(EventHandler):
     
     def handle_events(self) -> bool:
         something_happened = False
-        # noinspection PyArgumentList
-        events = pygame_event.get(pump=True)
+        events = self.get_events()
         if len(events) > 0:
             for event in events:
                 action = self.process_event(event)
@@ -86,6 +85,8 @@ class MainEventHandler(EventHandler):
                     response = MovementAction(player)
                 elif event.key in AUTO_KEYS:
                     response = AutoAction(player)
+                elif event.key in PROFILE_KEYS:
+                    response = ProfileAction(player, PROFILE_KEYS[event.key])
                 elif event.key == K_ESCAPE:
                     response = ActionQuit(player)
         
@@ -3,7 +3,6 @@ from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
 
 from pygame import QUIT, KEYUP, KEYDOWN, KMOD_NONE, K_ESCAPE, MOUSEMOTION, mouse
-from pygame import event as pygame_event
 
 from actions.base.mouse import MouseMoveAction
 from actions.base.quit import ActionQuit
@@ -31,8 +30,7 @@ class MerchantHandler(EventHandler):
     
     def handle_events(self):
         something_happened = False
-        # noinspection PyArgumentList
-        events = pygame_event.get(pump=True)
+        events = self.get_events()
         if len(events) > 0:
             for event in events:
                 action = self.process_event(event)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import Optional, Set, Tuple, TYPE_CHECKING
+
+from constants.enums import Elevation
+from hex_rays import get_ray_templates
+
+if TYPE_CHECKING:
+    from game_map import GameMap
+
+
+def compute_fov(game_map: GameMap,
+                distance: int,
+                x: int,
+                y: int,
+                elevation: Elevation,
+                mist_view: int = 1
+                ) -> Set[Tuple[int, int]]:
+    """
+    Casts a ray from (x, y) to every hex on the ring at the given distance. A ray stops at the map edge, when the
+        terrain drops below the highest elevation already seen along the ray (terrain at or below the viewer's
+        elevation counts as the viewer's elevation), or after passing through mist_view hexes of mist
+    :param game_map: GameMap to look across
+    :param distance: int distance from center to check
+    :param x: x int coordinate of game map
+    :param y: y int coordinate of game map
+    :param elevation: Elevation enum of the viewer
+    :param mist_view: max number of mist hexes that cannot be viewed beyond
+    :return: set of Tuple (x, y) coordinates that can be seen
+    """
+    width = game_map.width
+    height = game_map.height
+    elevations = game_map.terrain.elevation
+    mists = game_map.terrain.mist
+    # Elevation.ALL sees over everything, which is the same as viewing from the highest elevation
+    viewer_elevation = elevation.value if isinstance(elevation.value, int) else Elevation.MOUNTAIN.value
+    
+    viewed_hexes = set()
+    if 0 <= x < width and 0 <= y < height:
+        viewed_hexes.add((x, y))
+    
+    for ray in get_ray_templates(distance, x, y):
+        mist_count = 0
+        previous_elevation = viewer_elevation
+        for offset_x, offset_y in ray:
+            col = x + offset_x
+            row = y + offset_y
+            if not (0 <= col < width and 0 <= row < height):
+                break
+            index = col * height + row
+            current_elevation = elevations[index]
+            if current_elevation <= viewer_elevation:
+                current_elevation = viewer_elevation
+            if current_elevation < previous_elevation or mist_count >= mist_view:
+                break
+            
+            if mists[index]:
+                mist_count += 1
+            previous_elevation = current_elevation
+            viewed_hexes.add((col, row))
+    
+    return viewed_hexes
+
+
+class FovCache:
+    def __init__(self):
+        """
+        Remembers the last field of view computed for one viewer. The result is reused while the viewer keeps the
+            same position, distance, elevation and mist view, the terrain elevation is unchanged, and the mist
+            within view distance matches the mist the result was computed with
+        """
+        self.key: Optional[Tuple] = None
+        self.elevation_generation: Optional[int] = None
+        self.mist_signature: Optional[bytes] = None
+        self.tiles: Set[Tuple[int, int]] = set()
+        self.computed = False
+        self.hits = 0
+        self.misses = 0
+    
+    def __deepcopy__(self, memo) -> FovCache:
+        # spawned entities are deep copies of a template - they should start with an empty cache of their own
+        return FovCache()
+    
+    @staticmethod
+    def mist_signature_at(game_map: GameMap, distance: int, x: int, y: int) -> bytes:
+        """
+        Returns the mist plane bytes of the box around (x, y) that a field of view of the given distance can read
+        :param game_map: GameMap to look across
+        :param distance: int view distance
+        :param x: x int coordinate of game map
+        :param y: y int coordinate of game map
+        :return: bytes of mist flags
+        """
+        height = game_map.height
+        mists = game_map.terrain.mist
+        top = max(y - distance - 1, 0)
+        bottom = min(y + distance + 1, height - 1)
+        return b''.join(mists[col * height + top:col * height + bottom + 1]
+                        for col in range(max(x - distance, 0), min(x + distance, game_map.width - 1) + 1))
+    
+    def get_fov(self,
+                game_map: GameMap,
+                distance: int,
+                x: int,
+                y: int,
+                elevation: Elevation,
+                mist_view: int = 1
+                ) -> Set[Tuple[int, int]]:
+        """
+        Returns the cached field of view if it is still valid, otherwise computes and caches a new one
+            self.computed tells the caller which of the two happened
+        The returned set is shared with the cache, callers must copy it before changing it
+        :param game_map: GameMap to look across
+        :param distance: int distance from center to check
+        :param x: x int coordinate of game map
+        :param y: y int coordinate of game map
+        :param elevation: Elevation enum of the viewer
+        :param mist_view: max number of mist hexes that cannot be viewed beyond
+        :return: set of Tuple (x, y) coordinates that can be seen
+        """
+        key = (id(game_map), x, y, distance, elevation.name, mist_view)
+        mist_signature = self.mist_signature_at(game_map, distance, x, y)
+        if key == self.key \
+                and self.elevation_generation == game_map.terrain.elevation_generation \
+                and mist_signature == self.mist_signature:
+            self.computed = False
+            self.hits += 1
+            return self.tiles
+        
+        self.key = key
+        self.elevation_generation = game_map.terrain.elevation_generation
+        self.mist_signature = mist_signature
+        self.tiles = compute_fov(game_map, distance, x, y, elevation, mist_view)
+        self.computed = True
+        self.misses += 1
+        return self.tiles
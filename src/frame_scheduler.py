@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections import deque
+from time import perf_counter
+from typing import Dict, TYPE_CHECKING
+
+from pygame import NOEVENT
+from pygame import event as pygame_event
+
+from constants.constants import FPS, frame_policy, frame_stats_window
+from constants.enums import FramePolicy
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+"""
+Frame rate while something on screen moves every frame, per policy
+"""
+active_fps = {
+    FramePolicy.LATENCY: FPS,
+    FramePolicy.BALANCED: FPS,
+    FramePolicy.POWER: FPS // 2,
+}
+
+
+class FrameStats:
+    def __init__(self, window: int = frame_stats_window):
+        """
+        Frame time statistics of the game loop
+        :param window: int number of recent frames kept for averages and percentiles
+        """
+        self.frames = 0
+        self.rendered = 0
+        self.idle_waits = 0
+        self.work_times = deque(maxlen=window)  # ms spent handling events and rendering, per frame
+        self.frame_times = deque(maxlen=window)  # ms from one frame to the next, waiting included
+    
+    def record(self, rendered: bool, work_time: float, frame_time: float, waited: bool) -> None:
+        self.frames += 1
+        self.rendered += rendered
+        self.idle_waits += waited
+        self.work_times.append(work_time)
+        self.frame_times.append(frame_time)
+    
+    def summary(self) -> Dict:
+        """
+        Returns the counters and the recent frame times
+        :return: dict of statistics, times in ms
+        """
+        work = sorted(self.work_times)
+        return {
+            'frames': self.frames,
+            'rendered': self.rendered,
+            'idle_waits': self.idle_waits,
+            'work_ms_mean': sum(work) / len(work) if work else 0.0,
+            'work_ms_p95': work[int(len(work) * 0.95)] if work else 0.0,
+            'work_ms_max': work[-1] if work else 0.0,
+            'frame_ms_mean': sum(self.frame_times) / len(self.frame_times) if self.frame_times else 0.0,
+        }
+
+
+class FrameScheduler:
+    def __init__(self, engine: Engine, policy: FramePolicy = frame_policy):
+        """
+        Paces the game loop - full frame rate only while the camera eases or rain falls, otherwise the loop sleeps
+            in pygame.event.wait until input arrives or the next sprite in view is due to change picture
+        LATENCY never sleeps, BALANCED sleeps when idle, POWER also halves the frame rate of animations
+        :param engine: the game Engine
+        :param policy: FramePolicy
+        """
+        self.engine = engine
+        self.policy = policy
+        self.stats = FrameStats()
+        self.frame_start = perf_counter()
+    
+    def wait(self, rendered: bool) -> None:
+        """
+        Waits for the next frame and records the time since the last one in engine.frame_time
+        :param rendered: bool True if anything was drawn this frame
+        :return: None
+        """
+        engine = self.engine
+        work_time = (perf_counter() - self.frame_start) * 1000
+        waited = self.policy != FramePolicy.LATENCY and not engine.animating
+        if waited:
+            # events are handed to the event handler ahead of the queue, in the order they came - posting them back
+            #   would put them behind events that arrived meanwhile. Input already waiting is handled without sleeping
+            held = engine.held_events
+            held.extend(pygame_event.get())
+            if not held:
+                if engine.next_flicker is None:
+                    event = pygame_event.wait()
+                else:
+                    event = pygame_event.wait(max(int(engine.next_flicker * 1000), 1))
+                if event.type != NOEVENT:
+                    held.append(event)
+            frame_time = engine.clock.tick()
+        else:
+            frame_time = engine.clock.tick(active_fps[self.policy])
+        engine.frame_time = frame_time / 1000
+        self.frame_start = perf_counter()
+        self.stats.record(rendered=rendered, work_time=work_time, frame_time=frame_time, waited=waited)
@@ -1,14 +1,18 @@
 import copy
-from json import dump, load
+from os import path
 
 from pygame import display
 
 import entity_factory
-from constants.constants import map_width, map_height, FPS
+from constants.constants import map_width, map_height
 from engine import Engine
 from entity import Entity
+from frame_scheduler import FrameScheduler
 from game_map import GameMap
 from procgen import generate_map
+from save_format import compress, convert_json_save, decode, json_save_path, pack, save_path, write_atomic
+from save_journal import SaveJournal, journal_path, read_journal, replay
+from save_writer import SaveWriter
 
 
 class Game:
@@ -16,6 +20,11 @@ class Game:
         self.display = main_surface
         self.engine = engine
         self.number = number
+        self.scheduler = FrameScheduler(engine)
+        engine.profiler.add_stats('frame', self.scheduler.stats, 'work_ms_mean', 'work_ms_p95')
+        self.save_writer = SaveWriter(save_path(number), journal_path(number))
+        engine.profiler.add_stats('save.latency', self.save_writer, 'latency_ms_mean', 'latency_ms_p95')
+        self.save_journal = SaveJournal()
     
     def play_game(self):
         should_quit = False
@@ -24,51 +33,101 @@ class Game:
             try:
                 something_happened = self.engine.event_handler.handle_events()
                 if something_happened:
-                    save_game(self.engine, self.engine.game_map, self.engine.player, self.number)
+                    self.autosave()
             except SystemExit:
                 should_quit = True
             
-            self.engine.render_all(main_surface=self.display)
-            display.flip()
-            self.engine.clock.tick(FPS)
+            rects = self.engine.render_all(main_surface=self.display)
+            if rects:
+                display.update(rects)
+            self.scheduler.wait(rendered=bool(rects))
+        
+        try:
+            self.save_writer.close()
+        except Exception as e:
+            print(f"Autosave failed: {e}")
+    
+    def autosave(self):
+        """
+        Hands the save writer a full save body or, between compactions, a journal entry of this turn's changes
+            the journal is compacted once it outgrows the last save file written
+        A write that failed on the writer's thread is reported in the message log. What it held is lost, so the
+            journal starts over from a full save body on the next autosave
+        """
+        save_size = self.save_writer.summary()['bytes_last']
+        full, blob = self.save_journal.record(self.engine, self.engine.game_map, self.engine.player,
+                                              save_size if save_size else None)
+        try:
+            if full:
+                self.save_writer.submit(blob)
+            else:
+                self.save_writer.append(blob)
+        except Exception as e:
+            self.engine.message_log.add_message(f"Autosave failed: {e}", text_color='red')
+            self.save_journal.game_map = None
 
 
-def new_game(ui_layout):
+def new_game(ui_layout, seed: int = None, clock=None, width: int = map_width, height: int = map_height,
+             entity_density: int = 50):
     player = copy.deepcopy(entity_factory.player)
-    engine = Engine(player=player, ui_layout=ui_layout)
-    engine.game_map = generate_map(map_width, map_height, engine=engine, seed=engine.seed, ui_layout=ui_layout)
+    engine = Engine(player=player, ui_layout=ui_layout, seed=seed, clock=clock)
+    engine.game_map = generate_map(width, height, engine=engine, seed=engine.seed, ui_layout=ui_layout,
+                                   entity_density=entity_density)
     engine.message_log.add_message("Hello and welcome, Captain, to the Isles of Mist", text_color='aqua')
     
     return player, engine
 
 
 def load_game(ui_layout, number):
-    with open(f'data/save_game_{number}.json') as save_file:
-        data = load(save_file)
-        if data:
-            player = Entity.from_json(data.get('player'))
-            engine = Engine.from_json(player=player, json_data=data.get('engine'), ui_layout=ui_layout)
-            engine.message_log.parent = engine
-            engine.time.parent = engine
-            game_map = GameMap.from_json(data.get('game_map'))
-            game_map.weather.game_map = game_map
-            game_map.engine = engine
-            engine.game_map = game_map
-            game_map.entities.add(player)
-            for entity in game_map.entities:
-                entity.parent = game_map
-                if entity.view:
-                    entity.view.set_fov()
-        else:
-            raise FileNotFoundError
+    if not path.exists(save_path(number)) and path.exists(json_save_path(number)):
+        convert_json_save(json_save_path(number), save_path(number))  # saves from before the binary format
+    with open(save_path(number), 'rb') as save_file:
+        save_blob = save_file.read()
+    data, terrain = decode(save_blob)
+    if path.exists(journal_path(number)):
+        with open(journal_path(number), 'rb') as journal_file:
+            replay(data, terrain, read_journal(journal_file.read(), save_blob))
+    return restore_game(ui_layout, data, terrain)
+
+
+def restore_game(ui_layout, data, terrain):
+    """
+    Builds the player and engine of a decoded save
+    """
+    player = Entity.from_json(data.get('player'))
+    engine = Engine.from_json(player=player, json_data=data.get('engine'), ui_layout=ui_layout)
+    engine.message_log.parent = engine
+    engine.time.parent = engine
+    game_map = GameMap.from_json(data.get('game_map'), terrain=terrain)
+    game_map.weather.game_map = game_map
+    game_map.engine = engine
+    engine.game_map = game_map
+    game_map.add_entity(player)
+    for entity in game_map.entities:
+        entity.parent = game_map
+        if entity.view:
+            entity.view.set_fov()
     return player, engine
 
 
-def save_game(engine, game_map, player, number):
-    data = {
+def game_data(engine, game_map, player):
+    return {
         'engine': engine.to_json(),
-        'game_map': game_map.to_json(),
+        'game_map': game_map.to_json(with_terrain=False),
         'player': player.to_json()
     }
-    with open(f'data/save_game_{number}.json', 'w') as save_file:
-        dump(data, save_file, indent=4)
+
+
+def snapshot_game(engine, game_map, player) -> bytes:
+    """
+    Returns the uncompressed save body of the game - it shares nothing with the game, so another thread can write it
+    """
+    return pack(game_data(engine, game_map, player), game_map.terrain)
+
+
+def serialize_game(engine, game_map, player) -> bytes:
+    return compress(snapshot_game(engine, game_map, player))
+
+
+def save_game(engine, game_map, player, number):
+    write_atomic(save_path(number), serialize_game(engine, game_map, player))
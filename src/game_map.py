@@ -1,21 +1,29 @@
 from __future__ import annotations
 
-from queue import Queue
+from array import array
+from heapq import heappush, heappop
 from random import randint
 from typing import Iterable, List, Tuple, Optional, Set, Dict, TYPE_CHECKING
 
-from constants.constants import move_elevations
+from constants.constants import hunt_detour, move_elevations
 from constants.enums import Conditions, Elevation
+from distance_field import DistanceField
 from entity import Entity
+from fov import compute_fov
 from port.port import Port
-from tile import Terrain
-from utilities import Hex, cube_directions, cube_add, cube_to_hex, \
-    hex_to_cube, cube_neighbor, cube_line_draw, get_distance
+from tile import TerrainGrid
+from utilities import get_distance, build_neighbor_table
 from weather import Weather
 
 if TYPE_CHECKING:
     from engine import Engine
 
+"""
+Elevation values (as stored in the terrain elevation plane) for each movement class in move_elevations
+"""
+move_values = {name: frozenset(elevation.value for elevation in elevations)
+               for name, elevations in move_elevations.items()}
+
 
 class GameMap:
     def __init__(self, width: int, height: int, engine: Engine = None, weather: Weather = None,
@@ -26,41 +34,61 @@ class GameMap:
         :param width: width of the game map
         :param height: height of the game map
         :param entities: list of Entity objects with locations on the game map
-        :param terrain: list of lists of Terrain tiles
+        :param terrain: TerrainGrid (or list of lists of Terrain tiles)
         """
         self.width = width
         self.height = height
         self.engine = engine
-        self.entities = set(entities)
+        self.entities = set()
+        self.changed_entities: Set[Entity] = set()  # added, removed or moved since the last autosave
+        self._entity_index: Dict[Tuple[int, int], Set[Entity]] = {}
+        for entity in entities:
+            self.add_entity(entity)
         self.weather = weather
-        self.terrain = terrain if terrain is not None else [[Terrain(elevation=Elevation.OCEAN, explored=False)
-                                                             for y in range(height)] for x in range(width)]
+        if terrain is None:
+            terrain = TerrainGrid(width=width, height=height)
+        elif not isinstance(terrain, TerrainGrid):
+            terrain = TerrainGrid.from_tiles(terrain)
+        self.terrain = terrain
         self.port = port if port is not None else Port()
+        self._neighbor_table = None
+        self._passable = {}
+        self._passable_generation = None
+        self._distance_fields = {}
+        self._distance_fields_generation = None
     
     @property
     def game_map(self) -> GameMap:
         return self
     
-    def to_json(self) -> Dict:
-        return {
+    def to_json(self, with_terrain: bool = True, with_entities: bool = True) -> Dict:
+        """
+        :param with_terrain: bool False to leave out the terrain, for saves that store the terrain planes themselves
+        :param with_entities: bool False to leave out the entities, for the autosave journal that tracks them itself
+        :return: json representation of GameMap
+        """
+        json_data = {
             'width': self.width,
             'height': self.height,
             'weather': self.weather.to_json(),
             'port': self.port.to_json(),
-            'entities': [entity.to_json() for entity in self.entities if entity is not self.engine.player],
-            'terrain': [[terrain.to_json() for terrain in tile_rows] for tile_rows in self.terrain],
         }
+        if with_entities:
+            json_data['entities'] = [entity.to_json() for entity in self.entities if entity is not self.engine.player]
+        if with_terrain:
+            json_data['terrain'] = self.terrain.to_json()
+        return json_data
     
     @staticmethod
-    def from_json(json_data):
+    def from_json(json_data, terrain: TerrainGrid = None):
         width = json_data.get('width')
         height = json_data.get('height')
         weather = Weather.from_json(json_data.get('weather'))
         port = Port.from_json(json_data.get('port'))
         entities_data = json_data.get('entities')
         entities = [Entity.from_json(entity) for entity in entities_data]
-        terrain_data = json_data.get('terrain')
-        terrain = [[Terrain.from_json(tile) for tile in rows] for rows in terrain_data]
+        if terrain is None:
+            terrain = TerrainGrid.from_json(json_data.get('terrain'))
         return GameMap(width=width, height=height, weather=weather, port=port, entities=entities, terrain=terrain)
     
     def get_fov(self,
@@ -79,51 +107,7 @@ class GameMap:
         :param mist_view: max number of mist hexes that cannot be viewed beyond
         :return: set of Tuple (x, y) coordinates that can be seen
         """
-        viewed_hexes = []
-        center_coords = hex_to_cube(hexagon=Hex(column=x, row=y))
-        viewed_hexes.append(Hex(column=x, row=y))
-        current = center_coords
-        
-        # set up starting cube
-        for k in range(0, distance):
-            current = cube_neighbor(cube=current, direction=4)
-        
-        for i in range(0, 6):
-            for j in range(0, distance):
-                cube_line = cube_line_draw(cube1=center_coords, cube2=current)
-                mist_count = 0
-                
-                previous_elevation = elevation
-                for cube in cube_line:
-                    hx = cube_to_hex(cube)
-                    if not self.in_bounds(hx.col, hx.row):
-                        break
-                    else:
-                        current_elevation = self.terrain[hx.col][hx.row].elevation
-                    
-                    if self.in_bounds(hx.col, hx.row) \
-                            and current_elevation <= elevation:
-                        current_elevation = elevation
-                    if self.in_bounds(hx.col, hx.row) \
-                            and (current_elevation < previous_elevation
-                                 or mist_count >= mist_view):
-                        break
-                    
-                    if self.in_bounds(hx.col, hx.row) \
-                            and self.terrain[hx.col][hx.row].mist:
-                        mist_count += 1
-                    previous_elevation = current_elevation
-                    
-                    if hx not in viewed_hexes[1:]:
-                        viewed_hexes.append(hx)
-                
-                current = cube_neighbor(current, i)
-        
-        viewed = []
-        for tile in viewed_hexes:
-            if (0 <= tile.col < self.width) and (0 <= tile.row < self.height):
-                viewed.append((tile.col, tile.row))
-        return set(viewed)
+        return compute_fov(self, distance, x, y, elevation, mist_view)
     
     def in_bounds(self, x: int, y: int) -> bool:
         """
@@ -142,98 +126,161 @@ class GameMap:
         :param elevations: list of Elevation enums
         :return: bool
         """
-        return self.terrain[x][y].elevation in move_elevations[elevations]
+        return bool(self.passable(elevations)[x * self.height + y])
+    
+    @property
+    def neighbor_table(self) -> array:
+        """
+        Flat table of the six neighbor cell ids of every cell, built once per map (see build_neighbor_table)
+        :return: array of neighbor cell ids, -1 for out of bounds
+        """
+        if self._neighbor_table is None:
+            self._neighbor_table = build_neighbor_table(self.width, self.height)
+        return self._neighbor_table
+    
+    def passable(self, elevations: str) -> bytearray:
+        """
+        Returns the passability mask for a movement class - one byte per cell id, 1 if the cell can be entered
+        Masks are cached per move_elevations name and rebuilt only after the terrain elevation changes
+        :param elevations: str of Elevation lookup
+        :return: bytearray mask indexed by cell id
+        """
+        if self._passable_generation != self.terrain.elevation_generation:
+            self._passable.clear()
+            self._passable_generation = self.terrain.elevation_generation
+        mask = self._passable.get(elevations)
+        if mask is None:
+            allowed = move_values[elevations]
+            lookup = bytes(1 if value in allowed else 0 for value in range(256))
+            mask = self.terrain.elevation.translate(lookup)
+            self._passable[elevations] = mask
+        return mask
+    
+    def get_neighbor_ids(self, cell: int, elevations: str) -> List[int]:
+        """
+        Returns the cell ids adjacent to the given cell id that can be entered by the movement class
+        :param cell: int cell id (x * height + y)
+        :param elevations: str of Elevation lookup
+        :return: list of int cell ids
+        """
+        mask = self.passable(elevations)
+        start = 6 * cell
+        return [neighbor for neighbor in self.neighbor_table[start:start + 6] if neighbor >= 0 and mask[neighbor]]
     
     def get_path(self,
                  entity_x: int,
                  entity_y: int,
                  target_x: int,
                  target_y: int,
-                 elevations: str
+                 elevations: str,
+                 facing: int = None,
+                 distance_field: DistanceField = None
                  ) -> List[Tuple[int, int]]:
         """
-        Create a grid of (x, y) coordinates mapping to the (x, y) they came from
+        A* search from the entity to the target using hex distance as the heuristic
+        The target hex itself does not need to be enterable, every other hex on the path does
+        If a facing is given, each rotation needed before a move costs as much as the move itself
+            (one RotateAction per turn, just like MovementAction)
+        If a distance field toward the target is given, its move counts are the heuristic where it has settled them -
+            they leave out only the rotations, so the search heads straight down the field
         :param entity_x: x int coordinate of this entity on game map
         :param entity_y: y int coordinate of this entity on game map
         :param target_x: x int coordinate of target on game map
         :param target_y: y int coordinate of target on game map
         :param elevations: str of Elevation lookup
-        :return: dict of tuple (x, y) coordinates -> tuple (x, y) coordinates
+        :param facing: int current facing of the entity, or None to ignore rotation costs
+        :param distance_field: DistanceField toward the target for the movement class, flooded out to the entity
+        :return: list of tuple (x, y) coordinates, next step last, entity and target hexes excluded
         """
-        frontier = Queue()
-        frontier.put((target_x, target_y))
-        came_from = dict()
-        came_from[(target_x, target_y)] = (target_x, target_y)
+        height = self.height
+        start = entity_x * height + entity_y
+        goal = target_x * height + target_y
+        mask = self.passable(elevations)
+        if start == goal or not self.in_bounds(entity_x, entity_y) or not self.in_bounds(target_x, target_y) \
+                or not mask[start]:
+            return []
+        if distance_field is not None and distance_field.distance(entity_x, entity_y) is None \
+                and distance_field.flooded:
+            return []  # the target cannot be reached from here
+        distances = distance_field.distances if distance_field is not None else None
+        table = self.neighbor_table
         
-        path_found = False
-        while not frontier.empty():
-            current = frontier.get()
-            x, y = current
-            for neighbor in self.get_neighbors_at_elevations(x=x, y=y, elevations=elevations):
-                if neighbor not in came_from:
-                    frontier.put(neighbor)
-                    came_from[(neighbor[0], neighbor[1])] = current
-                    if neighbor == (entity_x, entity_y):
-                        # found a path to target
-                        path_found = True
-                        break
-        if path_found:
-            path = []
-            current = (entity_x, entity_y)
-            while current != (target_x, target_y):
-                path.append(current)
-                if not current:
-                    break
-                current = came_from[current]
-            path.reverse()
-            path.pop()  # remove entity's current hex
-            return path
+        # search states are (cell, facing) - facing is always None when rotations are free
+        start_state = (start, facing)
+        came_from = {start_state: None}
+        cost_so_far = {start_state: 0}
+        frontier = [(get_distance(entity_x, entity_y, target_x, target_y), 0, start_state)]
+        counter = 1
         
-        return []
+        goal_state = None
+        while frontier:
+            _, _, state = heappop(frontier)
+            cell, current_facing = state
+            if cell == goal:
+                goal_state = state
+                break
+            cost = cost_so_far[state]
+            for direction, neighbor in enumerate(table[6 * cell:6 * cell + 6]):
+                if neighbor < 0 or not (neighbor == goal or mask[neighbor]):
+                    continue
+                if current_facing is None:
+                    next_state = (neighbor, None)
+                    next_cost = cost + 1
+                else:
+                    turns = (direction - current_facing) % 6
+                    next_state = (neighbor, direction)
+                    next_cost = cost + min(turns, 6 - turns) + 1
+                if next_state not in cost_so_far or next_cost < cost_so_far[next_state]:
+                    cost_so_far[next_state] = next_cost
+                    came_from[next_state] = state
+                    estimate = distances[neighbor] if distances is not None else -1
+                    if estimate < 0:
+                        neighbor_x, neighbor_y = divmod(neighbor, height)
+                        estimate = get_distance(neighbor_x, neighbor_y, target_x, target_y)
+                    priority = next_cost + estimate
+                    heappush(frontier, (priority, counter, next_state))
+                    counter += 1
+        
+        if goal_state is None:
+            return []
+        
+        path = []
+        state = came_from[goal_state]
+        while state != start_state:
+            path.append(divmod(state[0], height))
+            state = came_from[state]
+        return path
     
-    def get_distance_map(self,
-                         entity_x: int,
-                         entity_y: int,
-                         target_x: int,
-                         target_y: int,
-                         elevations: str
-                         ) -> Dict[Tuple[int, int]:int]:
-        """
-        Create a grid of (x, y) coordinates mapping to the (x, y) they came from
-        :param entity_x: x int coordinate of this entity on game map
-        :param entity_y: y int coordinate of this entity on game map
+    def get_distance_field(self, target_x: int, target_y: int, elevations: str, hunter_x: int,
+                           hunter_y: int) -> DistanceField:
+        """
+        Returns the field of move counts leading to the target for a movement class, flooded out to the hunter
+        Every hunter chasing the same target with the same movement class shares one field, which floods only as
+            far as the farthest of them. The flood first goes hunt_detour moves beyond the hunter's straight line
+            distance, and doubles that limit until the hunter is reached or the whole area the target can be reached
+            from is settled. Fields are dropped once the terrain elevation changes, and fields toward an old target
+            are dropped when a new target is requested
         :param target_x: x int coordinate of target on game map
         :param target_y: y int coordinate of target on game map
         :param elevations: str of Elevation lookup
-        :return: dict of tuple (x, y) coordinates -> tuple (x, y) coordinates
+        :param hunter_x: x int coordinate of the hunter on game map
+        :param hunter_y: y int coordinate of the hunter on game map
+        :return: DistanceField
         """
-        frontier = Queue()
-        frontier.put((target_x, target_y))
-        came_from = dict()
-        came_from[(target_x, target_y)] = (target_x, target_y)
-        
-        # lets create the dict, but stop when we've included ALL the neighbors around the target
-        #  rather than just when we find the target
-        surrounding = self.get_neighbors_at_elevations(x=entity_x, y=entity_y, elevations=elevations)
-        
-        while not frontier.empty():
-            current = frontier.get()
-            x, y = current
-            for neighbor in self.get_neighbors_at_elevations(x=x, y=y, elevations=elevations):
-                if neighbor not in came_from:
-                    frontier.put(neighbor)
-                    came_from[(neighbor[0], neighbor[1])] = current
-                    if neighbor in surrounding:
-                        surrounding.remove(neighbor)
-                        if len(surrounding) <= 0:
-                            with frontier.mutex:
-                                frontier.queue.clear()
-        # change came_from to distances
-        distance_map = {(entity_x, entity_y): get_distance(entity_x, entity_y, target_x, target_y)}
-        for (x, y) in came_from.keys():
-            distance_map[x, y] = get_distance(x, y, target_x, target_y)
-        
-        return distance_map
+        if self._distance_fields_generation != self.terrain.elevation_generation:
+            self._distance_fields.clear()
+            self._distance_fields_generation = self.terrain.elevation_generation
+        key = (target_x, target_y, elevations)
+        field = self._distance_fields.get(key)
+        if field is None:
+            for stale in [k for k in self._distance_fields if k[:2] != (target_x, target_y)]:
+                del self._distance_fields[stale]
+            field = DistanceField.build(self, target_x, target_y, elevations)
+            self._distance_fields[key] = field
+        limit = get_distance(hunter_x, hunter_y, target_x, target_y) + hunt_detour
+        while field.reach(self, hunter_x, hunter_y, limit) is None and not field.flooded:
+            limit *= 2
+        return field
     
     def get_neighbors_at_elevations(self, x, y, elevations: str) -> List[Tuple[int, int]]:
         """
@@ -244,14 +291,57 @@ class GameMap:
         :param elevations: str of Elevation lookup
         :return: list of tuple (x, y) coordinates
         """
-        neighbors = []
-        for direction in cube_directions:
-            start_cube = hex_to_cube(hexagon=Hex(column=x, row=y))
-            neighbor_hex = cube_to_hex(cube=cube_add(cube1=start_cube, cube2=direction))
-            if self.in_bounds(neighbor_hex.col, neighbor_hex.row) \
-                    and self.terrain[neighbor_hex.col][neighbor_hex.row].elevation in move_elevations[elevations]:
-                neighbors.append((neighbor_hex.col, neighbor_hex.row))
-        return neighbors
+        height = self.height
+        return [divmod(neighbor, height) for neighbor in self.get_neighbor_ids(x * height + y, elevations)]
+    
+    def add_entity(self, entity: Entity) -> None:
+        """
+        Adds an entity to the map and files it in the position index under its current location
+        :param entity: Entity to add
+        :return: None
+        """
+        self.entities.add(entity)
+        self.changed_entities.add(entity)
+        self._entity_index.setdefault((entity.x, entity.y), set()).add(entity)
+    
+    def remove_entity(self, entity: Entity) -> None:
+        """
+        Removes an entity from the map and from the position index
+        :param entity: Entity to remove
+        :return: None
+        """
+        self.entities.remove(entity)
+        self.changed_entities.add(entity)
+        self._unindex_entity(entity, entity.x, entity.y)
+    
+    def move_entity(self, entity: Entity, old_x: int, old_y: int) -> None:
+        """
+        Re-files an entity in the position index after its coordinates changed
+        :param entity: Entity that moved
+        :param old_x: x int coordinate the entity moved from
+        :param old_y: y int coordinate the entity moved from
+        :return: None
+        """
+        self._unindex_entity(entity, old_x, old_y)
+        self.changed_entities.add(entity)
+        self._entity_index.setdefault((entity.x, entity.y), set()).add(entity)
+    
+    def _unindex_entity(self, entity: Entity, x: int, y: int) -> None:
+        entities = self._entity_index.get((x, y))
+        if entities is not None:
+            entities.discard(entity)
+            if not entities:
+                del self._entity_index[(x, y)]
+    
+    def get_entities_at_location(self, grid_x: int, grid_y: int) -> Set[Entity]:
+        """
+        Returns the entities at a particular coordinate from the position index
+        The returned set belongs to the index, callers must copy it before changing it
+        :param grid_x: x int coordinate of game map
+        :param grid_y: y int coordinate of game map
+        :return: set of Entity
+        """
+        return self._entity_index.get((grid_x, grid_y), set())
     
     def get_targets_at_location(self, grid_x: int, grid_y: int) -> List[Optional]:
         """
@@ -260,14 +350,7 @@ class GameMap:
         :param grid_y: y int coordinate of game map
         :return: list of Actor
         """
-        living_targets = []
-        for entity in self.entities:
-            if entity.x == grid_x and entity.y == grid_y:
-                if entity.is_alive:
-                    living_targets.append(entity)
-        if self.engine.player in living_targets:
-            living_targets.remove(self.engine.player)
-        return living_targets
+        return self.get_targets_in_region([(grid_x, grid_y)])
     
     def get_items_at_location(self, grid_x: int, grid_y: int) -> List[Entity]:
         """
@@ -276,14 +359,25 @@ class GameMap:
         :param grid_y: y int coordinate of game map
         :return: list of Entity
         """
-        items = []
-        for entity in self.entities:
-            if entity.x == grid_x and entity.y == grid_y:
-                if not entity.is_alive:
-                    items.append(entity)
-        if self.engine.player in items:
-            items.remove(self.engine.player)
-        return items
+        player = self.engine.player
+        return [entity for entity in self._entity_index.get((grid_x, grid_y), ())
+                if not entity.is_alive and entity is not player]
+    
+    def get_targets_in_region(self, hexes: Iterable[Tuple[int, int]]) -> List[Entity]:
+        """
+        Returns a list of living Actors (other than the player) standing on any of the given hexes
+            cost is proportional to the number of hexes, not the number of entities on the map
+        :param hexes: iterable of Tuple (x, y) coordinates
+        :return: list of Actor
+        """
+        index = self._entity_index
+        player = self.engine.player
+        targets = []
+        for location in hexes:
+            entities = index.get(location)
+            if entities:
+                targets.extend(entity for entity in entities if entity.is_alive and entity is not player)
+        return targets
     
     def decoration_damage(self, x: int, y: int, entity: Entity, conditions: Conditions):
         color = 'pink' if entity == self.engine.player else 'mountain'
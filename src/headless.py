@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Plays the game without a display - generates a map from a seed and feeds the player a scripted or random stream
+    of actions, running the same turn pipeline as the main event handler
+usage: python headless.py --seed 8617 --turns 1000 [--script actions.txt] [--render-every 10] [--profile turns.csv]
+    [--check-journal]
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from argparse import ArgumentParser
+from itertools import cycle
+from json import dumps, loads
+from random import Random
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import pygame
+from pygame import Surface
+
+from actions.attack.attack_choice import AttackAction
+from actions.auto.auto import AutoAction
+from actions.base.base import Action
+from actions.move.movement import MovementAction
+from actions.move.rotate import RotateAction
+from actions.ship_config.ship import ShipAction
+from constants.constants import map_width, map_height, FPS
+from constants.enums import GameStates, Location, ShipConfig
+from custom_exceptions import Impossible
+from entity import Entity
+from game import game_data, new_game
+from save_format import compress, decode
+from save_journal import SaveJournal, journal_header, plane_names, read_journal, replay
+from ui import DisplayInfo
+
+"""
+Actions a script can name, and how often the random stream picks each one
+"""
+player_actions: Dict[str, Callable[[Entity], Action]] = {
+    'move': lambda player: MovementAction(player),
+    'left': lambda player: RotateAction(player, -1),
+    'right': lambda player: RotateAction(player, 1),
+    'wait': lambda player: AutoAction(player),
+    'sails': lambda player: ShipAction(player, ShipConfig.SAILS),
+    'fire_fore': lambda player: AttackAction(player, Location.FORE),
+    'fire_port': lambda player: AttackAction(player, Location.PORT),
+    'fire_starboard': lambda player: AttackAction(player, Location.STARBOARD),
+    'fire_aft': lambda player: AttackAction(player, Location.AFT),
+}
+action_weights = {
+    'move': 8,
+    'left': 3,
+    'right': 3,
+    'wait': 2,
+    'sails': 1,
+    'fire_fore': 1,
+    'fire_port': 1,
+    'fire_starboard': 1,
+    'fire_aft': 1,
+}
+
+
+stall_limit = 1000
+
+
+class HeadlessClock:
+    def __init__(self, fps: int = FPS):
+        """
+        Stand-in for pygame.time.Clock that never sleeps - every frame takes exactly 1 / fps seconds of game time
+        :param fps: int frames per second reported
+        """
+        self.fps = fps
+    
+    def tick(self, framerate: int = 0) -> int:
+        return 1000 // self.fps
+    
+    def get_fps(self) -> float:
+        return float(self.fps)
+
+
+def random_actions(seed: int) -> Iterator[str]:
+    """
+    Endless stream of action names - has its own random generator so it does not disturb the game's
+    :param seed: int seed of the stream
+    :return: iterator of action names
+    """
+    rng = Random(seed)
+    names = list(action_weights)
+    weights = list(action_weights.values())
+    while True:
+        yield rng.choices(names, weights)[0]
+
+
+def read_script(file_path: str) -> Iterator[str]:
+    """
+    Reads action names from a file, whitespace separated, # starts a comment - the script repeats until the run ends
+    :param file_path: str path of the script
+    :return: iterator of action names
+    """
+    with open(file_path) as script:
+        names = [name for line in script for name in line.split('#')[0].split()]
+    unknown = set(names) - set(player_actions)
+    if unknown:
+        raise ValueError(f"Unknown actions in {file_path}: {', '.join(sorted(unknown))}")
+    return cycle(names)
+
+
+def canonical(data: Dict) -> Dict:
+    """
+    Returns save json as it reads back from a file, with the entities in a fixed order
+        the game map keeps its entities in a set, so their order differs between a game and its loaded save
+    :param data: dict with 'engine', 'game_map' and 'player' json
+    :return: dict of comparable json
+    """
+    data = loads(dumps(data))
+    data['game_map']['entities'] = sorted(dumps(entity, sort_keys=True) for entity in data['game_map']['entities'])
+    return data
+
+
+class TurnDriver:
+    def __init__(self, seed: int, render_every: int = 0, check_journal: bool = False):
+        """
+        Runs a new game with no display and no real time
+        :param seed: int map seed
+        :param render_every: int render all panels to an off-screen surface every n turns, 0 never renders
+        :param check_journal: bool autosave every turn to memory, and at the end check that the last save with its
+            journal replayed reads back as the game
+        """
+        self.ui_layout = DisplayInfo(map_width, map_height)
+        self.player, self.engine = new_game(self.ui_layout, seed=seed, clock=HeadlessClock())
+        self.render_every = render_every
+        self.surface: Optional[Surface] = None
+        if render_every:
+            self.surface = Surface((self.ui_layout.display_width, self.ui_layout.display_height))
+        self.turns = 0
+        self.impossible = 0
+        self.journal: Optional[SaveJournal] = SaveJournal() if check_journal else None
+        self.save_blob = b''
+        self.journal_entries: List[bytes] = []
+    
+    def autosave(self) -> None:
+        """
+        Keeps what Game.autosave would write - the last save file and the journal entries after it
+        :return: None
+        """
+        full, blob = self.journal.record(self.engine, self.engine.game_map, self.player,
+                                         len(self.save_blob) if self.save_blob else None)
+        if full:
+            self.save_blob = compress(blob)
+            self.journal_entries = []
+        else:
+            self.journal_entries.append(blob)
+    
+    def journal_mismatches(self) -> List[str]:
+        """
+        Loads the last save with its journal replayed and compares it with the game
+        :return: list of the save sections and terrain planes that differ, empty if the journal is faithful
+        """
+        data, terrain = decode(self.save_blob)
+        journal = journal_header(self.save_blob) + b''.join(self.journal_entries)
+        replay(data, terrain, read_journal(journal, self.save_blob))
+        loaded = canonical(data)
+        live = canonical(game_data(self.engine, self.engine.game_map, self.player))
+        mismatches = [section for section in live if live[section] != loaded[section]]
+        mismatches += [name for name in plane_names
+                       if getattr(terrain, name) != getattr(self.engine.game_map.terrain, name)]
+        return mismatches
+    
+    def play(self, actions: Iterable[str], turns: int) -> Dict:
+        """
+        Performs actions until the given number of turns have passed or the player dies - like the main event
+            handler, a turn passes when an action succeeds and an impossible action goes to the message log
+        :param actions: iterable of action names
+        :param turns: int number of turns to play
+        :return: dict of run results
+        """
+        engine = self.engine
+        stalled = 0  # impossible actions in a row - a script that can only fail would never end
+        start = perf_counter()
+        for name in actions:
+            if self.turns >= turns or engine.game_state == GameStates.PLAYER_DEAD or stalled > stall_limit:
+                break
+            try:
+                something_happened = player_actions[name](self.player).perform()
+            except Impossible as e:
+                engine.message_log.add_message(e.args[0], text_color='gray')
+                self.impossible += 1
+                stalled += 1
+                something_happened = False
+            if something_happened:
+                stalled = 0
+                engine.end_turn()
+                self.turns += 1
+                if self.journal is not None:
+                    self.autosave()
+                if self.render_every and self.turns % self.render_every == 0:
+                    engine.mark_dirty()
+                    engine.render_all(self.surface)
+        elapsed = perf_counter() - start
+        results = {
+            'seed': engine.seed,
+            'turns': self.turns,
+            'impossible': self.impossible,
+            'seconds': elapsed,
+            'turns_per_second': self.turns / elapsed if elapsed else 0.0,
+            'player_alive': engine.game_state != GameStates.PLAYER_DEAD,
+            'position': (self.player.x, self.player.y),
+        }
+        if self.journal is not None:
+            results['journal_mismatches'] = self.journal_mismatches()
+        return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Play Isles of Mist turns without a display")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--turns', type=int, default=1000)
+    parser.add_argument('--script', help="file of action names, random actions if not given")
+    parser.add_argument('--render-every', type=int, default=0)
+    parser.add_argument('--profile', help="write the per phase turn and render timings to a .csv or .json file")
+    parser.add_argument('--check-journal', action='store_true',
+                        help="autosave every turn and check that the save replayed from its journal matches the game")
+    args = parser.parse_args()
+    
+    pygame.init()
+    driver = TurnDriver(seed=args.seed, render_every=args.render_every, check_journal=args.check_journal)
+    actions = read_script(args.script) if args.script else random_actions(args.seed)
+    print(driver.play(actions, args.turns))
+    if args.profile:
+        driver.engine.profiler.export(args.profile)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
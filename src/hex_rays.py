@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+from utilities import Cube, cube_line_draw, cube_neighbor, cube_to_hex
+
+"""
+Offsets of one ray - (column, row) steps from the origin hex, origin excluded
+"""
+Ray = Tuple[Tuple[int, int], ...]
+
+_ray_templates: Dict[Tuple[int, int, int], Tuple[Ray, ...]] = {}
+
+
+def ring_endpoints(radius: int, origin: Cube = None) -> Tuple[Cube, ...]:
+    """
+    Returns the cubes on the ring at the given radius, starting radius steps in direction 4 and walking the ring
+        in direction order - the order rays are cast in a field of view
+    :param radius: int ring distance from the origin
+    :param origin: cubic coordinates of the ring center (defaults to 0, 0, 0)
+    :return: tuple of ring cubes
+    """
+    current = Cube(0, 0, 0) if origin is None else origin
+    for k in range(0, radius):
+        current = cube_neighbor(cube=current, direction=4)
+    ring = []
+    for i in range(0, 6):
+        for j in range(0, radius):
+            ring.append(current)
+            current = cube_neighbor(current, i)
+    return tuple(ring)
+
+
+def get_ray_templates(radius: int, column: int, row: int) -> Tuple[Ray, ...]:
+    """
+    Returns the rays from a hex to every hex on the ring at the given radius as (column, row) offsets
+    cube_line_draw rounds half-way points to even values, so a line's shape depends on the parity of the origin's
+        cube coordinates as well as the column parity - templates are built once per radius and parity class and
+        then only need translating
+    :param radius: int ring distance
+    :param column: int column (x) of the origin hex
+    :param row: int row (y) of the origin hex
+    :return: tuple of rays, each a tuple of (column, row) offsets in order of distance from the origin
+    """
+    x_parity = column % 2
+    z_parity = (row - (column - x_parity) // 2) % 2
+    key = (radius, x_parity, z_parity)
+    templates = _ray_templates.get(key)
+    if templates is None:
+        # any origin in the same parity class draws the same lines
+        origin = Cube(x=x_parity, y=-x_parity - z_parity, z=z_parity)
+        origin_hex = cube_to_hex(origin)
+        rays = []
+        for endpoint in ring_endpoints(radius, origin):
+            ray = []
+            for cube in cube_line_draw(cube1=origin, cube2=endpoint):
+                hx = cube_to_hex(cube)
+                ray.append((hx.col - origin_hex.col, hx.row - origin_hex.row))
+            rays.append(tuple(ray))
+        templates = tuple(rays)
+        _ray_templates[key] = templates
+    return templates
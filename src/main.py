@@ -9,6 +9,8 @@ from constants.constants import map_width, map_height, caption
 from constants.images import misc_icons
 from event_handlers.main_menu import MainMenuHandler
 from render.main_menu import main_menu_render
+from render.utilities import cache_all_rotations
+from save_format import json_save_path, save_path
 from ui import DisplayInfo
 
 
@@ -21,6 +23,7 @@ def main() -> None:
                                            flags=pygame.SCALED | pygame.RESIZABLE)
     pygame.display.set_caption(caption)
     pygame.display.set_icon(misc_icons['compass'])
+    cache_all_rotations()
     
     shift_mod = False
     event_handler = MainMenuHandler(shift_mod=shift_mod)
@@ -42,7 +45,7 @@ def main() -> None:
 def available_loads() -> List[int]:
     available = []
     for x in range(1, 5):
-        if path.exists(f"data/save_game_{x}.json"):
+        if path.exists(save_path(x)) or path.exists(json_save_path(x)):
             available.append(x)
     return available
 
@@ -6,7 +6,7 @@ from pygame import Surface
 
 from constants.colors import colors
 from constants.constants import game_font, margin
-from render.utilities import render_border
+from render.utilities import render_border, render_text
 from ui import DisplayInfo
 
 if TYPE_CHECKING:
@@ -106,7 +106,7 @@ class MessageLog:
             if message.count > 1:
                 count = f" (x {message.count})"
             text = f"{message.plain_text}{count}"
-            message_surf.blit(game_font.render(text, True, colors[message.color]),
+            message_surf.blit(render_text(text, True, colors[message.color]),
                               (x + margin, y + margin - y_offset * game_font.get_height()))
             y_offset += 1
             if y_offset > height:
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
+from itertools import compress
 from math import pow
-from queue import Queue
+from operator import gt
 from random import randint, random, choice
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Tuple
 from typing import TYPE_CHECKING
 
 from opensimplex import OpenSimplex
@@ -13,7 +16,8 @@ from components.cargo import Cargo
 from constants.constants import move_elevations
 from constants.enums import Elevation
 from game_map import GameMap
-from tile import Terrain
+from regions import Regions
+from tile import decoration_id
 from weather import Weather
 
 if TYPE_CHECKING:
@@ -45,8 +49,29 @@ ELEVATION_LEVEL = {
     'mountain': 255,
 }
 
-
-def generate_map(map_width: int, map_height: int, engine: Engine, seed: int, ui_layout: DisplayInfo) -> GameMap:
+"""
+Island noise below each bound takes the matching elevation, anything above the last bound is MOUNTAIN
+"""
+ELEVATION_BOUNDS = [ELEVATION_LEVEL[name] for name in ['ocean', 'water', 'shallows', 'beach', 'grass', 'jungle']]
+ELEVATION_BANDS = [Elevation.OCEAN, Elevation.WATER, Elevation.SHALLOWS, Elevation.BEACH, Elevation.GRASS,
+                   Elevation.JUNGLE, Elevation.MOUNTAIN]
+
+"""
+Decoration for each (rock, coral, sandbar, seaweed) layer by island noise band - below shallows, beach, grass, jungle
+    and mountain. Noise at or above the mountain level gets no decoration
+"""
+DECORATION_BOUNDS = [ELEVATION_LEVEL[name] for name in ['shallows', 'beach', 'grass', 'jungle', 'mountain']]
+DECORATION_ROWS = [
+    ['rocks', 'coral', 'sandbar', 'seaweed'],
+    ['quarry', 'claypool', 'tidepool', 'tidepool'],  # clay pit
+    ['quarry', 'claypool', 'farmland', 'farmland'],  # clay pit
+    ['mine', 'claypool', 'swamp', 'swamp'],
+    ['mine', 'mine', 'volcano', 'volcano'],
+]
+
+
+def generate_map(map_width: int, map_height: int, engine: Engine, seed: int, ui_layout: DisplayInfo,
+                 entity_density: int = 50) -> GameMap:
     player = engine.player
     
     island_map = GameMap(width=map_width, height=map_height, engine=engine, entities=[player])
@@ -56,117 +81,55 @@ def generate_map(map_width: int, map_height: int, engine: Engine, seed: int, ui_
     island_noise = make_noise_island_map(map_width, map_height, ev, ISLAND_GEN)
     
     ev = OpenSimplex(seed=seed + 1)
-    coral_noise = make_noise_list(map_width, map_height, ev, DECORATION_GEN)
+    coral_noise = make_noise_mask(map_width, map_height, ev, DECORATION_GEN)
     
     ev = OpenSimplex(seed=seed + 2)
-    rock_noise = make_noise_list(map_width, map_height, ev, DECORATION_GEN)
+    rock_noise = make_noise_mask(map_width, map_height, ev, DECORATION_GEN)
     
     ev = OpenSimplex(seed=seed + 3)
-    sandbar_noise = make_noise_list(map_width, map_height, ev, DECORATION_GEN)
+    sandbar_noise = make_noise_mask(map_width, map_height, ev, DECORATION_GEN)
     
     ev = OpenSimplex(seed=seed + 4)
-    seaweed_noise = make_noise_list(map_width, map_height, ev, DECORATION_GEN)
+    seaweed_noise = make_noise_mask(map_width, map_height, ev, DECORATION_GEN)
     
-    for x in range(map_width):
-        for y in range(map_height):
-            
-            # add mist
-            mist_chance = island_map.weather.get_weather_info['mist'] \
-                          + engine.time.get_time_of_day_info['mist']
-            mist = True if randint(0, 99) < mist_chance else False
-            
-            # decoration
-            decoration = None
-            if island_noise[x][y] < ELEVATION_LEVEL['shallows']:
-                if (x, y) in rock_noise:
-                    decoration = "rocks"
-                elif (x, y) in coral_noise:
-                    decoration = "coral"
-                elif (x, y) in sandbar_noise:
-                    decoration = "sandbar"
-                elif (x, y) in seaweed_noise:
-                    decoration = "seaweed"
-            elif island_noise[x][y] < ELEVATION_LEVEL['beach']:
-                if (x, y) in rock_noise:
-                    decoration = "quarry"
-                elif (x, y) in coral_noise:
-                    decoration = "claypool"  # clay pit
-                elif (x, y) in sandbar_noise:
-                    decoration = "tidepool"
-                elif (x, y) in seaweed_noise:
-                    decoration = "tidepool"
-            elif island_noise[x][y] < ELEVATION_LEVEL['grass']:
-                if (x, y) in rock_noise:
-                    decoration = "quarry"
-                elif (x, y) in coral_noise:
-                    decoration = "claypool"  # clay pit
-                elif (x, y) in sandbar_noise:
-                    decoration = "farmland"
-                elif (x, y) in seaweed_noise:
-                    decoration = "farmland"
-            elif island_noise[x][y] < ELEVATION_LEVEL['jungle']:
-                if (x, y) in rock_noise:
-                    decoration = "mine"
-                elif (x, y) in coral_noise:
-                    decoration = "claypool"
-                elif (x, y) in sandbar_noise:
-                    decoration = "swamp"
-                elif (x, y) in seaweed_noise:
-                    decoration = "swamp"
-            elif island_noise[x][y] < ELEVATION_LEVEL['mountain']:
-                if (x, y) in rock_noise:
-                    decoration = "mine"
-                elif (x, y) in coral_noise:
-                    decoration = "mine"
-                elif (x, y) in sandbar_noise:
-                    decoration = "volcano"
-                elif (x, y) in seaweed_noise:
-                    decoration = "volcano"
-            
-            if island_noise[x][y] < ELEVATION_LEVEL['ocean']:
-                island_map.terrain[x][y] = Terrain(elevation=Elevation.OCEAN,
-                                                   explored=False,
-                                                   decoration=decoration,
-                                                   mist=mist)
-            elif island_noise[x][y] < ELEVATION_LEVEL['water']:
-                island_map.terrain[x][y] = Terrain(elevation=Elevation.WATER,
-                                                   explored=False,
-                                                   decoration=decoration,
-                                                   mist=mist)
-            elif island_noise[x][y] < ELEVATION_LEVEL['shallows']:
-                island_map.terrain[x][y] = Terrain(elevation=Elevation.SHALLOWS,
-                                                   explored=False,
-                                                   decoration=decoration,
-                                                   mist=mist)
-            elif island_noise[x][y] < ELEVATION_LEVEL['beach']:
-                island_map.terrain[x][y] = Terrain(elevation=Elevation.BEACH,
-                                                   explored=False,
-                                                   decoration=decoration,
-                                                   mist=mist)
-            elif island_noise[x][y] < ELEVATION_LEVEL['grass']:
-                island_map.terrain[x][y] = Terrain(elevation=Elevation.GRASS,
-                                                   explored=False,
-                                                   decoration=decoration,
-                                                   mist=mist)
-            elif island_noise[x][y] < ELEVATION_LEVEL['jungle']:
-                island_map.terrain[x][y] = Terrain(elevation=Elevation.JUNGLE,
-                                                   explored=False,
-                                                   decoration=decoration,
-                                                   mist=mist)
-            else:  # ELEVATION_LEVEL['mountain']
-                island_map.terrain[x][y] = Terrain(elevation=Elevation.MOUNTAIN,
-                                                   explored=False,
-                                                   decoration=decoration,
-                                                   mist=mist)
-
-    ocean = explore_water_iterative(island_map)
-    islands = explore_islands(island_map, ocean)
-    island = big_island(islands)
-    place_port(island_map, island, ocean)
+    # which decoration layer claims each tile - 1 rock, 2 coral, 3 sandbar, 4 seaweed, earlier layers win
+    layer_hits = bytearray(map_width * map_height)
+    for layer, mask in reversed(list(enumerate([rock_noise, coral_noise, sandbar_noise, seaweed_noise], 1))):
+        for cell in compress(range(len(mask)), mask):
+            layer_hits[cell] = layer
+    decoration_rows = [[decoration_id(name) for name in row] for row in DECORATION_ROWS]
+    elevation_values = [elevation.value for elevation in ELEVATION_BANDS]
+    
+    terrain = island_map.terrain
+    elevation_plane = terrain.elevation
+    decoration_plane = terrain.decoration
+    mist_plane = terrain.mist
+    mist_chance = island_map.weather.get_weather_info['mist'] + engine.time.get_time_of_day_info['mist']
+    # cell ids run x * height + y, the same order the tiles were generated in column by column
+    for cell, noise_value in enumerate(island_noise):
+        # add mist
+        mist_plane[cell] = 1 if randint(0, 99) < mist_chance else 0
+        
+        # decoration
+        layer = layer_hits[cell]
+        if layer:
+            row = bisect_right(DECORATION_BOUNDS, noise_value)
+            decoration_plane[cell] = decoration_rows[row][layer - 1] if row < len(decoration_rows) else 0
+        else:
+            decoration_plane[cell] = 0
+        
+        elevation_plane[cell] = elevation_values[bisect_right(ELEVATION_BOUNDS, noise_value)]
+    terrain.elevation_generation += 1
+    terrain.mist_generation += 1
+    
+    water = Regions.label(island_map, 'water')
+    land = Regions.label(island_map, 'land')
+    island = big_island(land)
+    place_port(island_map, land.coastlines[island], water)
     place_player(island_map, player)
     
-    elevations = elevation_choices(island_map, player.view.fov)
-    place_entities(island_map, elevations)
+    pools = spawn_pools(island_map, player.view.fov)
+    place_entities(island_map, pools, entity_density)
     return island_map
 
 
@@ -212,156 +175,148 @@ def place_player(island_map, player):
     player.view.set_fov()
 
 
-def explore_islands(island_map, ocean) -> List[List[Tuple[int, int]]]:
-    island_list = []
-    land_list = []
-    for x in range(island_map.width):
-        for y in range(island_map.height):
-            if (x, y) not in ocean and (x, y) not in land_list:
-                island = explore_land_iterative(island_map, x=x, y=y)
-                island_list.append(island)
-                land_list.extend(island)
-    return island_list
-
-
-def big_island(island_list: List[List[Tuple[int, int]]]) -> List[Tuple[int, int]]:
+def big_island(land: Regions) -> int:
+    """
+    Returns the number of the largest island (the first one found if several share the largest size)
+    :param land: Regions of the land
+    :return: int region number
+    """
     big_size = 0
-    biggest = []
-    for island in island_list:
-        if len(island) > big_size:
-            big_size = len(island)
+    biggest = 0
+    for island, size in enumerate(land.sizes):
+        if size > big_size:
+            big_size = size
             biggest = island
     return biggest
 
 
-def place_port(island_map: GameMap, island, ocean):
-    coastline = []
-    for (x, y) in island:
-        neighbors = island_map.get_neighbors_at_elevations(x, y, elevations='water')
-        coast = False
-        for neighbor in neighbors:
-            if neighbor in ocean:
-                coast = True
-        if coast:
-            coastline.append((x, y))
-    (x, y) = choice(coastline)
+def place_port(island_map: GameMap, coastline: List[int], water: Regions):
+    """
+    Puts the port on a random coast cell of an island that touches the ocean, rather than an inland lake
+    :param island_map: GameMap
+    :param coastline: list of cell ids on the island's coast
+    :param water: Regions of the water - the ocean is the region holding the (0, 0) corner
+    :return: None
+    """
+    table = island_map.neighbor_table
+    labels = water.labels
+    ocean = labels[0]
+    coastline = [cell for cell in coastline
+                 if any(neighbor >= 0 and labels[neighbor] == ocean for neighbor in table[6 * cell:6 * cell + 6])]
+    (x, y) = divmod(choice(coastline), island_map.height)
     island_map.terrain[x][y].decoration = "port"
     island_map.port.location = (x, y)
     print((x, y))
 
 
-def make_noise_island_map(map_width, map_height, ev, params):
+def make_noise_island_map(map_width, map_height, ev, params) -> array:
+    """
+    Island height noise, a rounded 0-256 value per cell id (x * height + y)
+    :param map_width: width of the game map
+    :param map_height: height of the game map
+    :param ev: OpenSimplex noise generator
+    :param params: ISLAND_GEN style dict of frequency and falloff power ranges
+    :return: array of int heights
+    """
     frequency = params['frequency']
     rand_pow_x = randint(params['rand_pow_x_low'], params['rand_pow_x_high'])
     rand_pow_y = randint(params['rand_pow_y_low'], params['rand_pow_y_high'])
-    
-    center_x = (map_width - 1) / 2.0
-    center_y = (map_height - 1) / 2.0
-    noise_map = [[0 for y in range(map_height)] for x in range(map_width)]
-    for x in range(map_width):
-        for y in range(map_height):
-            nx = x / map_width - 0.5
-            ny = y / map_height - 0.5
-            elevation_sum = 0
-            i_sum = 0
-            for i in range(1, 6):
-                p = pow(2, i)
-                elevation_sum += noise(ev, p * frequency * nx, p * frequency * ny) / p
-                i_sum += 1 / p
-            elevation = elevation_sum / i_sum
-            x_dist = abs(center_x - x)
-            y_dist = abs(center_y - y)
-            x_ratio = 1 - pow(x_dist / center_x, rand_pow_x)
-            y_ratio = 1 - pow(y_dist / center_y, rand_pow_y)
-            ratio = min(x_ratio, y_ratio)
-            noise_map[x][y] = round(256 * elevation * ratio)
-    return noise_map
+    return make_noise_layer(map_width, map_height, ev, frequency, rand_pow_x, rand_pow_y)
 
 
-def make_noise_list(map_width, map_height, ev, params):
-    frequency = params['frequency']
-    rand_pow_x = params['rand_pow_x']
-    rand_pow_y = params['rand_pow_y']
+def make_noise_mask(map_width, map_height, ev, params) -> bytearray:
+    """
+    Decoration noise thresholded at the cutoff, 1 per cell id (x * height + y) where the decoration appears
+    :param map_width: width of the game map
+    :param map_height: height of the game map
+    :param ev: OpenSimplex noise generator
+    :param params: DECORATION_GEN style dict of frequency, falloff powers and cutoff
+    :return: bytearray mask
+    """
+    layer = make_noise_layer(map_width, map_height, ev, params['frequency'], params['rand_pow_x'], params['rand_pow_y'])
+    cutoff = params['cutoff']
+    return bytearray(1 if value >= cutoff else 0 for value in layer)
+
+
+def make_noise_layer(map_width, map_height, ev, frequency, rand_pow_x, rand_pow_y) -> array:
+    """
+    Five octaves of noise summed per cell id (x * height + y), faded toward the map edges and scaled to 0-256
+    The sample coordinates of each octave and the falloff of each column and row are worked out once up front -
+        the falloff is the smaller of a column ratio and a row ratio, so it separates into two short tables
+    :param map_width: width of the game map
+    :param map_height: height of the game map
+    :param ev: OpenSimplex noise generator
+    :param frequency: base noise frequency
+    :param rand_pow_x: falloff power across columns
+    :param rand_pow_y: falloff power across rows
+    :return: array of int values
+    """
+    noise2d = ev.noise2d
+    octaves = []
+    i_sum = 0
+    for i in range(1, 6):
+        p = pow(2, i)
+        octaves.append((p,
+                        [p * frequency * (x / map_width - 0.5) for x in range(map_width)],
+                        [p * frequency * (y / map_height - 0.5) for y in range(map_height)]))
+        i_sum += 1 / p
+    x_ratios = falloff_ratios(map_width, rand_pow_x)
+    y_ratios = falloff_ratios(map_height, rand_pow_y)
     
-    center_x = (map_width - 1) / 2.0
-    center_y = (map_height - 1) / 2.0
-    noise_list = []
+    layer = array('i')
     for x in range(map_width):
-        for y in range(map_height):
-            nx = x / map_width - 0.5
-            ny = y / map_height - 0.5
-            elevation_sum = 0
-            i_sum = 0
-            for i in range(1, 6):
-                p = pow(2, i)
-                elevation_sum += noise(ev, p * frequency * nx, p * frequency * ny) / p
-                i_sum += 1 / p
-            elevation = elevation_sum / i_sum
-            x_dist = abs(center_x - x)
-            y_dist = abs(center_y - y)
-            x_ratio = 1 - pow(x_dist / center_x, rand_pow_x)
-            y_ratio = 1 - pow(y_dist / center_y, rand_pow_y)
-            ratio = min(x_ratio, y_ratio)
-            
-            if round(256 * elevation * ratio) >= params['cutoff']:
-                noise_list.append((x, y))
-    
-    return noise_list
+        # rescale each octave from -1.0:+1.0 to 0.0:1.0 (see noise) and weight it
+        column = [0] * map_height
+        for p, octave_xs, octave_ys in octaves:
+            nx = octave_xs[x]
+            column = [total + (noise2d(nx, ny) / 2.0 + 0.5) / p for total, ny in zip(column, octave_ys)]
+        x_ratio = x_ratios[x]
+        layer.extend(round(256 * (total / i_sum) * min(x_ratio, y_ratio)) for total, y_ratio in zip(column, y_ratios))
+    return layer
 
 
-def noise(gen, nx, ny):
-    # Rescale from -1.0:+1.0 to 0.0:1.0
-    return gen.noise2d(nx, ny) / 2.0 + 0.5
+def falloff_ratios(size: int, power: int) -> List[float]:
+    """
+    Edge falloff along one axis - 1 at the center dropping to 0 at both edges
+    :param size: int number of tiles along the axis
+    :param power: int steepness of the falloff
+    :return: list of float ratios
+    """
+    center = (size - 1) / 2.0
+    return [1 - pow(abs(center - i) / center, power) for i in range(size)]
 
 
-def place_entities(island_map: GameMap, elevations):
-    for entity in range((island_map.width * island_map.height) // 50):
+def place_entities(island_map: GameMap, pools: Dict[str, array], density: int = 50):
+    height = island_map.height
+    for entity in range((island_map.width * island_map.height) // density):
         # generate monsters here, add to entities list
         rnd = random()
         if rnd < .3:
-            available = []
-            for elevation in move_elevations['water']:
-                available.extend(elevations[elevation.name])
-            (x, y) = choice(available)
+            (x, y) = divmod(choice(pools['water']), height)
             turtle = entity_factory.turtle.spawn(island_map, x, y, randint(0, 5))
             turtle.view.set_fov()
             turtle.cargo = Cargo(max_volume=20, max_weight=20, manifest=get_entity_manifest('turtle'))
         elif rnd < .5:
-            available = []
-            for elevation in move_elevations['fly']:
-                available.extend(elevations[elevation.name])
-            (x, y) = choice(available)
+            (x, y) = divmod(choice(pools['fly']), height)
             bat = entity_factory.bat.spawn(island_map, x, y, randint(0, 5))
             bat.view.set_fov()
             bat.cargo = Cargo(max_volume=5, max_weight=5, manifest=get_entity_manifest('bat'))
         elif rnd < .7:
-            available = []
-            for elevation in move_elevations['shore']:
-                available.extend(elevations[elevation.name])
-            (x, y) = choice(available)
+            (x, y) = divmod(choice(pools['shore']), height)
             mermaid = entity_factory.mermaid.spawn(island_map, x, y, randint(0, 5))
             mermaid.view.set_fov()
             mermaid.cargo = Cargo(max_volume=5, max_weight=5, manifest=get_entity_manifest('mermaid'))
         elif rnd < .9:
-            available = []
-            for elevation in move_elevations['deep_water']:
-                available.extend(elevations[elevation.name])
-            (x, y) = choice(available)
+            (x, y) = divmod(choice(pools['deep_water']), height)
             serpent = entity_factory.serpent.spawn(island_map, x, y, randint(0, 5))
             serpent.view.set_fov()
             serpent.cargo = Cargo(max_volume=10, max_weight=10, manifest=get_entity_manifest('serpent'))
         elif rnd < .97:
-            available = []
-            for elevation in move_elevations['shallows']:
-                available.extend(elevations[elevation.name])
-            (x, y) = choice(available)
+            (x, y) = divmod(choice(pools['shallows']), height)
             shipwreck = entity_factory.shipwreck.spawn(island_map, x, y)
             shipwreck.cargo = Cargo(max_volume=20, max_weight=20, manifest=get_entity_manifest('shipwreck'))
         elif rnd < .98:
-            available = []
-            for elevation in move_elevations['ocean']:
-                available.extend(elevations[elevation.name])
-            (x, y) = choice(available)
+            (x, y) = divmod(choice(pools['ocean']), height)
             chest = entity_factory.chest.spawn(island_map, x, y)
             manifest = get_entity_manifest('chest')
             coins = 0
@@ -370,70 +325,29 @@ def place_entities(island_map: GameMap, elevations):
                 del (manifest['coins'])
             chest.cargo = Cargo(max_volume=10, max_weight=10, manifest=manifest, coins=coins)
         else:
-            available = []
-            for elevation in move_elevations['water']:
-                available.extend(elevations[elevation.name])
-            (x, y) = choice(available)
+            (x, y) = divmod(choice(pools['water']), height)
             bottle = entity_factory.bottle.spawn(island_map, x, y)
             bottle.cargo = Cargo(max_volume=2, max_weight=2, manifest=get_entity_manifest('bottle'))
 
 
-def elevation_choices(game_map: GameMap, player_fov) -> dict:
-    elevations = {}
-    for key in Elevation:
-        elevations[key.name] = []
-    for x in range(game_map.width):
-        for y in range(game_map.height):
-            elevations[game_map.terrain[x][y].elevation.name].append((x, y))
-    for key in Elevation:
-        for (x, y) in player_fov:
-            if (x, y) in elevations[key.name]:
-                elevations[key.name].remove((x, y))
-    return elevations
-
-
-def explore_water_iterative(game_map: GameMap) -> List[Tuple[int, int]]:
-    """
-    Finds all connected water from 0, 0
-    :param game_map: GameMap
-    :return: list of tile coordinates
-    """
-    x = 0
-    y = 0
-    frontier = Queue()
-    frontier.put((x, y))
-    visited = [(x, y)]
-    
-    while not frontier.empty():
-        current = frontier.get()
-        x, y = current
-        for neighbor in game_map.get_neighbors_at_elevations(x=x, y=y, elevations='water'):
-            if neighbor not in visited:
-                frontier.put(neighbor)
-                visited.append(neighbor)
-    return visited
-
-
-def explore_land_iterative(game_map: GameMap, x: int, y: int) -> List[Tuple[int, int]]:
+def spawn_pools(game_map: GameMap, excluded: Iterable[Tuple[int, int]]) -> Dict[str, array]:
     """
-    Finds all "islands" on the game map. "islands" are sets of adjacent land tiles. "land tiles" have elevation > 2
-    :param game_map: GameMap
-    :param x: int x coordinate
-    :param y: int y coordinate
-    :return: list of tile coordinates
+    Builds the cell ids each movement class can spawn on, leaving out the excluded hexes (the player's view)
+    Pools are built once per map, so each spawn is a single random pick
+    :param game_map: GameMap to spawn on
+    :param excluded: iterable of (x, y) coordinates nothing may spawn on
+    :return: dict of move_elevations name -> array of cell ids (x * height + y)
     """
-    frontier = Queue()
-    frontier.put((x, y))
-    visited = [(x, y)]
-    
-    while not frontier.empty():
-        current = frontier.get()
-        x, y = current
-        for neighbor in game_map.get_neighbors_at_elevations(x=x, y=y, elevations='land'):
-            if neighbor not in visited:
-                frontier.put(neighbor)
-                visited.append(neighbor)
-    return visited
+    height = game_map.height
+    exclusion = bytearray(game_map.width * height)
+    for (x, y) in excluded:
+        if game_map.in_bounds(x, y):
+            exclusion[x * height + y] = 1
+    pools = {}
+    for name in move_elevations.keys():
+        mask = game_map.passable(name)
+        pools[name] = array('i', compress(range(len(mask)), map(gt, mask, exclusion)))
+    return pools
 
 
 def get_entity_manifest(entity):
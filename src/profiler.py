@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import csv
+from collections import deque
+from json import dump
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from constants.constants import profile_window
+
+"""
+Upper bounds in ms of the histogram buckets - a last bucket holds everything slower
+"""
+bucket_bounds = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 33.0)
+bucket_names = [f'le_{bound:g}ms' for bound in bucket_bounds] + [f'gt_{bucket_bounds[-1]:g}ms']
+
+
+def bucket(ms: float) -> int:
+    for index, bound in enumerate(bucket_bounds):
+        if ms <= bound:
+            return index
+    return len(bucket_bounds)
+
+
+class PhaseTimes:
+    def __init__(self, window: int = profile_window):
+        """
+        Timings of one profiled phase
+        :param window: int number of recent timings kept for percentiles and the histogram
+        """
+        self.calls = 0
+        self.total = 0.0  # ms over every call, not only the window
+        self.times = deque(maxlen=window)  # ms per call
+    
+    def record(self, ms: float) -> None:
+        self.calls += 1
+        self.total += ms
+        self.times.append(ms)
+    
+    def histogram(self) -> List[int]:
+        """
+        Counts the recent timings per bucket of bucket_bounds
+        :return: list of counts, one more than there are bounds
+        """
+        counts = [0] * (len(bucket_bounds) + 1)
+        for ms in self.times:
+            counts[bucket(ms)] += 1
+        return counts
+    
+    def summary(self) -> Dict:
+        """
+        Returns the counters, the recent timings and their histogram
+        :return: dict of statistics, times in ms
+        """
+        times = sorted(self.times)
+        return {
+            'calls': self.calls,
+            'total_ms': self.total,
+            'mean_ms': sum(times) / len(times) if times else 0.0,
+            'p50_ms': times[len(times) // 2] if times else 0.0,
+            'p95_ms': times[int(len(times) * 0.95)] if times else 0.0,
+            'max_ms': times[-1] if times else 0.0,
+            'histogram': self.histogram(),
+        }
+
+
+class PhaseTimer:
+    def __init__(self, times: PhaseTimes):
+        """
+        Context manager timing the block it wraps - one per phase, reused by every call
+        :param times: PhaseTimes the timings go to
+        """
+        self.times = times
+        self.start = 0.0
+    
+    def __enter__(self) -> PhaseTimer:
+        self.start = perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.times.record((perf_counter() - self.start) * 1000)
+
+
+class Profiler:
+    def __init__(self, window: int = profile_window):
+        """
+        Named timers around the phases of a turn, the AI of each entity class and each panel of a render
+            phases are named like 'turn.enemies', 'ai.HostileEnemy' or 'render.viewport'
+        :param window: int number of recent timings kept per phase
+        """
+        self.window = window
+        self.phases: Dict[str, PhaseTimes] = {}
+        self.timers: Dict[str, PhaseTimer] = {}
+        self.stats: Dict[str, Tuple[object, str, str]] = {}  # see add_stats
+        self.show = False  # draw the overlay in the status panel
+    
+    def phase(self, name: str) -> PhaseTimer:
+        """
+        Returns the timer of a phase, to be used as a context manager: with profiler.phase('turn.weather'): ...
+        :param name: str name of the phase
+        :return: PhaseTimer
+        """
+        timer = self.timers.get(name)
+        if timer is None:
+            self.phases[name] = PhaseTimes(self.window)
+            timer = self.timers[name] = PhaseTimer(self.phases[name])
+        return timer
+    
+    def add_stats(self, name: str, source, mean_key: str, p95_key: str) -> None:
+        """
+        Adds statistics kept outside the profiler, like frame times, to the overlay and the exports
+        :param name: str name shown for the statistics
+        :param source: object with a summary method returning a dict of statistics
+        :param mean_key: str key of the summary's mean time in ms, shown in the overlay
+        :param p95_key: str key of the summary's 95th percentile time in ms, shown in the overlay
+        :return: None
+        """
+        self.stats[name] = (source, mean_key, p95_key)
+    
+    def summary(self) -> Dict[str, Dict]:
+        """
+        :return: dict of PhaseTimes summaries by phase name, in name order
+        """
+        return {name: self.phases[name].summary() for name in sorted(self.phases)}
+    
+    def stats_summary(self) -> Dict[str, Dict]:
+        """
+        :return: dict of the summaries of the added statistics by name, in name order
+        """
+        return {name: self.stats[name][0].summary() for name in sorted(self.stats)}
+    
+    def export_json(self, file_path: str) -> None:
+        with open(file_path, 'w') as json_file:
+            dump({'bucket_bounds_ms': bucket_bounds, 'phases': self.summary(), 'stats': self.stats_summary()},
+                 json_file, indent=4)
+    
+    def export_csv(self, file_path: str) -> None:
+        with open(file_path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            times = ['total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms']
+            writer.writerow(['phase', 'calls'] + times + bucket_names)
+            for name, summary in self.summary().items():
+                writer.writerow([name, summary['calls']] + [f"{summary[key]:.4f}" for key in times]
+                                + summary['histogram'])
+            writer.writerow([])
+            writer.writerow(['statistic', 'value'])
+            for name, summary in self.stats_summary().items():
+                for key, value in summary.items():
+                    writer.writerow([f'{name}.{key}', f"{value:.4f}" if isinstance(value, float) else value])
+    
+    def export(self, file_path: str) -> None:
+        """
+        Writes the summary of every phase and of the added statistics for offline analysis, as JSON or as CSV
+            with one row per phase followed by one row per statistic
+        :param file_path: str path ending in .json or .csv
+        :return: None
+        """
+        if file_path.endswith('.json'):
+            self.export_json(file_path)
+        elif file_path.endswith('.csv'):
+            self.export_csv(file_path)
+        else:
+            raise ValueError(f"Profile exports are .json or .csv files, not {file_path}")
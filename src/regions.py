@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from array import array
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game_map import GameMap
+
+
+class Regions:
+    def __init__(self, labels: array, sizes: List[int], coastlines: List[List[int]]):
+        """
+        Connected regions of the hexes one movement class can enter (water bodies, islands)
+        :param labels: array of region number per cell id (x * height + y), -1 for cells outside the movement class
+        :param sizes: list of cell counts, indexed by region number
+        :param coastlines: list of cell ids per region that border a cell outside the movement class
+        """
+        self.labels = labels
+        self.sizes = sizes
+        self.coastlines = coastlines
+    
+    @staticmethod
+    def label(game_map: GameMap, elevations: str) -> Regions:
+        """
+        Labels every region in one sweep over the map - each unlabeled cell that can be entered starts a flood fill
+            that labels its whole region, so every cell is visited once
+        Regions are numbered in order of their lowest cell id
+        :param game_map: GameMap to label
+        :param elevations: str of Elevation lookup
+        :return: Regions
+        """
+        mask = game_map.passable(elevations)
+        table = game_map.neighbor_table
+        labels = array('i', [-1]) * len(mask)
+        sizes = []
+        coastlines = []
+        for start, enterable in enumerate(mask):
+            if not enterable or labels[start] >= 0:
+                continue
+            region = len(sizes)
+            labels[start] = region
+            coastline = []
+            frontier = [start]
+            for cell in frontier:  # frontier grows while it is walked, so this is a queue without pops
+                coast = False
+                for neighbor in table[6 * cell:6 * cell + 6]:
+                    if neighbor < 0:
+                        continue
+                    if not mask[neighbor]:
+                        coast = True
+                    elif labels[neighbor] < 0:
+                        labels[neighbor] = region
+                        frontier.append(neighbor)
+                if coast:
+                    coastline.append(cell)
+            coastline.sort()
+            sizes.append(len(frontier))
+            coastlines.append(coastline)
+        return Regions(labels=labels, sizes=sizes, coastlines=coastlines)
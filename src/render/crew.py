@@ -7,7 +7,7 @@ from pygame import Surface
 from constants.colors import colors
 from constants.constants import margin, game_font
 from constants.stats import occupation_stats
-from render.utilities import render_border
+from render.utilities import render_border, render_text
 
 if TYPE_CHECKING:
     from components.crew import Crew
@@ -32,15 +32,15 @@ def crew_render(console: Surface,
     height = margin * 2
 
     game_font.set_underline(True)
-    surf = game_font.render(f"Assign", True, colors['mountain'])
+    surf = render_text(f"Assign", True, colors['mountain'])
     crew_surf.blit(surf, (margin * 2, height))
-    surf = game_font.render(f"Crewman", True, colors['mountain'])
+    surf = render_text(f"Crewman", True, colors['mountain'])
     crew_surf.blit(surf, (70, height))
-    surf = game_font.render(f"Occupation", True, colors['mountain'])
+    surf = render_text(f"Occupation", True, colors['mountain'])
     crew_surf.blit(surf, (300, height))
-    surf = game_font.render(f"Cooldown", True, colors['mountain'])
+    surf = render_text(f"Cooldown", True, colors['mountain'])
     crew_surf.blit(surf, (425, height))
-    surf = game_font.render(f"Monthly", True, colors['cyan'])
+    surf = render_text(f"Monthly", True, colors['cyan'])
     crew_surf.blit(surf, (535, height))
     height += game_font.get_height() + margin
     
@@ -54,24 +54,24 @@ def crew_render(console: Surface,
             text_color = colors['mountain']
             background = colors['black']
         if crewman.assignment:
-            assign_surf = game_font.render(f"{crewman.assignment.name.lower().capitalize()}", True, colors['mountain'])
+            assign_surf = render_text(f"{crewman.assignment.name.lower().capitalize()}", True, colors['mountain'])
             crew_surf.blit(assign_surf, (margin * 2, height))
-        name_surf = game_font.render(f"{crewman.name}", True, text_color, background)
+        name_surf = render_text(f"{crewman.name}", True, text_color, background)
         crew_surf.blit(name_surf, (70, height))
-        occupation_surf = game_font.render(f"{crewman.occupation.capitalize()}", True, colors['mountain'])
+        occupation_surf = render_text(f"{crewman.occupation.capitalize()}", True, colors['mountain'])
         crew_surf.blit(occupation_surf, (300, height))
         if crewman.cooldown > 0:
-            surf = game_font.render(f"{crewman.cooldown}", True, colors['red'])
+            surf = render_text(f"{crewman.cooldown}", True, colors['red'])
             crew_surf.blit(surf, (470 - surf.get_width(), height))
-        surf = game_font.render(f"{occupation_stats[crewman.occupation]['cost']}", True, colors['cyan'])
+        surf = render_text(f"{occupation_stats[crewman.occupation]['cost']}", True, colors['cyan'])
         crew_surf.blit(surf, (575 - surf.get_width(), height))
         
         height += game_font.get_height() + margin
         count += 1
     
     crewman = crew.roster[crew.selected]
-    surf = game_font.render(f"{crewman.occupation.capitalize()}: {occupation_stats[crewman.occupation]['description']}",
-                            True, colors['mountain'])
+    surf = render_text(f"{crewman.occupation.capitalize()}: {occupation_stats[crewman.occupation]['description']}",
+                       True, colors['mountain'])
     crew_surf.blit(surf, ((ui_layout.viewport_width - surf.get_width()) // 2,
                           ui_layout.viewport_height - game_font.get_height() - margin * 2))
     
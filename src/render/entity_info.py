@@ -6,7 +6,7 @@ from pygame import Surface
 
 from constants.colors import colors
 from constants.constants import view_port, game_font, margin
-from render.utilities import surface_to_map_coords, render_border, render_simple_bar
+from render.utilities import surface_to_map_coords, render_border, render_simple_bar, render_text
 
 if TYPE_CHECKING:
     from entity import Entity
@@ -47,11 +47,11 @@ def render_entity_info(console: Surface,
     widths = []
     entity_list = []
     # (x, y) = surface_to_map_coords(mouse_x, mouse_y, player.x)
-    # xy = game_font.render(f"{x}:{y}", True, colors['mountain'])
+    # xy = render_text(f"{x}:{y}", True, colors['mountain'])
     # widths.append(xy.get_width())
     # entity_list.append((xy, None, None))
     for entity in entities_sorted_for_rendering:
-        name = game_font.render(f"{entity.name}", True, colors['mountain'])
+        name = render_text(f"{entity.name}", True, colors['mountain'])
         widths.append(name.get_width())
         if entity.fighter:
             entity_list.append((name, entity.fighter.hp, entity.fighter.max_hp))
@@ -59,16 +59,16 @@ def render_entity_info(console: Surface,
             entity_list.append((name, None, None))
     if game_map.in_bounds(trans_x, trans_y) and game_map.terrain[trans_x][trans_y].explored:
         if game_map.terrain[trans_x][trans_y].mist and (trans_x, trans_y) in player.view.fov:
-            name = game_font.render(f"Mist", True, colors['mountain'])
+            name = render_text(f"Mist", True, colors['mountain'])
             widths.append(name.get_width())
             entity_list.append((name, None, None))
         if game_map.terrain[trans_x][trans_y].decoration:
-            name = game_font.render(f"{game_map.terrain[trans_x][trans_y].decoration.capitalize()}",
-                                    True, colors['mountain'])
+            name = render_text(f"{game_map.terrain[trans_x][trans_y].decoration.capitalize()}",
+                               True, colors['mountain'])
             widths.append(name.get_width())
             entity_list.append((name, None, None))
-        name = game_font.render(f"{game_map.terrain[trans_x][trans_y].elevation.name.lower().capitalize()}",
-                                True, colors['mountain'])
+        name = render_text(f"{game_map.terrain[trans_x][trans_y].elevation.name.lower().capitalize()}",
+                           True, colors['mountain'])
         entity_list.append((name, None, None))
         widths.append(name.get_width())
     
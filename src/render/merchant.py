@@ -8,7 +8,7 @@ from constants.colors import colors
 from constants.constants import game_font, margin
 from constants.images import cargo_icons
 from constants.stats import item_stats
-from render.utilities import render_border
+from render.utilities import render_border, render_text
 
 if TYPE_CHECKING:
     from entity import Entity
@@ -45,26 +45,26 @@ def merchant_render(console: Surface,
                       key=lambda i: item_stats[i]['category'].value)
     coins = cargo_icons['coins']
     merchant_surf.blit(coins, (margin * 2, height))
-    surf = game_font.render(f"{player.cargo.coins - merchant.temp_coins}", True, colors['mountain'])
+    surf = render_text(f"{player.cargo.coins - merchant.temp_coins}", True, colors['mountain'])
     merchant_surf.blit(surf, (spacer, height))
     merchant_surf.blit(coins, (merchant_surf.get_width() - coins.get_width() - margin * 2, height))
-    surf = game_font.render(f"{merchant.coins + merchant.temp_coins}", True, colors['mountain'])
+    surf = render_text(f"{merchant.coins + merchant.temp_coins}", True, colors['mountain'])
     merchant_surf.blit(surf, (merchant_surf.get_width() - surf.get_width() - coins.get_width() - margin * 4, height))
-    surf = game_font.render(f"Player Cargo", True, colors['mountain'])
+    surf = render_text(f"Player Cargo", True, colors['mountain'])
     merchant_surf.blit(surf, (spacer + column, height))
-    surf = game_font.render(f"Merchant Cargo", True, colors['pink'])
+    surf = render_text(f"Merchant Cargo", True, colors['pink'])
     merchant_surf.blit(surf, (spacer + 5 * column, height))
     height += game_font.get_height() + margin
     
     game_font.set_underline(True)
-    surf = game_font.render(f"Cargo Item Name", True, colors['mountain'])
+    surf = render_text(f"Cargo Item Name", True, colors['mountain'])
     merchant_surf.blit(surf, (spacer, height))
     c = 3
     for header in ["Qty", "Price", "Sell", "Qty", "Buy"]:
         color = colors['pink'] if c > 4 else colors['mountain']
         if c == 4:
             color = colors['cyan']
-        surf = game_font.render(f"{header}", True, color)
+        surf = render_text(f"{header}", True, color)
         merchant_surf.blit(surf, (spacer + c * column - surf.get_width(), height))
         c += 1
     game_font.set_underline(False)
@@ -78,21 +78,21 @@ def merchant_render(console: Surface,
             text_color = colors['mountain']
             background = colors['black']
         merchant_surf.blit(cargo_icons[item], (margin * 2, height))
-        surf = game_font.render(f"{item.capitalize()}", True, text_color, background)
+        surf = render_text(f"{item.capitalize()}", True, text_color, background)
         merchant_surf.blit(surf, (spacer, height))
         if item in manifest_keys:
-            surf = game_font.render(f"{player.cargo.manifest[item]}", True, colors['mountain'])
+            surf = render_text(f"{player.cargo.manifest[item]}", True, colors['mountain'])
             merchant_surf.blit(surf, (spacer + 3 * column - surf.get_width(), height))
-        surf = game_font.render(f"{int(item_stats[item]['cost'])}", True, colors['cyan'])
+        surf = render_text(f"{int(item_stats[item]['cost'])}", True, colors['cyan'])
         merchant_surf.blit(surf, (spacer + 4 * column - surf.get_width(), height))
         if item in sell_manifest.keys():
-            surf = game_font.render(f"{sell_manifest[item]}", True, colors['red'])
+            surf = render_text(f"{sell_manifest[item]}", True, colors['red'])
             merchant_surf.blit(surf, (spacer + 5 * column - surf.get_width(), height))
         if item in merchant_manifest.keys():
-            surf = game_font.render(f"{merchant_manifest[item]}", True, colors['pink'])
+            surf = render_text(f"{merchant_manifest[item]}", True, colors['pink'])
             merchant_surf.blit(surf, (spacer + 6 * column - surf.get_width(), height))
         if item in buy_manifest.keys():
-            surf = game_font.render(f"{buy_manifest[item]}", True, colors['grass'])
+            surf = render_text(f"{buy_manifest[item]}", True, colors['grass'])
             merchant_surf.blit(surf, (spacer + 7 * column - surf.get_width(), height))
         height += game_font.get_height() + margin
     
@@ -1,18 +1,79 @@
 from __future__ import annotations
 
+from itertools import compress
 from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
 
 from pygame import Surface, display
 
 from constants.colors import colors
 from constants.constants import block_size, margin, move_elevations
 from render.utilities import render_border
+from tile import elevation_by_value, decoration_names
 
 if TYPE_CHECKING:
     from game_map import GameMap
+    from tile import TerrainGrid
     from ui import DisplayInfo
 
 
+_mini_maps: WeakKeyDictionary = WeakKeyDictionary()
+
+
+class MiniMap:
+    def __init__(self, terrain: TerrainGrid, width: int, height: int):
+        """
+        Retained mini-map of explored terrain. Cells are drawn once and then only redrawn when they show up in
+            terrain.changed_cells (newly explored by View.set_fov, decorated, cleared)
+        :param terrain: TerrainGrid to draw
+        :param width: int width of the mini-map panel
+        :param height: int height of the mini-map panel
+        """
+        self.terrain = terrain
+        self.terrain_surf = Surface((width, height))
+        self.mini_surf = Surface((width, height))
+        self.log_offset = len(terrain.changed_cells)
+        explored = terrain.explored
+        for index in compress(range(len(explored)), explored):
+            self.draw_cell(index)
+    
+    def sync(self) -> None:
+        """
+        Redraws the cells logged in terrain.changed_cells since the last sync
+        :return: None
+        """
+        changed_cells = self.terrain.changed_cells
+        if self.log_offset < len(changed_cells):
+            for index in set(changed_cells[self.log_offset:]):
+                self.draw_cell(index)
+            self.log_offset = len(changed_cells)
+    
+    def draw_cell(self, index: int) -> None:
+        """
+        Draws a single cell block - blocks never overlap, so a cell can be redrawn on its own
+        :param index: int cell id
+        :return: None
+        """
+        terrain = self.terrain
+        x, y = terrain.coords(index)
+        left = margin + x * block_size
+        top = margin + y * block_size + (x % 2) * block_size // 2 - 2
+        block = (left, top, block_size, block_size)
+        if not terrain.explored[index]:
+            self.terrain_surf.fill(colors['black'], block)
+            return
+        mini_block = (left + 1, top + 1, block_size // 2, block_size // 2)
+        decoration = decoration_names[terrain.decoration[index]]
+        if decoration and not colors.get(decoration):
+            color = 'white' if decoration in ["port"] else 'black'
+            self.terrain_surf.fill(colors['red'], block)
+            self.terrain_surf.fill(colors[color], mini_block)
+        else:
+            self.terrain_surf.fill(colors[elevation_by_value[terrain.elevation[index]].name.lower()], block)
+            if decoration:
+                self.terrain_surf.fill(colors[decoration], mini_block)
+
+
 def mini_map_render(game_map: GameMap, main_display: display, ui_layout: DisplayInfo) -> None:
     """
     renders the mini-map
@@ -21,42 +82,30 @@ def mini_map_render(game_map: GameMap, main_display: display, ui_layout: Display
     :param ui_layout: where to blit the mini-map
     :return: None
     """
-    mini_surf = Surface((ui_layout.mini_width, ui_layout.mini_height))
-    block = Surface((block_size, block_size))
-    mini_block = Surface((block_size // 2, block_size // 2))
-    for x in range(game_map.width):
-        for y in range(game_map.height):
-            if game_map.terrain[x][y].explored:
-                block.fill(colors[game_map.terrain[x][y].elevation.name.lower()])
-                mini_surf.blit(block, (margin + x * block_size,
-                                       margin + y * block_size + (x % 2) * block_size // 2 - 2))
-                if game_map.terrain[x][y].decoration:
-                    if colors.get(game_map.terrain[x][y].decoration):
-                        mini_block.fill(colors[game_map.terrain[x][y].decoration])
-                        mini_surf.blit(mini_block,
-                                       (margin + 1 + x * block_size,
-                                        margin + 1 + y * block_size + (x % 2) * block_size // 2 - 2))
-                    else:
-                        color = 'white' if game_map.terrain[x][y].decoration in ["port"] else 'black'
-                        block.fill(colors['red'])
-                        mini_surf.blit(block, (margin + x * block_size,
-                                               margin + y * block_size + (x % 2) * block_size // 2 - 2))
-                        mini_block.fill(color)
-                        mini_surf.blit(mini_block,
-                                       (margin + 1 + x * block_size,
-                                        margin + 1 + y * block_size + (x % 2) * block_size // 2 - 2))
+    mini_map = _mini_maps.get(game_map.terrain)
+    if mini_map is None or mini_map.mini_surf.get_size() != (ui_layout.mini_width, ui_layout.mini_height):
+        mini_map = MiniMap(game_map.terrain, ui_layout.mini_width, ui_layout.mini_height)
+        _mini_maps[game_map.terrain] = mini_map
+    mini_map.sync()
+    mini_surf = mini_map.mini_surf
+    mini_surf.blit(mini_map.terrain_surf, (0, 0))
     
-    for entity in game_map.entities:
-        if (entity.x, entity.y) in game_map.engine.player.view.fov \
-                and entity.icon is not None:
-            if entity == game_map.engine.player:
-                block.fill(colors['white'])
-            elif entity.is_alive:
-                block.fill(colors['red'])
-            else:
-                block.fill(colors['orange'])
-            mini_surf.blit(block, (margin + entity.x * block_size,
-                                   margin + entity.y * block_size + (entity.x % 2) * block_size // 2 - 2))
+    # entity markers go on top of the retained terrain every frame - only hexes in view can show one
+    player = game_map.engine.player
+    markers = []
+    for (x, y) in player.view.fov:
+        for entity in game_map.get_entities_at_location(x, y):
+            if entity.icon is not None:
+                if entity is player:
+                    markers.append((entity, colors['white']))
+                elif entity.is_alive:
+                    markers.insert(0, (entity, colors['red']))
+                else:
+                    markers.insert(0, (entity, colors['orange']))
+    for entity, color in markers:
+        mini_surf.fill(color, (margin + entity.x * block_size,
+                               margin + entity.y * block_size + (entity.x % 2) * block_size // 2 - 2,
+                               block_size, block_size))
     
     render_border(mini_surf, game_map.engine.time.get_sky_color)
     main_display.blit(mini_surf, (0, 0))
@@ -8,7 +8,7 @@ from constants.colors import colors
 from constants.constants import game_font, margin
 from constants.images import cargo_icons
 from constants.stats import item_stats
-from render.utilities import render_border, weapon_stats_render
+from render.utilities import render_border, weapon_stats_render, render_text
 
 if TYPE_CHECKING:
     from entity import Entity
@@ -40,29 +40,29 @@ def smithy_render(console: Surface,
     
     coins = cargo_icons['coins']
     smithy_surf.blit(coins, (margin * 2, height))
-    surf = game_font.render(f"{player.cargo.coins - smithy.temp_coins}", True, colors['mountain'])
+    surf = render_text(f"{player.cargo.coins - smithy.temp_coins}", True, colors['mountain'])
     smithy_surf.blit(surf, (spacer, height))
     smithy_surf.blit(coins, (smithy_surf.get_width() - coins.get_width() - margin * 2, height))
-    surf = game_font.render(f"{smithy.coins + smithy.temp_coins}", True, colors['mountain'])
+    surf = render_text(f"{smithy.coins + smithy.temp_coins}", True, colors['mountain'])
     smithy_surf.blit(surf, (smithy_surf.get_width() - surf.get_width() - coins.get_width() - margin * 4, height))
-    surf = game_font.render(f"Player Storage", True, colors['mountain'])
+    surf = render_text(f"Player Storage", True, colors['mountain'])
     smithy_surf.blit(surf, (spacer + column, height))
-    surf = game_font.render(f"Smithy Storage", True, colors['pink'])
+    surf = render_text(f"Smithy Storage", True, colors['pink'])
     smithy_surf.blit(surf, (spacer + 5 * column, height))
     height += game_font.get_height() + margin
     
     game_font.set_underline(True)
-    surf = game_font.render(f"Weapon Name", True, colors['mountain'])
+    surf = render_text(f"Weapon Name", True, colors['mountain'])
     smithy_surf.blit(surf, (spacer, height))
     c = 3
     for header in ["Wt", "Vol", "Price"]:
         color = colors['pink'] if c > 4 else colors['mountain']
         if c == 5:
             color = colors['cyan']
-        surf = game_font.render(f"{header}", True, color)
+        surf = render_text(f"{header}", True, color)
         smithy_surf.blit(surf, (spacer + c * column - surf.get_width(), height))
         c += 1
-    surf = game_font.render(f"Weapon Name", True, colors['pink'])
+    surf = render_text(f"Weapon Name", True, colors['pink'])
     smithy_surf.blit(surf, (6 * column, height))
     
     game_font.set_underline(False)
@@ -80,16 +80,16 @@ def smithy_render(console: Surface,
             text_color = colors['mountain']
             background = colors['black']
         if weapon in player.broadsides.sell_list:
-            surf = game_font.render(f"{weapon.name.capitalize()}", True, text_color, background)
+            surf = render_text(f"{weapon.name.capitalize()}", True, text_color, background)
             smithy_surf.blit(surf, (6 * column, height))
         else:
-            surf = game_font.render(f"{weapon.name.capitalize()}", True, text_color, background)
+            surf = render_text(f"{weapon.name.capitalize()}", True, text_color, background)
             smithy_surf.blit(surf, (spacer, height))
-        surf = game_font.render(f"{int(item_stats[weapon.name.lower()]['weight'])}", True, colors['mountain'])
+        surf = render_text(f"{int(item_stats[weapon.name.lower()]['weight'])}", True, colors['mountain'])
         smithy_surf.blit(surf, (spacer + 3 * column - surf.get_width(), height))
-        surf = game_font.render(f"{int(item_stats[weapon.name.lower()]['volume'])}", True, colors['mountain'])
+        surf = render_text(f"{int(item_stats[weapon.name.lower()]['volume'])}", True, colors['mountain'])
         smithy_surf.blit(surf, (spacer + 4 * column - surf.get_width(), height))
-        surf = game_font.render(f"{int(item_stats[weapon.name.lower()]['cost'])}", True, colors['cyan'])
+        surf = render_text(f"{int(item_stats[weapon.name.lower()]['cost'])}", True, colors['cyan'])
         smithy_surf.blit(surf, (spacer + 5 * column - surf.get_width(), height))
         height += game_font.get_height() + margin
         count += 1
@@ -101,18 +101,18 @@ def smithy_render(console: Surface,
         else:
             text_color = colors['pink']
             background = colors['black']
-        surf = game_font.render(f"{int(item_stats[weapon.name.lower()]['weight'])}", True, colors['mountain'])
+        surf = render_text(f"{int(item_stats[weapon.name.lower()]['weight'])}", True, colors['mountain'])
         smithy_surf.blit(surf, (spacer + 3 * column - surf.get_width(), height))
-        surf = game_font.render(f"{int(item_stats[weapon.name.lower()]['volume'])}", True, colors['mountain'])
+        surf = render_text(f"{int(item_stats[weapon.name.lower()]['volume'])}", True, colors['mountain'])
         smithy_surf.blit(surf, (spacer + 4 * column - surf.get_width(), height))
-        surf = game_font.render(f"{int(item_stats[weapon.name.lower()]['cost'])}", True, colors['cyan'])
+        surf = render_text(f"{int(item_stats[weapon.name.lower()]['cost'])}", True, colors['cyan'])
         smithy_surf.blit(surf, (spacer + 5 * column - surf.get_width(), height))
         
         if weapon in player.broadsides.buy_list:
-            surf = game_font.render(f"{weapon.name.capitalize()}", True, text_color, background)
+            surf = render_text(f"{weapon.name.capitalize()}", True, text_color, background)
             smithy_surf.blit(surf, (spacer, height))
         else:
-            surf = game_font.render(f"{weapon.name.capitalize()}", True, text_color, background)
+            surf = render_text(f"{weapon.name.capitalize()}", True, text_color, background)
             smithy_surf.blit(surf, (6 * column, height))
         height += game_font.get_height() + margin
         count += 1
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from pygame import Surface
+from pygame import Rect, Surface, draw
 
 from constants.colors import colors
 from constants.constants import game_font, margin, tile_size
 from constants.images import cargo_icons, misc_icons
-from render.utilities import render_border, render_hp_bar, rot_center, colorize
+from profiler import bucket_bounds
+from render.utilities import render_border, render_hp_bar, rot_center, colorize, render_text
 from utilities import direction_angle
 
 if TYPE_CHECKING:
@@ -15,29 +16,38 @@ if TYPE_CHECKING:
     from weather import Weather
     from entity import Entity
     from time_of_day import Time
+    from profiler import Profiler
 
 
 def status_panel_render(console: Surface,
                         entity: Entity,
                         weather: Weather,
                         time: Time,
-                        ui_layout: DisplayInfo) -> None:
+                        ui_layout: DisplayInfo,
+                        profiler: Profiler = None) -> None:
     """
     Generates the status panel of player information. Calls weather and wind render functions
+        or, while the profiler overlay is shown, the profile render function instead
     :param console: surface to blit to
     :param entity: the player
     :param weather: the current game Weather
     :param time: the current game Time
     :param ui_layout: layout for where to blit
+    :param profiler: the engine's Profiler
     :return: None
     """
     status_panel = Surface((ui_layout.status_width, ui_layout.status_height))
     render_border(status_panel, time.get_sky_color)
     
+    if profiler is not None and profiler.show:
+        render_profile(profiler, status_panel, ui_layout)
+        console.blit(status_panel, (0, ui_layout.mini_height))
+        return
+    
     render_weather(time, weather, status_panel)
     vertical = render_wind(weather.wind_direction, status_panel, ui_layout) + 2 * margin
     
-    w_text = game_font.render(f"{weather.conditions.name.lower().capitalize()}", True, colors['mountain'])
+    w_text = render_text(f"{weather.conditions.name.lower().capitalize()}", True, colors['mountain'])
     status_panel.blit(w_text, (status_panel.get_width() // 2 - w_text.get_width() // 2, vertical))
     vertical += game_font.get_height() + margin
     
@@ -45,7 +55,7 @@ def status_panel_render(console: Surface,
     days = str(time.day) if len(str(time.day)) == 2 else "0" + str(time.day)
     hrs = str(time.hrs) if len(str(time.hrs)) == 2 else "0" + str(time.hrs)
     mins = str(time.mins) if len(str(time.mins)) == 2 else "0" + str(time.mins)
-    t_text = game_font.render(f"{time.year}.{months}.{days} {hrs}:{mins}:00", True, colors['mountain'])
+    t_text = render_text(f"{time.year}.{months}.{days} {hrs}:{mins}:00", True, colors['mountain'])
     status_panel.blit(t_text, (status_panel.get_width() // 2 - t_text.get_width() // 2, vertical))
     vertical += game_font.get_height() + margin
     
@@ -74,14 +84,14 @@ def status_panel_render(console: Surface,
         vertical += crew_bar.get_height()
     vertical += margin
     if entity.broadsides:
-        text = game_font.render(f"Broadsides", True, colors['mountain'])
+        text = render_text(f"Broadsides", True, colors['mountain'])
         status_panel.blit(text, ((ui_layout.status_width - text.get_width()) // 2, vertical))
         vertical += game_font.get_height() + margin // 2
         if len(entity.broadsides.port) > 0:
-            status_panel.blit(game_font.render(f"Port", True, colors['mountain']), (margin, vertical))
+            status_panel.blit(render_text(f"Port", True, colors['mountain']), (margin, vertical))
             cd = max([weapon.cooldown for weapon in entity.broadsides.port])
             cd_color = colors['mountain'] if cd == 0 else colors['gray']
-            cd_text = game_font.render(f"[{cd}]", True, cd_color)
+            cd_text = render_text(f"[{cd}]", True, cd_color)
             status_panel.blit(cd_text, (ui_layout.status_width - margin - cd_text.get_width(), vertical))
             vertical += game_font.get_height() + margin // 2
             for weapon in entity.broadsides.port:
@@ -102,10 +112,10 @@ def status_panel_render(console: Surface,
                 vertical += weapon_bar.get_height() + margin // 2
         vertical += margin
         if len(entity.broadsides.starboard) > 0:
-            status_panel.blit(game_font.render(f"Starboard", True, colors['mountain']), (margin, vertical))
+            status_panel.blit(render_text(f"Starboard", True, colors['mountain']), (margin, vertical))
             cd = max([weapon.cooldown for weapon in entity.broadsides.starboard])
             cd_color = colors['mountain'] if cd == 0 else colors['gray']
-            cd_text = game_font.render(f"[{cd}]", True, cd_color)
+            cd_text = render_text(f"[{cd}]", True, cd_color)
             status_panel.blit(cd_text, (ui_layout.status_width - margin - cd_text.get_width(), vertical))
             vertical += game_font.get_height() + margin // 2
             for weapon in entity.broadsides.starboard:
@@ -133,9 +143,9 @@ def status_panel_render(console: Surface,
         ammo_list.extend(entity.broadsides.get_attached_weapon_ammo_types())
         for ammo in sorted(ammo_list):
             if entity.cargo.item_type_in_manifest(ammo):
-                names.append(game_font.render(f"{ammo.capitalize()}", True, colors['mountain']))
+                names.append(render_text(f"{ammo.capitalize()}", True, colors['mountain']))
                 icons.append(cargo_icons[ammo])
-                counts.append(game_font.render(f"{entity.cargo.manifest[ammo]}", True, colors['mountain']))
+                counts.append(render_text(f"{entity.cargo.manifest[ammo]}", True, colors['mountain']))
         height = len(names)
         if height > 0:
             ammo_surf = Surface((ui_layout.status_width - 2 * margin,
@@ -219,3 +229,53 @@ def render_weather(time: Time, weather: Weather, display_surf: Surface) -> None:
         sky_surf.blit(icon, (x * icon.get_width(), (x + 1) % 2))
     
     display_surf.blit(sky_surf, (margin * 3, 2 * margin))
+
+
+def render_profile(profiler: Profiler, display_surf: Surface, ui: DisplayInfo) -> None:
+    """
+    Render the profiler overlay - the added statistics, like frame times, with their mean and 95th percentile times,
+        then the phases with the highest mean time first, each with a histogram of its recent timings
+        (fastest bucket on the left) and its mean and 95th percentile times
+    :param profiler: the engine's Profiler
+    :param display_surf: Surface to render on
+    :param ui: display info
+    :return: None
+    """
+    line_height = game_font.get_height()
+    bar_width = 2
+    vertical = margin
+    title = render_text("Profile: mean / p95 ms", True, colors['mountain'])
+    display_surf.blit(title, ((ui.status_width - title.get_width()) // 2, vertical))
+    vertical += line_height + margin
+    
+    for name, summary in profiler.stats_summary().items():
+        _, mean_key, p95_key = profiler.stats[name]
+        time_text = render_text(f"{summary[mean_key]:.2f} / {summary[p95_key]:.2f}", True, colors['mountain'])
+        time_x = ui.status_width - margin - time_text.get_width()
+        name_text = render_text(name, True, colors['gray'])
+        display_surf.blit(name_text, (margin, vertical), Rect(0, 0, time_x - 2 * margin, line_height))
+        display_surf.blit(time_text, (time_x, vertical))
+        vertical += line_height
+    if profiler.stats:
+        vertical += margin
+    
+    summaries = sorted(profiler.summary().items(), key=lambda item: item[1]['mean_ms'], reverse=True)
+    for name, summary in summaries:
+        if vertical + line_height > display_surf.get_height() - margin:
+            break
+        time_text = render_text(f"{summary['mean_ms']:.2f} / {summary['p95_ms']:.2f}", True, colors['mountain'])
+        time_x = ui.status_width - margin - time_text.get_width()
+        histogram_x = time_x - margin - bar_width * (len(bucket_bounds) + 1)
+        name_text = render_text(name, True, colors['gray'])
+        display_surf.blit(name_text, (margin, vertical), Rect(0, 0, histogram_x - 2 * margin, line_height))
+        
+        counts = summary['histogram']
+        most = max(counts)
+        for index, count in enumerate(counts):
+            if count:
+                bar_height = max(1, count * (line_height - 2) // most)
+                draw.rect(display_surf, colors['aqua'],
+                          (histogram_x + index * bar_width, vertical + line_height - 1 - bar_height,
+                           bar_width, bar_height))
+        display_surf.blit(time_text, (time_x, vertical))
+        vertical += line_height
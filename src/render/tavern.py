@@ -8,7 +8,7 @@ from constants.colors import colors
 from constants.constants import margin, game_font
 from constants.images import cargo_icons
 from constants.stats import occupation_stats
-from render.utilities import render_border
+from render.utilities import render_border, render_text
 
 if TYPE_CHECKING:
     from entity import Entity
@@ -45,30 +45,30 @@ def tavern_render(console: Surface,
     
     coins = cargo_icons['coins']
     crew_surf.blit(coins, (margin * 2, height))
-    surf = game_font.render(f"{player.cargo.coins - tavern_coins}", True, colors['mountain'])
+    surf = render_text(f"{player.cargo.coins - tavern_coins}", True, colors['mountain'])
     crew_surf.blit(surf, (spacer, height))
     current_count = len(crew_roster) + len(player.crew.hire_list) - len(player.crew.release_list)
     if current_count <= player.crew.max_count:
         color = colors['mountain']
     else:
         color = colors['red']
-    surf = game_font.render(f"Crew Count: {current_count}/{player.crew.max_count} ", True, color)
+    surf = render_text(f"Crew Count: {current_count}/{player.crew.max_count} ", True, color)
     crew_surf.blit(surf, ((ui_layout.viewport_width - surf.get_width()) // 2, height))
     crew_surf.blit(coins, (crew_surf.get_width() - coins.get_width() - margin * 2, height))
-    surf = game_font.render(f"{tavern_coins}", True, colors['red'])
+    surf = render_text(f"{tavern_coins}", True, colors['red'])
     crew_surf.blit(surf, (crew_surf.get_width() - surf.get_width() - coins.get_width() - margin * 4, height))
     height += game_font.get_height() + margin
     
     game_font.set_underline(True)
-    surf = game_font.render(f"Assign", True, colors['mountain'])
+    surf = render_text(f"Assign", True, colors['mountain'])
     crew_surf.blit(surf, (margin * 2, height))
-    surf = game_font.render(f"Crewman", True, colors['mountain'])
+    surf = render_text(f"Crewman", True, colors['mountain'])
     crew_surf.blit(surf, (70, height))
-    surf = game_font.render(f"Occupation", True, colors['mountain'])
+    surf = render_text(f"Occupation", True, colors['mountain'])
     crew_surf.blit(surf, (300, height))
-    surf = game_font.render(f"Location", True, colors['mountain'])
+    surf = render_text(f"Location", True, colors['mountain'])
     crew_surf.blit(surf, (425, height))
-    surf = game_font.render(f"Monthly", True, colors['cyan'])
+    surf = render_text(f"Monthly", True, colors['cyan'])
     crew_surf.blit(surf, (535, height))
     height += game_font.get_height() + margin
     game_font.set_underline(False)
@@ -81,11 +81,11 @@ def tavern_render(console: Surface,
             text_color = colors['mountain']
             background = colors['black']
         if crewman.assignment:
-            assign_surf = game_font.render(f"{crewman.assignment.name.lower().capitalize()}", True, colors['mountain'])
+            assign_surf = render_text(f"{crewman.assignment.name.lower().capitalize()}", True, colors['mountain'])
             crew_surf.blit(assign_surf, (margin * 2, height))
-        name_surf = game_font.render(f"{crewman.name}", True, text_color, background)
+        name_surf = render_text(f"{crewman.name}", True, text_color, background)
         crew_surf.blit(name_surf, (70, height))
-        occupation_surf = game_font.render(f"{crewman.occupation.capitalize()}", True, colors['mountain'])
+        occupation_surf = render_text(f"{crewman.occupation.capitalize()}", True, colors['mountain'])
         crew_surf.blit(occupation_surf, (300, height))
         if crewman in player.crew.release_list:
             location = "Tavern"
@@ -99,17 +99,17 @@ def tavern_render(console: Surface,
         else:
             location = "Tavern"
             color = colors['pink']
-        surf = game_font.render(location, True, color)
+        surf = render_text(location, True, color)
         crew_surf.blit(surf, (435, height))
-        surf = game_font.render(f"{occupation_stats[crewman.occupation]['cost'] - discount}", True, colors['cyan'])
+        surf = render_text(f"{occupation_stats[crewman.occupation]['cost'] - discount}", True, colors['cyan'])
         crew_surf.blit(surf, (575 - surf.get_width(), height))
         
         height += game_font.get_height() + margin
         count += 1
     
     crewman = full_roster[player.crew.selected]
-    surf = game_font.render(f"{crewman.occupation.capitalize()}: {occupation_stats[crewman.occupation]['description']}",
-                            True, colors['mountain'])
+    surf = render_text(f"{crewman.occupation.capitalize()}: {occupation_stats[crewman.occupation]['description']}",
+                       True, colors['mountain'])
     crew_surf.blit(surf, ((ui_layout.viewport_width - surf.get_width()) // 2,
                           ui_layout.viewport_height - game_font.get_height() - margin * 2))
     
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from typing import Dict, Tuple, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+from pygame import Rect, Surface
+
+from constants.colors import colors
+from constants.constants import tile_size
+from constants.images import terrain_icons
+from tile import elevation_by_value, decoration_names
+
+if TYPE_CHECKING:
+    from tile import TerrainGrid
+
+"""
+Width and height of a terrain chunk, in tiles
+"""
+chunk_tiles = 16
+chunk_pixels = chunk_tiles * tile_size
+
+_terrain_layers: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def get_terrain_layer(terrain: TerrainGrid) -> TerrainLayer:
+    """
+    Returns the terrain layer of a TerrainGrid, creating it on first use
+    :param terrain: TerrainGrid to draw
+    :return: TerrainLayer
+    """
+    layer = _terrain_layers.get(terrain)
+    if layer is None:
+        layer = TerrainLayer(terrain)
+        _terrain_layers[terrain] = layer
+    return layer
+
+
+def tile_origin(x: int, y: int) -> Tuple[int, int]:
+    """
+    Returns the top left pixel of a tile's icon in map pixels - odd columns sit half a tile lower
+    :param x: x int coordinate of game map
+    :param y: y int coordinate of game map
+    :return: x, y pixel coordinates
+    """
+    return x * tile_size, y * tile_size + (x % 2) * tile_size // 2
+
+
+class TerrainLayer:
+    def __init__(self, terrain: TerrainGrid):
+        """
+        Explored terrain and decoration icons composited once in map pixels (see tile_origin), cut into chunks that
+            are drawn the first time they are needed
+        Icons are bigger than a tile and overlap their neighbors, so a changed tile is redrawn by clearing the area
+            its icon covers and blitting every tile touching that area again in the original order
+        :param terrain: TerrainGrid to draw
+        """
+        self.terrain = terrain
+        self.icon_width = max(icon.get_width() for icon in terrain_icons.values())
+        self.icon_height = max(icon.get_height() for icon in terrain_icons.values())
+        self.pixel_width = (terrain.width - 1) * tile_size + self.icon_width
+        self.pixel_height = (terrain.height - 1) * tile_size + tile_size // 2 + self.icon_height
+        self.chunks: Dict[Tuple[int, int], Surface] = {}
+        self.log_offset = len(terrain.changed_cells)
+        self.revision = 0
+    
+    def sync(self) -> bool:
+        """
+        Redraws the tiles logged in terrain.changed_cells since the last sync
+        :return: bool True if anything was redrawn
+        """
+        changed_cells = self.terrain.changed_cells
+        if self.log_offset == len(changed_cells):
+            return False
+        cells = set(changed_cells[self.log_offset:])
+        self.log_offset = len(changed_cells)
+        
+        # group the icon areas of the changed tiles by the chunks they touch
+        dirty: Dict[Tuple[int, int], list] = {}
+        for cell in cells:
+            area = Rect(tile_origin(*self.terrain.coords(cell)), (self.icon_width, self.icon_height))
+            for chunk_x in range(area.left // chunk_pixels, (area.right - 1) // chunk_pixels + 1):
+                for chunk_y in range(area.top // chunk_pixels, (area.bottom - 1) // chunk_pixels + 1):
+                    if (chunk_x, chunk_y) in self.chunks:
+                        dirty.setdefault((chunk_x, chunk_y), []).append(area)
+        
+        for (chunk_x, chunk_y), areas in dirty.items():
+            chunk = self.chunks[chunk_x, chunk_y]
+            bounds = Rect(chunk_x * chunk_pixels, chunk_y * chunk_pixels, chunk_pixels, chunk_pixels)
+            if len(areas) > chunk_tiles * chunk_tiles // 4:
+                self.paint(chunk, bounds, bounds)
+            else:
+                for area in areas:
+                    self.paint(chunk, bounds, area.clip(bounds))
+        self.revision += 1
+        return True
+    
+    def get_chunk(self, chunk_x: int, chunk_y: int) -> Surface:
+        chunk = self.chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            chunk = Surface((chunk_pixels, chunk_pixels))
+            bounds = Rect(chunk_x * chunk_pixels, chunk_y * chunk_pixels, chunk_pixels, chunk_pixels)
+            self.paint(chunk, bounds, bounds)
+            self.chunks[chunk_x, chunk_y] = chunk
+        return chunk
+    
+    def paint(self, chunk: Surface, bounds: Rect, area: Rect) -> None:
+        """
+        Clears an area of a chunk and blits every explored tile whose icon touches it, column by column
+        :param chunk: chunk Surface to draw on
+        :param bounds: Rect of the chunk in map pixels
+        :param area: Rect to redraw in map pixels
+        :return: None
+        """
+        terrain = self.terrain
+        height = terrain.height
+        explored = terrain.explored
+        elevations = terrain.elevation
+        decorations = terrain.decoration
+        
+        local = area.move(-bounds.left, -bounds.top)
+        chunk.set_clip(local)
+        chunk.fill(colors['black'], local)
+        first_x = max((area.left - self.icon_width) // tile_size, 0)
+        last_x = min(area.right // tile_size, terrain.width - 1)
+        first_y = max((area.top - self.icon_height - tile_size // 2) // tile_size, 0)
+        last_y = min(area.bottom // tile_size, height - 1)
+        for x in range(first_x, last_x + 1):
+            left = x * tile_size - bounds.left
+            shift = (x % 2) * tile_size // 2 - bounds.top
+            for y in range(first_y, last_y + 1):
+                index = x * height + y
+                if explored[index]:
+                    position = (left, y * tile_size + shift)
+                    chunk.blit(terrain_icons[elevation_by_value[elevations[index]].name.lower()], position)
+                    if decorations[index]:
+                        chunk.blit(terrain_icons[decoration_names[decorations[index]]], position)
+        chunk.set_clip(None)
+    
+    def draw(self, surface: Surface, area: Rect) -> None:
+        """
+        Copies an area of the layer onto a surface, with the area's top left corner at the surface's top left
+            parts of the area off the map are left untouched
+        :param surface: Surface to draw on
+        :param area: Rect in map pixels
+        :return: None
+        """
+        self.sync()
+        first_x = max(area.left // chunk_pixels, 0)
+        last_x = min((area.right - 1) // chunk_pixels, (self.pixel_width - 1) // chunk_pixels)
+        first_y = max(area.top // chunk_pixels, 0)
+        last_y = min((area.bottom - 1) // chunk_pixels, (self.pixel_height - 1) // chunk_pixels)
+        for chunk_x in range(first_x, last_x + 1):
+            for chunk_y in range(first_y, last_y + 1):
+                bounds = Rect(chunk_x * chunk_pixels, chunk_y * chunk_pixels, chunk_pixels, chunk_pixels)
+                piece = area.clip(bounds)
+                surface.blit(self.get_chunk(chunk_x, chunk_y),
+                             (piece.left - area.left, piece.top - area.top),
+                             piece.move(-bounds.left, -bounds.top))
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from math import floor
-from typing import List, Tuple, TYPE_CHECKING
+from typing import Dict, List, Tuple, TYPE_CHECKING
+from weakref import WeakKeyDictionary
 
 import pygame.transform as transform
 from pygame import Surface, draw, BLEND_RGBA_MULT, BLEND_RGBA_ADD
@@ -9,6 +11,7 @@ from pygame import Surface, draw, BLEND_RGBA_MULT, BLEND_RGBA_ADD
 from constants.colors import colors
 from constants.constants import margin, tile_size, view_port, game_font
 from constants.images import entity_icons
+from constants.sprites import sprites
 from constants.stats import item_stats
 from constants.weapons import weapons
 from utilities import direction_angle
@@ -20,14 +23,83 @@ if TYPE_CHECKING:
     from components.weapon import Weapon
 
 
+_rotations: WeakKeyDictionary = WeakKeyDictionary()
+
+
+class TextCache:
+    def __init__(self, max_size: int = 1024):
+        """
+        Least recently used cache of rendered text Surfaces
+        The font's underline, bold and italic settings are part of the key, so toggling set_underline around a
+            render keeps working
+        :param max_size: int number of Surfaces kept before the least recently used one is dropped
+        """
+        self.max_size = max_size
+        self.surfaces: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, font: Font, text: str, antialias: bool, color: Tuple[int, int, int],
+               background: Tuple[int, int, int] = None) -> Surface:
+        key = (font, text, antialias, tuple(color), tuple(background) if background is not None else None,
+               font.get_underline(), font.get_bold(), font.get_italic())
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+text_cache = TextCache()
+
+
+def render_text(text: str, antialias: bool, color: Tuple[int, int, int],
+                background: Tuple[int, int, int] = None, font: Font = game_font) -> Surface:
+    """
+    Renders text through the shared text cache - the result is shared, so it must not be drawn on
+    :param text: str text to render
+    :param antialias: bool smooth the glyph edges
+    :param color: color of the text
+    :param background: color behind the text, None for a transparent background
+    :param font: Font to render with
+    :return: Surface of rendered text
+    """
+    return text_cache.render(font, text, antialias, color, background)
+
+
 def get_rotated_image(image: Surface, facing: int) -> Surface:
     """
     rotates an image / sprite to its current facing
+    Each facing of an image is rotated once and then reused - the result is shared, so it must not be drawn on
     :param image: original Surface to rotate
     :param facing: current facing of Entity
     :return: rotated Surface
     """
-    return rot_center(image, direction_angle[facing])
+    rotations = _rotations.get(image)
+    if rotations is None:
+        rotations = [None] * len(direction_angle)
+        _rotations[image] = rotations
+    rotated = rotations[facing]
+    if rotated is None:
+        rotated = rot_center(image, direction_angle[facing])
+        rotations[facing] = rotated
+    return rotated
+
+
+def cache_rotations(image: Surface) -> None:
+    """
+    Rotates an image to all six facings up front
+    :param image: original Surface to rotate
+    :return: None
+    """
+    for facing in range(len(direction_angle)):
+        get_rotated_image(image, facing)
 
 
 def rot_center(image: Surface, angle: int) -> Surface:
@@ -122,7 +194,7 @@ def make_arrow_button(panel: Surface,
     """
     panel.blit(rot_center(image=icon, angle=rotation),
                (split - spacer - icon.get_width(), vertical))
-    panel.blit(font.render(text, True, color),
+    panel.blit(render_text(text, True, color, font=font),
                (split + spacer, vertical + 1))
     vertical += font.get_height() + spacer
     return vertical
@@ -150,13 +222,13 @@ def make_text_button(panel: Surface,
     :param vertical: int y value to render at
     :return: current vertical value
     """
-    key_text = font.render(name, True, bkg_color)
+    key_text = render_text(name, True, bkg_color, font=font)
     w, h = font.size(name)
     key_surf = Surface((w + 3, h))
     key_surf.fill(color)
     key_surf.blit(key_text, (1, 1))
     panel.blit(key_surf, (split - spacer - key_surf.get_width(), vertical))
-    panel.blit(font.render(text, True, color),
+    panel.blit(render_text(text, True, color, font=font),
                (split + spacer, vertical + 1))
     vertical += font.get_height() + spacer
     return vertical
@@ -208,8 +280,8 @@ def render_hp_bar(text: str,
         current_bar = Surface((current_bar_length, game_font.get_height()))
         current_bar.fill(colors[top_color])
         max_bar.blit(current_bar, (0, 0))
-    bar_text = game_font.render(f"{text}", True, colors[font_color])
-    bar_nums = game_font.render(f"{current}/{maximum}", True, colors[font_color])
+    bar_text = render_text(f"{text}", True, colors[font_color])
+    bar_nums = render_text(f"{current}/{maximum}", True, colors[font_color])
     max_bar.blit(bar_text, (1, 1))
     max_bar.blit(bar_nums, (max_bar.get_width() - bar_nums.get_width(), 1))
     return max_bar
@@ -241,12 +313,32 @@ def render_simple_bar(current: int,
     return max_bar
 
 
+_ship_icons: Dict[Tuple[str, bool], Surface] = {}
+
+
 def create_ship_icon(entity: Entity) -> Surface:
     """
     Create ship icon from a sprite sheet
+    A ship's look only depends on its sprite sheet and whether its sails are raised, so each combination is
+        composed once and shared - the result must not be drawn on
     :param entity: Entity's icon to be generated
     :return: created ship icon
     """
+    key = (entity.icon, bool(entity.sails.raised))
+    icon = _ship_icons.get(key)
+    if icon is None:
+        icon = compose_ship_icon(entity.icon, key[1])
+        _ship_icons[key] = icon
+    return icon
+
+
+def compose_ship_icon(sheet_name: str, sails_raised: bool) -> Surface:
+    """
+    Composes a ship icon from the pieces of a sprite sheet
+    :param sheet_name: str name of the sprite sheet in entity_icons
+    :param sails_raised: bool if the sails are raised
+    :return: created ship icon
+    """
     wake = (0, 0, tile_size, tile_size)
     hull = (0, tile_size, tile_size, tile_size)
     sail = (tile_size, tile_size, tile_size, tile_size)
@@ -254,12 +346,12 @@ def create_ship_icon(entity: Entity) -> Surface:
     icon = Surface((tile_size, tile_size))
     icon.set_colorkey(colors['black'])
     
-    sheet = entity_icons[entity.icon]
+    sheet = entity_icons[sheet_name]
     # if moving blit wake, but for now, if sail raised
-    if entity.sails.raised:
+    if sails_raised:
         icon.blit(sheet.subsurface(wake), (0, 0))  # wake
     icon.blit(sheet.subsurface(hull), (0, 0))  # hull
-    if entity.sails.raised:
+    if sails_raised:
         icon.blit(sheet.subsurface(sail), (0, 0))  # sail
         # if entity.affiliation:
         #     emblem_sheet = sheet.subsurface(emblem)
@@ -300,24 +392,39 @@ def weapon_stats_render(weapon: Weapon, sky_color: Tuple[int, int, int]) -> Surf
     height = margin
     
     game_font.set_underline(True)
-    surf = game_font.render(f"{weapon.name}", True, colors['mountain'])
+    surf = render_text(f"{weapon.name}", True, colors['mountain'])
     weapon_surf.blit(surf, ((weapon_surf.get_width() - surf.get_width()) // 2, height))
     game_font.set_underline(False)
     height += game_font.get_height() + margin
     
     for stat in ["range", "power", "cooldown", "hp", "defense", "ammo"]:
-        surf = game_font.render(f"{stat.capitalize()}", True, colors['mountain'])
+        surf = render_text(f"{stat.capitalize()}", True, colors['mountain'])
         weapon_surf.blit(surf, (margin, height))
-        surf = game_font.render(f"{weapons[weapon.name.lower()][stat]}", True, colors['mountain'])
+        surf = render_text(f"{weapons[weapon.name.lower()][stat]}", True, colors['mountain'])
         weapon_surf.blit(surf, (weapon_surf.get_width() - surf.get_width() - margin, height))
         height += game_font.get_height() + margin
 
     for stat in ["weight", "volume", "cost"]:
-        surf = game_font.render(f"{stat.capitalize()}", True, colors['mountain'])
+        surf = render_text(f"{stat.capitalize()}", True, colors['mountain'])
         weapon_surf.blit(surf, (margin, height))
-        surf = game_font.render(f"{item_stats[weapon.name.lower()][stat]}", True, colors['mountain'])
+        surf = render_text(f"{item_stats[weapon.name.lower()][stat]}", True, colors['mountain'])
         weapon_surf.blit(surf, (weapon_surf.get_width() - surf.get_width() - margin, height))
         height += game_font.get_height() + margin
 
     render_border(weapon_surf, sky_color)
     return weapon_surf
+
+
+def cache_all_rotations() -> None:
+    """
+    Builds every facing of the entity icons and sprite frames - they never change, so the game builds them once
+        before play (larger entity icons are ship sprite sheets, which are cut up by create_ship_icon rather than
+        drawn whole)
+    :return: None
+    """
+    for icon in entity_icons.values():
+        if icon.get_size() == (tile_size, tile_size):
+            cache_rotations(icon)
+    for frames in sprites.values():
+        for frame in frames:
+            cache_rotations(frame)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
 
-from pygame import display, Surface
+from pygame import display, Rect, Surface
 
+from constants.colors import colors
 from constants.constants import view_port, tile_size, margin
 from constants.enums import GameStates, Location, KeyMod
 from constants.images import entity_icons, terrain_icons
 from constants.sprites import sprites
+from render.terrain_layer import TerrainLayer, get_terrain_layer, tile_origin
 from render.utilities import map_to_surface_coords, get_rotated_image, render_border, create_ship_icon
 from utilities import get_cone_target_hexes_at_location
 
@@ -18,6 +21,44 @@ if TYPE_CHECKING:
     from weather import Weather
 
 
+_viewport_layers: WeakKeyDictionary = WeakKeyDictionary()
+
+
+class ViewportLayers:
+    def __init__(self, view_extra: int):
+        """
+        Surfaces the viewport keeps between frames for one GameMap
+        map_surf is reused every frame. terrain_surf holds the explored terrain and fog of war for the current
+            view window, composed again only when the window moves, the player's view changes or terrain is redrawn
+        :param view_extra: int number of tiles across the view window, overlap included
+        """
+        pad = max(icon.get_width() for icon in terrain_icons.values()) - tile_size
+        self.map_surf = Surface((view_extra * tile_size, view_extra * tile_size))
+        self.terrain_surf = Surface((view_extra * tile_size + pad, view_extra * tile_size + tile_size // 2 + pad))
+        self.key = None
+        self.fov = frozenset()
+    
+    def compose(self, terrain_layer: TerrainLayer, left: int, top: int, right: int, bottom: int) -> None:
+        """
+        Copies the view window out of the terrain layer and covers the tiles out of view with fog of war
+        :param terrain_layer: TerrainLayer of the current map
+        :param left: int left column of the view window
+        :param top: int top row of the view window
+        :param right: int column past the right edge of the view window
+        :param bottom: int row past the bottom edge of the view window
+        :return: None
+        """
+        area = Rect((left * tile_size, top * tile_size), self.terrain_surf.get_size())
+        self.terrain_surf.fill(colors['black'])
+        terrain_layer.draw(self.terrain_surf, area)
+        fog = terrain_icons["fog_of_war"]
+        for x in range(left, right):
+            for y in range(top, bottom):
+                if (x, y) not in self.fov:
+                    tile_x, tile_y = tile_origin(x, y)
+                    self.terrain_surf.blit(fog, (tile_x - area.left, tile_y - area.top))
+
+
 def viewport_render(game_map: GameMap,
                     main_display: display,
                     weather: Weather,
@@ -34,26 +75,22 @@ def viewport_render(game_map: GameMap,
     top = player.y - view_port - overlap
     bottom = top + view_size + 2 * overlap
     
-    map_surf = Surface((view_extra * tile_size, view_extra * tile_size))
-    
-    for x in range(left, right):
-        for y in range(top, bottom):
-            if game_map.in_bounds(x, y) and game_map.terrain[x][y].explored:
-                map_surf.blit(terrain_icons[game_map.terrain[x][y].elevation.name.lower()],
-                              map_to_surface_coords(x, y, left, top, overlap, player, camera))
-                if game_map.terrain[x][y].decoration:
-                    map_surf.blit(terrain_icons[game_map.terrain[x][y].decoration],
-                                  map_to_surface_coords(x, y, left, top, overlap, player, camera))
-                # coord_text = game_font.render(f"{x}:{y}", False, (0, 0, 0))
-                # map_surf.blit(coord_text,
-                #               ((x - left) * tile_size,
-                #                (y - top - 1) * tile_size + (x % 2) * half_tile + half_tile - offset))
+    layers = _viewport_layers.get(game_map)
+    if layers is None:
+        layers = ViewportLayers(view_extra)
+        _viewport_layers[game_map] = layers
+    map_surf = layers.map_surf
+    map_surf.fill(colors['black'])
     
-    for x in range(left, right):
-        for y in range(top, bottom):
-            if (x, y) not in player.view.fov:
-                map_surf.blit(terrain_icons["fog_of_war"],
-                              map_to_surface_coords(x, y, left, top, overlap, player, camera))
+    # explored terrain and fog only change when the player moves or something is explored / decorated
+    terrain_layer = get_terrain_layer(game_map.terrain)
+    terrain_layer.sync()
+    if layers.key != (left, top, terrain_layer.revision) or layers.fov != player.view.fov:
+        layers.key = (left, top, terrain_layer.revision)
+        layers.fov = frozenset(player.view.fov)
+        layers.compose(terrain_layer, left, top, right, bottom)
+    surface_x, surface_y = map_to_surface_coords(left, top, left, top, overlap, player, camera)
+    map_surf.blit(layers.terrain_surf, (surface_x, surface_y - (left % 2) * tile_size // 2))
     
     if game_map.engine.key_mod and game_map.engine.game_state == GameStates.ACTION:
         if game_map.engine.key_mod == KeyMod.SHIFT and not (player.x, player.y) == game_map.port.location:
@@ -67,13 +104,11 @@ def viewport_render(game_map: GameMap,
                     enough_ammo = False
             if enough_ammo:
                 enough_targets = True
-                targets = []
                 neighbor_tiles = player.game_map.get_neighbors_at_elevations(player.x,
                                                                              player.y,
                                                                              elevations='all')
                 neighbor_tiles.append((player.x, player.y))
-                for tile_x, tile_y in neighbor_tiles:
-                    targets.extend(player.game_map.get_targets_at_location(tile_x, tile_y))
+                targets = player.game_map.get_targets_in_region(neighbor_tiles)
                 if player in targets:
                     targets.remove(player)
                 if len(targets) < 1:
@@ -97,11 +132,9 @@ def viewport_render(game_map: GameMap,
                             enough_ammo = False
                     if enough_ammo:
                         enough_targets = True
-                        targets = []
                         hexes = get_cone_target_hexes_at_location(player.x, player.y, player.facing, side, distance)
-                        for x, y in hexes:
-                            if (x, y) in player.view.fov:
-                                targets.extend(player.game_map.get_targets_at_location(x, y))
+                        targets = player.game_map.get_targets_in_region(
+                            [(x, y) for x, y in hexes if (x, y) in player.view.fov])
                         if player in targets:
                             targets.remove(player)
                         if len(targets) < 1:
@@ -125,7 +158,6 @@ def viewport_render(game_map: GameMap,
     
     for entity in entities_sorted_for_rendering:
         if entity.sprite and (entity.x, entity.y) in player.view.fov:
-            entity.sprite.update(game_map.engine.clock.get_fps())
             map_surf.blit(get_rotated_image(sprites[entity.sprite.sprite_name][entity.sprite.pointer], entity.facing),
                           map_to_surface_coords(entity.x, entity.y, left, top, overlap, player, camera, entity=True))
         elif (entity.x, entity.y) in player.view.fov \
@@ -146,8 +178,10 @@ def viewport_render(game_map: GameMap,
             map_surf.blit(entity_icons[entity.icon],
                           map_to_surface_coords(entity.x, entity.y, left, top, overlap, player, camera, entity=True))
     
+    height = game_map.height
+    mist = game_map.terrain.mist
     for x, y in player.view.fov:
-        if game_map.in_bounds(x, y) and game_map.terrain[x][y].mist:
+        if game_map.in_bounds(x, y) and mist[x * height + y]:
             map_surf.blit(terrain_icons["mist"],
                           map_to_surface_coords(x, y, left, top, overlap, player, camera))
     
@@ -7,7 +7,7 @@ from pygame import Surface
 from constants.colors import colors
 from constants.constants import margin, game_font
 from constants.enums import Location
-from render.utilities import render_border, render_hp_bar, weapon_stats_render
+from render.utilities import render_border, render_hp_bar, weapon_stats_render, render_text
 
 if TYPE_CHECKING:
     from components.broadsides import Broadsides
@@ -42,12 +42,12 @@ def weapon_render(console: Surface,
         else:
             text_color = colors['mountain']
             background = colors['black']
-        item_surf = game_font.render(f"{weapon.name}", True, text_color, background)
+        item_surf = render_text(f"{weapon.name}", True, text_color, background)
         weapon_surf.blit(item_surf, (margin + 100, height))
         hp_surf = render_hp_bar("", weapon.hp, weapon.max_hp, ui_layout.status_width - 2 * margin)
         weapon_surf.blit(hp_surf, (margin + 250, height))
         if location in [Location.PORT, Location.STARBOARD]:
-            port_surf = game_font.render(f"{location.name.lower().capitalize()}", True, colors['mountain'])
+            port_surf = render_text(f"{location.name.lower().capitalize()}", True, colors['mountain'])
             weapon_surf.blit(port_surf, ((margin + 100 - port_surf.get_width()) // 2, height))
         height += game_font.get_height() + margin
         count += 1
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import lzma
+import os
+import zlib
+from argparse import ArgumentParser
+from json import dump, dumps, load, loads
+from struct import Struct
+from typing import Dict, List, Tuple
+
+from constants.constants import save_compression
+from constants.enums import Compression
+from tile import TerrainGrid, decoration_id, decoration_names
+
+"""
+Binary save layout, all integers little endian:
+    header: magic, format version, Compression value
+    body (compressed as a whole):
+        width, height, record count
+        elevation plane and decoration plane, one byte per cell
+        explored plane and mist plane, one bit per cell
+        records, each a length and a compact JSON object:
+            first the engine, the game map without terrain or entities and the decoration names of the planes,
+            then the player, then every other entity
+"""
+MAGIC = b'IoMS'
+VERSION = 1
+HEADER = Struct('<4sHB')
+BODY = Struct('<HHI')
+RECORD = Struct('<I')
+
+compressors = {
+    Compression.NONE: bytes,
+    Compression.ZLIB: zlib.compress,
+    Compression.LZMA: lzma.compress,
+}
+decompressors = {
+    Compression.NONE: bytes,
+    Compression.ZLIB: zlib.decompress,
+    Compression.LZMA: lzma.decompress,
+}
+
+_bit_digits = bytes([ord('0')] + [ord('1')] * 255)  # translate table: 0 to '0', anything else to '1'
+_digit_bits = bytes(1 if value == ord('1') else 0 for value in range(256))  # and back to 0 / 1
+
+
+def save_path(number: int) -> str:
+    return f'data/save_game_{number}.sav'
+
+
+def json_save_path(number: int) -> str:
+    return f'data/save_game_{number}.json'
+
+
+def pack_bits(plane: bytearray) -> bytes:
+    """
+    Packs a plane of 0/1 flags into bits, cell 0 in the lowest bit of the first byte
+    :param plane: bytearray of flags
+    :return: bytes of (len(plane) + 7) // 8 packed flags
+    """
+    if not plane:
+        return b''
+    return int(plane.translate(_bit_digits)[::-1], 2).to_bytes((len(plane) + 7) // 8, 'little')
+
+
+def unpack_bits(data: bytes, count: int) -> bytearray:
+    """
+    Unpacks flags packed by pack_bits
+    :param data: bytes of packed flags
+    :param count: int number of flags
+    :return: bytearray of 0/1 flags
+    """
+    digits = bin(int.from_bytes(data, 'little'))[2:].zfill(count)[::-1]
+    return bytearray(digits.encode()[:count].translate(_digit_bits))
+
+
+def encode(data: Dict, terrain: TerrainGrid, compression: Compression = save_compression) -> bytes:
+    """
+    Builds a binary save
+    :param data: dict with 'engine', 'game_map' and 'player' json - terrain in 'game_map' is ignored
+    :param terrain: TerrainGrid of the game map
+    :param compression: Compression of the body
+    :return: bytes of the save file
+    """
+    return compress(pack(data, terrain), compression)
+
+
+def pack(data: Dict, terrain: TerrainGrid) -> bytes:
+    """
+    Builds the uncompressed body of a binary save - a snapshot that no longer shares anything with the game
+    :param data: dict with 'engine', 'game_map' and 'player' json - terrain in 'game_map' is ignored
+    :param terrain: TerrainGrid of the game map
+    :return: bytes of the body
+    """
+    game_map = {key: value for key, value in data['game_map'].items() if key not in ('terrain', 'entities')}
+    records = [{'engine': data['engine'], 'game_map': game_map, 'decorations': decoration_names},
+               data['player']] + data['game_map']['entities']
+    
+    body = [BODY.pack(terrain.width, terrain.height, len(records)),
+            bytes(terrain.elevation),
+            bytes(terrain.decoration),
+            pack_bits(terrain.explored),
+            pack_bits(terrain.mist)]
+    for record in records:
+        encoded = dumps(record, separators=(',', ':')).encode()
+        body.append(RECORD.pack(len(encoded)))
+        body.append(encoded)
+    return b''.join(body)
+
+
+def compress(body: bytes, compression: Compression = save_compression) -> bytes:
+    """
+    Compresses a body built by pack and puts the header in front
+    :param body: bytes of the body
+    :param compression: Compression of the body
+    :return: bytes of the save file
+    """
+    return HEADER.pack(MAGIC, VERSION, compression.value) + compressors[compression](body)
+
+
+def write_atomic(file_path: str, blob: bytes) -> None:
+    """
+    Writes a file through a temporary file renamed over it, so a crash mid-write leaves the old file in place
+    :param file_path: str path of the file
+    :param blob: bytes to write
+    :return: None
+    """
+    temp_path = file_path + '.tmp'
+    with open(temp_path, 'wb') as temp_file:
+        temp_file.write(blob)
+        temp_file.flush()
+        os.fsync(temp_file.fileno())
+    os.replace(temp_path, file_path)
+
+
+def decode(blob: bytes) -> Tuple[Dict, TerrainGrid]:
+    """
+    Reads a binary save
+    :param blob: bytes of the save file
+    :return: dict with 'engine', 'game_map' (without terrain) and 'player' json, and the TerrainGrid
+    """
+    magic, version, compression = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not an Isles of Mist save file")
+    if version > VERSION:
+        raise ValueError(f"Save file version {version} is newer than this game's version {VERSION}")
+    body = decompressors[Compression(compression)](blob[HEADER.size:])
+    
+    width, height, count = BODY.unpack_from(body)
+    offset = BODY.size
+    size = width * height
+    bit_size = (size + 7) // 8
+    elevation = bytearray(body[offset:offset + size])
+    offset += size
+    decoration = bytearray(body[offset:offset + size])
+    offset += size
+    explored = unpack_bits(body[offset:offset + bit_size], size)
+    offset += bit_size
+    mist = unpack_bits(body[offset:offset + bit_size], size)
+    offset += bit_size
+    
+    records: List[Dict] = []
+    for _ in range(count):
+        (length,) = RECORD.unpack_from(body, offset)
+        offset += RECORD.size
+        records.append(loads(body[offset:offset + length]))
+        offset += length
+    head, player, entities = records[0], records[1], records[2:]
+    
+    # decoration ids are handed out as names are first seen, so map the saved ids onto this game's ids
+    names = head['decorations']
+    if names != decoration_names[:len(names)]:
+        ids = bytes(decoration_id(name) for name in names)
+        decoration = decoration.translate(ids + bytes(256 - len(ids)))
+    
+    terrain = TerrainGrid(width=width, height=height, elevation=elevation, explored=explored,
+                          decoration=decoration, mist=mist)
+    game_map = dict(head['game_map'], entities=entities)
+    return {'engine': head['engine'], 'game_map': game_map, 'player': player}, terrain
+
+
+def export_json(blob: bytes) -> Dict:
+    """
+    Returns the contents of a binary save in the json save layout, for debugging
+    :param blob: bytes of the save file
+    :return: dict with 'engine', 'game_map' and 'player' json
+    """
+    data, terrain = decode(blob)
+    data['game_map']['terrain'] = terrain.to_json()
+    return data
+
+
+def convert_json_save(json_path: str, binary_path: str, compression: Compression = save_compression) -> None:
+    """
+    Writes a binary save from a json save
+    :param json_path: str path of the json save to read
+    :param binary_path: str path of the binary save to write
+    :param compression: Compression of the body
+    :return: None
+    """
+    with open(json_path) as json_file:
+        data = load(json_file)
+    terrain = TerrainGrid.from_json(data['game_map']['terrain'])
+    write_atomic(binary_path, encode(data, terrain, compression))
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Convert Isles of Mist save files")
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser('convert', help="json save to binary save")
+    convert.add_argument('json_path')
+    convert.add_argument('binary_path', nargs='?')
+    convert.add_argument('--compression', choices=[c.name.lower() for c in Compression],
+                         default=save_compression.name.lower())
+    export = commands.add_parser('export', help="binary save to json")
+    export.add_argument('binary_path')
+    export.add_argument('json_path', nargs='?',
+                        help="defaults to the save's name ending in .export.json, apart from any json save")
+    args = parser.parse_args()
+    
+    if args.command == 'convert':
+        binary_path = args.binary_path or args.json_path.rsplit('.', 1)[0] + '.sav'
+        convert_json_save(args.json_path, binary_path, Compression[args.compression.upper()])
+    else:
+        json_path = args.json_path or args.binary_path.rsplit('.', 1)[0] + '.export.json'
+        with open(args.binary_path, 'rb') as save_file:
+            data = export_json(save_file.read())
+        with open(json_path, 'w') as json_file:
+            dump(data, json_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
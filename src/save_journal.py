@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import zlib
+from base64 import b64decode, b64encode
+from copy import deepcopy
+from itertools import compress
+from json import dumps, loads
+from struct import Struct
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from constants.constants import journal_compaction
+from save_format import pack, pack_bits, unpack_bits
+from tile import TerrainGrid
+
+if TYPE_CHECKING:
+    from engine import Engine
+    from entity import Entity
+    from game_map import GameMap
+
+"""
+Journal layout, all integers little endian:
+    header: magic, format version, crc32 of the save file the journal applies to
+    entries, each a length and a zlib compressed compact JSON object holding one turn's changes (see SaveJournal.delta)
+Entities are journaled by id: their position in the save file's entity list, then numbered on as they are added
+A journal whose crc32 does not match the save file is left over from before the last compaction and is ignored, as
+    is a journal of another format version
+"""
+MAGIC = b'IoMJ'
+VERSION = 2
+HEADER = Struct('<4sHI')
+ENTRY = Struct('<I')
+
+byte_planes = ('elevation', 'decoration')
+flag_planes = ('explored', 'mist')  # 0/1 planes - a changed cell is flipped, so only its id is journaled
+packed_ratio = 24  # a flag plane with more than one in this many cells flipped is journaled whole, packed to bits
+plane_names = byte_planes + flag_planes
+entry_level = 1  # zlib level of the entries - the fastest, entries are built on the main thread every turn
+
+
+def journal_path(number: int) -> str:
+    return f'data/save_game_{number}.journal'
+
+
+def journal_header(save_blob: bytes) -> bytes:
+    return HEADER.pack(MAGIC, VERSION, zlib.crc32(save_blob))
+
+
+def encode_entry(entry: Dict) -> bytes:
+    encoded = zlib.compress(dumps(entry, separators=(',', ':')).encode(), entry_level)
+    return ENTRY.pack(len(encoded)) + encoded
+
+
+def read_journal(blob: bytes, save_blob: bytes) -> Iterator[Dict]:
+    """
+    Yields the entries of a journal that applies to a save file - a torn entry at the end is skipped
+    :param blob: bytes of the journal file
+    :param save_blob: bytes of the save file
+    :return: iterator of entry dicts
+    """
+    if len(blob) < HEADER.size:
+        return
+    magic, version, checksum = HEADER.unpack_from(blob)
+    if magic != MAGIC or version != VERSION or checksum != zlib.crc32(save_blob):
+        return
+    offset = HEADER.size
+    while offset + ENTRY.size <= len(blob):
+        (length,) = ENTRY.unpack_from(blob, offset)
+        offset += ENTRY.size
+        if offset + length > len(blob):
+            return
+        yield loads(zlib.decompress(blob[offset:offset + length]))
+        offset += length
+
+
+def changed_cells(old: bytes, new: bytes) -> List[int]:
+    """
+    Returns the cell ids where two planes differ - the planes are xored as big integers, so it runs at C speed
+    :param old: bytes of the previous plane
+    :param new: bytes of the current plane
+    :return: list of cell ids
+    """
+    difference = int.from_bytes(old, 'little') ^ int.from_bytes(new, 'little')
+    return list(compress(range(len(new)), difference.to_bytes(len(new), 'little')))
+
+
+def message_delta(old: List, new: List) -> Optional[List]:
+    """
+    Describes the message log as the previous log with messages dropped from the front and replaced at the end
+    :param old: list of previous message json
+    :param new: list of current message json
+    :return: [dropped, kept, tail] so new == old[dropped:dropped + kept] + tail, or None if nothing changed
+    """
+    if old == new:
+        return None
+    best = (0, 0)
+    for dropped in range(len(old) + 1):
+        kept = 0
+        for previous, current in zip(old[dropped:], new):
+            if previous != current:
+                break
+            kept += 1
+        if kept > best[1]:
+            best = (dropped, kept)
+        if kept == len(old) - dropped:
+            break
+    dropped, kept = best
+    return [dropped, kept, new[kept:]]
+
+
+class SaveJournal:
+    def __init__(self, compaction: int = journal_compaction):
+        """
+        Turns each autosave into either a full save body or a journal entry holding only what changed since the last
+            autosave - terrain cells, engine and game map fields, the message log tail, the player's fields, and the
+            entities added, removed or changed
+        Terrain entries are built from what the game marked as changed: cells logged in changed_cells and the mist plane
+            when mist_generation moved on. Every entity's json is compared with its last journaled json, and the game
+            map's changed_entities tells which entities were removed
+        A full save body is made first, then after compaction entries or once the journal outgrows the save file
+        :param compaction: int number of journal entries between full saves
+        """
+        self.compaction = compaction
+        self.game_map: Optional[GameMap] = None  # game map the journal state belongs to
+        self.entries = 0
+        self.journal_bytes = 0
+        self.engine: Dict = {}  # engine json without the message log
+        self.messages: List[Dict] = []
+        self.map_fields: Dict = {}  # game map json without terrain and entities
+        self.player: Dict = {}
+        self.records: Dict[Entity, Dict] = {}  # json of every entity but the player as last journaled
+        # the journal state is deep copied - to_json hands out live lists and dicts, like Cargo.manifest, that would
+        # otherwise change along with the game and hide the change from the next delta
+        self.ids: Dict[Entity, int] = {}  # journal id of every entity but the player
+        self.next_id = 0
+        self.planes: Dict[str, bytearray] = {}  # terrain planes as last journaled
+        self.log_offset = 0  # position in terrain.changed_cells read up to
+        self.mist_generation = 0
+    
+    def record(self, engine: Engine, game_map: GameMap, player: Entity,
+               save_size: Optional[int] = None) -> Tuple[bool, bytes]:
+        """
+        Returns what to write for the current game
+        :param engine: Engine
+        :param game_map: GameMap
+        :param player: player Entity
+        :param save_size: int bytes of the last save file written, None if it is not known yet
+        :return: bool True for a full save body (save_format.pack), False for a journal entry, and the bytes
+        """
+        if game_map is not self.game_map or self.entries >= self.compaction \
+                or (save_size is not None and self.journal_bytes > save_size):
+            return True, self.snapshot(engine, game_map, player)
+        
+        entry = encode_entry(self.delta(engine, game_map, player))
+        self.entries += 1
+        self.journal_bytes += len(entry)
+        return False, entry
+    
+    def snapshot(self, engine: Engine, game_map: GameMap, player: Entity) -> bytes:
+        """
+        Starts the journal over from a full save body of the game
+        :return: bytes of the save body
+        """
+        terrain = game_map.terrain
+        self.game_map = game_map
+        self.entries = 0
+        self.journal_bytes = 0
+        records = {entity: entity.to_json() for entity in game_map.entities if entity is not player}
+        self.ids = {entity: entity_id for entity_id, entity in enumerate(records)}
+        self.next_id = len(self.ids)
+        player_json = player.to_json()
+        map_fields = game_map.to_json(with_terrain=False, with_entities=False)
+        self.planes = {name: bytearray(getattr(terrain, name)) for name in plane_names}
+        self.log_offset = len(terrain.changed_cells)
+        self.mist_generation = terrain.mist_generation
+        game_map.changed_entities.clear()
+        
+        engine_json = engine.to_json()
+        data = {
+            'engine': engine_json,
+            'game_map': dict(map_fields, entities=list(records.values())),
+            'player': player_json,
+        }
+        self.records = {entity: deepcopy(record) for entity, record in records.items()}
+        self.player = deepcopy(player_json)
+        self.map_fields = deepcopy(map_fields)
+        self.engine = deepcopy({key: value for key, value in engine_json.items() if key != 'message_log'})
+        self.messages = deepcopy(engine_json['message_log']['messages'])
+        return pack(data, terrain)
+    
+    def delta(self, engine: Engine, game_map: GameMap, player: Entity) -> Dict:
+        """
+        Builds the journal entry of what changed since the last autosave, and brings the journal state up to date
+            engine, game map, player and entity json are compared field by field
+        :return: dict entry
+        """
+        entry = {}
+        planes = self.terrain_delta(game_map.terrain)
+        if planes:
+            entry['planes'] = planes
+        
+        engine_json = engine.to_json()
+        messages = engine_json.pop('message_log')['messages']
+        map_fields = game_map.to_json(with_terrain=False, with_entities=False)
+        for section, old, new in (('engine', self.engine, engine_json),
+                                  ('game_map', self.map_fields, map_fields),
+                                  ('player', self.player, player.to_json())):
+            changed = {key: value for key, value in new.items() if old.get(key) != value}
+            if changed:
+                entry[section] = changed
+                old.update(deepcopy(changed))
+        message_change = message_delta(self.messages, messages)
+        if message_change is not None:
+            entry['messages'] = message_change
+            self.messages = deepcopy(messages)
+        
+        removed = []
+        changed = []
+        added = []
+        for entity in game_map.changed_entities:  # added, removed or moved through the game map
+            if entity not in game_map.entities and entity in self.records:
+                removed.append(self.ids.pop(entity))
+                del self.records[entity]
+        game_map.changed_entities.clear()
+        for entity in game_map.entities:
+            if entity is player:
+                continue
+            new = entity.to_json()
+            old = self.records.get(entity)
+            if old is None:
+                added.append(new)
+                self.ids[entity] = self.next_id
+                self.next_id += 1
+                self.records[entity] = deepcopy(new)
+            else:
+                fields = {field: value for field, value in new.items() if old.get(field) != value}
+                if fields:
+                    changed.append([self.ids[entity], fields])
+                    old.update(deepcopy(fields))
+        
+        if removed:
+            entry['removed'] = removed
+        if changed:
+            entry['changed'] = changed
+        if added:
+            entry['added'] = added
+        return entry
+    
+    def terrain_delta(self, terrain: TerrainGrid) -> Dict[str, List]:
+        """
+        Returns the terrain cells changed since the last autosave, and brings the journal's planes up to date
+        :param terrain: TerrainGrid of the game map
+        :return: dict of changed cells by plane name, [[cell id, value]] for byte planes and cell ids for flag planes -
+            or for a flag plane that mostly changed, the whole plane packed to bits as base64
+        """
+        planes = {}
+        cells = {name: [] for name in plane_names}
+        logged = set(terrain.changed_cells[self.log_offset:])
+        self.log_offset = len(terrain.changed_cells)
+        for name in ('elevation', 'explored', 'decoration'):
+            plane = getattr(terrain, name)
+            journaled = self.planes[name]
+            cells[name] = sorted(index for index in logged if journaled[index] != plane[index])
+        if terrain.mist_generation != self.mist_generation:
+            self.mist_generation = terrain.mist_generation
+            cells['mist'] = changed_cells(self.planes['mist'], terrain.mist)
+        
+        for name in plane_names:
+            if not cells[name]:
+                continue
+            plane = getattr(terrain, name)
+            journaled = self.planes[name]
+            if name in flag_planes and len(cells[name]) * packed_ratio > len(plane):
+                planes[name] = b64encode(pack_bits(plane)).decode()
+                journaled[:] = plane
+                continue
+            for index in cells[name]:
+                journaled[index] = plane[index]
+            if name in byte_planes:
+                planes[name] = [[index, plane[index]] for index in cells[name]]
+            else:
+                planes[name] = cells[name]
+        return planes
+
+
+def replay(data: Dict, terrain: TerrainGrid, entries: Iterator[Dict]) -> None:
+    """
+    Applies journal entries to a decoded save, in place
+    :param data: dict with 'engine', 'game_map' (without terrain) and 'player' json, from save_format.decode
+    :param terrain: TerrainGrid from save_format.decode
+    :param entries: iterator of entry dicts
+    :return: None
+    """
+    entities: List[Optional[Dict]] = list(data['game_map']['entities'])  # by journal id, None once removed
+    
+    for entry in entries:
+        for name, cells in entry.get('planes', {}).items():
+            plane = getattr(terrain, name)
+            if name in byte_planes:
+                for index, value in cells:
+                    plane[index] = value
+            elif isinstance(cells, str):
+                plane[:] = unpack_bits(b64decode(cells), len(plane))
+            else:
+                for index in cells:
+                    plane[index] ^= 1
+            if name == 'elevation':
+                terrain.elevation_generation += 1
+        data['engine'].update(entry.get('engine', {}))
+        data['game_map'].update(entry.get('game_map', {}))
+        if 'messages' in entry:
+            dropped, kept, tail = entry['messages']
+            log = data['engine']['message_log']
+            log['messages'] = log['messages'][dropped:dropped + kept] + tail
+        data['player'].update(entry.get('player', {}))
+        for entity_id in entry.get('removed', []):
+            entities[entity_id] = None
+        for entity_id, fields in entry.get('changed', []):
+            entities[entity_id] = dict(entities[entity_id], **fields)
+        entities.extend(entry.get('added', []))
+    
+    data['game_map']['entities'] = [entity for entity in entities if entity is not None]
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from threading import Condition, Thread
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from constants.constants import save_compression
+from constants.enums import Compression
+from save_format import compress, write_atomic
+from save_journal import journal_header
+
+
+class SaveStats:
+    def __init__(self, window: int = 100):
+        """
+        Latency statistics of the save writer
+        :param window: int number of recent saves kept for averages
+        """
+        self.submitted = 0
+        self.written = 0
+        self.coalesced = 0  # snapshots and journal entries replaced by a newer snapshot before they were written
+        self.journal_entries = 0  # journal entries written
+        self.latencies = deque(maxlen=window)  # ms from submit to the file being in place
+        self.write_times = deque(maxlen=window)  # ms spent compressing and writing
+        self.sizes = deque(maxlen=window)  # bytes per save file
+    
+    def summary(self) -> Dict:
+        """
+        Returns the counters and the recent save times
+        :return: dict of statistics, times in ms
+        """
+        latencies = sorted(self.latencies)
+        return {
+            'submitted': self.submitted,
+            'written': self.written,
+            'coalesced': self.coalesced,
+            'latency_ms_mean': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_ms_p95': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            'latency_ms_max': latencies[-1] if latencies else 0.0,
+            'write_ms_mean': sum(self.write_times) / len(self.write_times) if self.write_times else 0.0,
+            'bytes_last': self.sizes[-1] if self.sizes else 0,
+            'journal_entries': self.journal_entries,
+        }
+
+
+class SaveWriter:
+    def __init__(self, file_path: str, journal_file_path: str = None, compression: Compression = save_compression):
+        """
+        Writes save snapshots on a background thread. Only the newest snapshot waiting is kept, so a burst of turns
+            costs one write, and each write goes through a temporary file renamed over the save
+        Journal entries are appended to the journal in the order they are handed over - writing a snapshot starts
+            a new journal, so entries still waiting behind a newer snapshot are dropped
+        :param file_path: str path of the save file
+        :param journal_file_path: str path of the journal file, None if no journal entries are written
+        :param compression: Compression of the save body
+        """
+        self.file_path = file_path
+        self.journal_file_path = journal_file_path
+        self.compression = compression
+        self.stats = SaveStats()
+        self.error: Optional[BaseException] = None
+        self._pending: Optional[bytes] = None
+        self._pending_entries: List[bytes] = []
+        self._pending_time = 0.0
+        self._busy = False
+        self._closing = False
+        self._condition = Condition()
+        self._thread = Thread(target=self._run, name='save-writer', daemon=True)
+        self._thread.start()
+    
+    def submit(self, body: bytes) -> None:
+        """
+        Hands a snapshot to the writer, replacing any snapshot still waiting
+        :param body: bytes of a save body built by save_format.pack
+        :return: None
+        """
+        with self._condition:
+            self._raise_error()
+            if self._pending is not None:
+                self.stats.coalesced += 1
+            self.stats.coalesced += len(self._pending_entries)
+            self._pending_entries.clear()
+            self._pending = body
+            self._pending_time = perf_counter()
+            self.stats.submitted += 1
+            self._condition.notify_all()
+    
+    def append(self, entry: bytes) -> None:
+        """
+        Hands a journal entry to the writer
+        :param entry: bytes of an entry built by SaveJournal.record
+        :return: None
+        """
+        with self._condition:
+            self._raise_error()
+            if self._pending is None and not self._pending_entries:
+                self._pending_time = perf_counter()
+            self._pending_entries.append(entry)
+            self.stats.submitted += 1
+            self._condition.notify_all()
+    
+    def summary(self) -> Dict:
+        """
+        Returns the summary of the save statistics, read under the lock the writer thread updates them with
+        :return: dict of statistics, times in ms
+        """
+        with self._condition:
+            return self.stats.summary()
+    
+    def flush(self) -> None:
+        """
+        Blocks until every submitted snapshot is on disk
+        :return: None
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: (self._pending is None and not self._pending_entries and not self._busy)
+                or self.error is not None)
+            self._raise_error()
+    
+    def close(self) -> None:
+        """
+        Writes the last snapshot and stops the thread
+        :return: None
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join()
+        with self._condition:
+            self._raise_error()
+    
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+    
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending is not None or self._pending_entries or self._closing)
+                if self._pending is None and not self._pending_entries:
+                    return
+                body, entries, submitted = self._pending, self._pending_entries, self._pending_time
+                self._pending = None
+                self._pending_entries = []
+                self._busy = True
+            
+            start = perf_counter()
+            size = 0
+            try:
+                if body is not None:
+                    blob = compress(body, self.compression)
+                    write_atomic(self.file_path, blob)
+                    size = len(blob)
+                    if self.journal_file_path is not None:
+                        write_atomic(self.journal_file_path, journal_header(blob))
+                if entries:
+                    with open(self.journal_file_path, 'ab') as journal_file:
+                        journal_file.write(b''.join(entries))
+                        journal_file.flush()
+                        os.fsync(journal_file.fileno())
+            except Exception as e:
+                with self._condition:
+                    self.error = e
+                    self._busy = False
+                    self._condition.notify_all()
+                continue
+            done = perf_counter()
+            
+            with self._condition:
+                self.stats.written += 1
+                self.stats.journal_entries += len(entries)
+                self.stats.latencies.append((done - submitted) * 1000)
+                self.stats.write_times.append((done - start) * 1000)
+                if body is not None:
+                    self.stats.sizes.append(size)
+                self._busy = False
+                self._condition.notify_all()
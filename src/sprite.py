@@ -29,16 +29,17 @@ class Sprite:
         flicker_speed = json_data.get('flicker_speed')
         return Sprite(sprite_name, sprite_count, flicker_timer, pointer=pointer, flicker_speed=flicker_speed)
     
-    def update(self, fps: int) -> None:
+    def update(self, elapsed: float) -> bool:
         """
         update sprite time counter - change picture if necessary
-        :param fps: frames per second
-        :return: None
+        :param elapsed: seconds since the last update
+        :return: bool True if the picture changed
         """
-        if fps > 0.0:
-            self.flicker_timer += 1 / fps
+        pointer = self.pointer
+        self.flicker_timer += elapsed
         if self.flicker_timer >= self.flicker_speed:
             self.flicker_timer = 0
             self.pointer += 1
         if self.pointer >= self.sprite_count:
             self.pointer = 0
+        return self.pointer != pointer
@@ -1,9 +1,39 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from constants.enums import Elevation
 
+"""
+Elevation enums indexed by their value, so a byte from the elevation plane converts back without an Enum call
+"""
+elevation_by_value: List[Optional[Elevation]] = [None] * (max(e.value for e in Elevation
+                                                             if isinstance(e.value, int)) + 1)
+for _elevation in Elevation:
+    if isinstance(_elevation.value, int):
+        elevation_by_value[_elevation.value] = _elevation
+
+"""
+Decoration names indexed by the id stored in the decoration plane - id 0 is no decoration
+"""
+decoration_names: List[Optional[str]] = [None, 'rocks', 'coral', 'sandbar', 'seaweed', 'quarry', 'claypool',
+                                         'tidepool', 'farmland', 'swamp', 'mine', 'volcano', 'port', 'minefield']
+decoration_ids: Dict[Optional[str], int] = {name: index for index, name in enumerate(decoration_names)}
+
+
+def decoration_id(name: Optional[str]) -> int:
+    """
+    Returns the plane id of a decoration name, registering names that have not been seen before
+    :param name: str decoration name (or None)
+    :return: int id stored in the decoration plane
+    """
+    if name not in decoration_ids:
+        if len(decoration_names) > 255:
+            raise ValueError(f"Too many decoration types to store {name}")
+        decoration_ids[name] = len(decoration_names)
+        decoration_names.append(name)
+    return decoration_ids[name]
+
 
 class Terrain:
     def __init__(self, elevation: Elevation, explored: bool = False, decoration: str = None, mist: bool = False):
@@ -33,3 +63,227 @@ class Terrain:
         decoration = json_data.get('decoration')
         mist = json_data.get('mist')
         return Terrain(elevation=Elevation(elevation), explored=explored, decoration=decoration, mist=mist)
+
+
+class TerrainView:
+    __slots__ = ('grid', 'index')
+    
+    def __init__(self, grid: TerrainGrid, index: int):
+        """
+        Terrain compatible view of a single cell stored in a TerrainGrid
+        :param grid: TerrainGrid holding the cell
+        :param index: int cell id in the grid planes
+        """
+        self.grid = grid
+        self.index = index
+    
+    @property
+    def elevation(self) -> Elevation:
+        return elevation_by_value[self.grid.elevation[self.index]]
+    
+    @elevation.setter
+    def elevation(self, value: Elevation) -> None:
+        self.grid.elevation[self.index] = value.value
+        self.grid.elevation_generation += 1
+        self.grid.changed_cells.append(self.index)
+    
+    @property
+    def explored(self) -> bool:
+        return bool(self.grid.explored[self.index])
+    
+    @explored.setter
+    def explored(self, value: bool) -> None:
+        self.grid.explored[self.index] = 1 if value else 0
+        self.grid.changed_cells.append(self.index)
+    
+    @property
+    def decoration(self) -> Optional[str]:
+        return decoration_names[self.grid.decoration[self.index]]
+    
+    @decoration.setter
+    def decoration(self, value: Optional[str]) -> None:
+        self.grid.decoration[self.index] = decoration_id(value)
+        self.grid.changed_cells.append(self.index)
+    
+    @property
+    def mist(self) -> bool:
+        return bool(self.grid.mist[self.index])
+    
+    @mist.setter
+    def mist(self, value: bool) -> None:
+        self.grid.mist[self.index] = 1 if value else 0
+        self.grid.mist_generation += 1
+    
+    def to_json(self) -> Dict:
+        return {
+            'elevation': self.elevation.value,
+            'explored': self.explored,
+            'decoration': self.decoration,
+            'mist': self.mist
+        }
+
+
+class TerrainColumn:
+    __slots__ = ('grid', 'x')
+    
+    def __init__(self, grid: TerrainGrid, x: int):
+        """
+        One column of a TerrainGrid, so terrain[x][y] keeps working for existing callers
+        :param grid: TerrainGrid holding the column
+        :param x: int x coordinate of the column
+        """
+        self.grid = grid
+        self.x = x
+    
+    def __len__(self) -> int:
+        return self.grid.height
+    
+    def __getitem__(self, y: int) -> TerrainView:
+        return TerrainView(self.grid, self.grid.index(self.x, y))
+    
+    def __setitem__(self, y: int, terrain: Terrain) -> None:
+        self.grid.set_tile(self.x, y, terrain)
+    
+    def __iter__(self) -> Iterator[TerrainView]:
+        start = self.x * self.grid.height
+        for index in range(start, start + self.grid.height):
+            yield TerrainView(self.grid, index)
+
+
+class TerrainGrid:
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 elevation: bytearray = None,
+                 explored: bytearray = None,
+                 decoration: bytearray = None,
+                 mist: bytearray = None):
+        """
+        Struct of arrays terrain store - one byte plane per Terrain attribute, indexed by cell id (x * height + y)
+        :param width: width of the game map
+        :param height: height of the game map
+        :param elevation: plane of Elevation values
+        :param explored: plane of 0/1 explored flags
+        :param decoration: plane of decoration ids (see decoration_names)
+        :param mist: plane of 0/1 mist flags
+        elevation_generation is bumped on every elevation write so derived tables (passability) know to rebuild -
+            code writing straight into the elevation plane must bump it as well
+        mist_generation is bumped the same way on mist writes, which move the whole plane every turn and so are not
+            logged per cell
+        changed_cells is an append only log of cell ids whose elevation, explored flag or decoration changed -
+            cached renderings remember how far they have read and only redraw the cells logged since
+        """
+        self.width = width
+        self.height = height
+        size = width * height
+        self.elevation = elevation if elevation is not None else bytearray([Elevation.OCEAN.value]) * size
+        self.explored = explored if explored is not None else bytearray(size)
+        self.decoration = decoration if decoration is not None else bytearray(size)
+        self.mist = mist if mist is not None else bytearray(size)
+        self.elevation_generation = 0
+        self.mist_generation = 0
+        self.changed_cells: List[int] = []
+    
+    def to_json(self) -> List[List[Dict]]:
+        return [[tile.to_json() for tile in column] for column in self]
+    
+    @staticmethod
+    def from_json(json_data: List[List[Dict]]) -> TerrainGrid:
+        width = len(json_data)
+        height = len(json_data[0]) if width else 0
+        grid = TerrainGrid(width=width, height=height)
+        for x, column in enumerate(json_data):
+            for y, tile in enumerate(column):
+                grid.set_tile(x, y, Terrain.from_json(tile))
+        grid.changed_cells.clear()  # nothing has been drawn from a new grid yet
+        return grid
+    
+    @staticmethod
+    def from_tiles(tiles: Iterable[Iterable[Terrain]]) -> TerrainGrid:
+        """
+        Builds a grid from a list of lists of Terrain tiles
+        :param tiles: list of columns of Terrain
+        :return: TerrainGrid
+        """
+        columns = [list(column) for column in tiles]
+        grid = TerrainGrid(width=len(columns), height=len(columns[0]) if columns else 0)
+        for x, column in enumerate(columns):
+            for y, terrain in enumerate(column):
+                grid.set_tile(x, y, terrain)
+        grid.changed_cells.clear()  # nothing has been drawn from a new grid yet
+        return grid
+    
+    def __len__(self) -> int:
+        return self.width
+    
+    def __getitem__(self, x: int) -> TerrainColumn:
+        if x < 0:
+            x += self.width
+        if not 0 <= x < self.width:
+            raise IndexError("terrain column out of range")
+        return TerrainColumn(self, x)
+    
+    def __iter__(self) -> Iterator[TerrainColumn]:
+        for x in range(self.width):
+            yield TerrainColumn(self, x)
+    
+    def index(self, x: int, y: int) -> int:
+        """
+        Returns the cell id of (x, y), with list style negative indexing
+        :param x: x int coordinate of game map
+        :param y: y int coordinate of game map
+        :return: int cell id
+        """
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("terrain row out of range")
+        return x * self.height + y
+    
+    def coords(self, index: int) -> Tuple[int, int]:
+        """
+        Returns the (x, y) coordinates of a cell id
+        :param index: int cell id
+        :return: Tuple (x, y) coordinates
+        """
+        return divmod(index, self.height)
+    
+    def set_tile(self, x: int, y: int, terrain: Terrain) -> None:
+        """
+        Copies a Terrain tile into the planes at (x, y)
+        :param x: x int coordinate of game map
+        :param y: y int coordinate of game map
+        :param terrain: Terrain to store
+        :return: None
+        """
+        index = self.index(x, y)
+        self.elevation[index] = terrain.elevation.value
+        self.elevation_generation += 1
+        self.explored[index] = 1 if terrain.explored else 0
+        self.decoration[index] = decoration_id(terrain.decoration)
+        self.mist[index] = 1 if terrain.mist else 0
+        self.mist_generation += 1
+        self.changed_cells.append(index)
+    
+    def elevation_at(self, x: int, y: int) -> Elevation:
+        return elevation_by_value[self.elevation[x * self.height + y]]
+    
+    def decoration_at(self, x: int, y: int) -> Optional[str]:
+        return decoration_names[self.decoration[x * self.height + y]]
+    
+    def mark_explored(self, cells: Iterable[Tuple[int, int]]) -> None:
+        """
+        Flags every in-bounds (x, y) cell as explored, logging the cells that were not explored before
+        :param cells: iterable of (x, y) coordinates
+        :return: None
+        """
+        explored = self.explored
+        changed_cells = self.changed_cells
+        width = self.width
+        height = self.height
+        for (x, y) in cells:
+            if 0 <= x < width and 0 <= y < height:
+                index = x * height + y
+                if not explored[index]:
+                    explored[index] = 1
+                    changed_cells.append(index)
@@ -1,8 +1,34 @@
+from typing import Dict, Optional, Tuple
+
 from pygame import Surface
 
 from constants.enums import TimeOfDay
 
 
+class TintLayer:
+    def __init__(self, size: Tuple[int, int]):
+        """
+        Day and night tint of one panel size - the surface is only filled again when the sky color changes and its
+            alpha only set again when the alpha changes, at most once per step of game time
+        :param size: Tuple (width, height) of the panels tinted
+        """
+        self.surface = Surface(size)
+        self.color: Optional[Tuple[int, int, int]] = None
+        self.alpha: Optional[int] = None
+    
+    def update(self, color: Tuple[int, int, int], alpha: int) -> Surface:
+        if color != self.color:
+            self.surface.fill(color)
+            self.color = color
+        if alpha != self.alpha:
+            self.surface.set_alpha(alpha)
+            self.alpha = alpha
+        return self.surface
+
+
+_tint_layers: Dict[Tuple[int, int], TintLayer] = {}  # by panel size, shared by every Time
+
+
 class Time:
     def __init__(self, hrs=9, mins=0, day=1, month=1, year=1111):  # Year of Steve
         """
@@ -84,11 +110,11 @@ class Time:
             print("out of turns!")
     
     def tint_render(self, panel):
-        tint_surf = Surface((panel.get_width(), panel.get_height()))
-        tint_surf.set_alpha(abs(self.hrs * 60 + self.mins - 720) // 6)
-        tint = self.get_sky_color
-        tint_surf.fill(tint)
-        panel.blit(tint_surf, (0, 0))
+        size = panel.get_size()
+        layer = _tint_layers.get(size)
+        if layer is None:
+            layer = _tint_layers[size] = TintLayer(size)
+        panel.blit(layer.update(self.get_sky_color, abs(self.hrs * 60 + self.mins - 720) // 6), (0, 0))
     
     @property
     def get_sky_color(self):
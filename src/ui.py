@@ -1,3 +1,5 @@
+from pygame import Rect
+
 from constants.constants import message_count, block_size, view_port, tile_size, game_font, margin
 
 
@@ -15,6 +17,14 @@ class DisplayInfo:
         self.control_height = self.messages_height
         self.control_width = self.mini_width
         self.status_height = self.display_height - self.mini_height - self.control_height
+        self.panels = {
+            'mini_map': Rect(0, 0, self.mini_width, self.mini_height),
+            'status': Rect(0, self.mini_height, self.status_width, self.status_height),
+            'controls': Rect(0, self.mini_height + self.status_height, self.control_width, self.control_height),
+            'messages': Rect(self.status_width, self.viewport_height, self.messages_width, self.messages_height),
+            'viewport': Rect(self.mini_width, 0, self.viewport_width, self.viewport_height),
+        }
+        self.messages_max = Rect(self.status_width, 0, self.messages_width, self.display_height)
     
     def in_viewport(self, x: int, y: int) -> bool:
         return self.mini_width <= x < self.display_width - 1 and 0 < y < self.viewport_height - 1
@@ -1,3 +1,4 @@
+from array import array
 from random import randint, choice
 from typing import List, Tuple, Dict
 
@@ -106,6 +107,44 @@ def get_neighbor(x: int, y: int, direction: int) -> Tuple[int, int]:
     return neighbor.col, neighbor.row
 
 
+def neighbor_offsets() -> List[List[Tuple[int, int]]]:
+    """
+    Returns the (dx, dy) step to the neighbor in each direction, for even columns and for odd columns
+    Neighbor offsets only depend on column parity, so one even and one odd column are sampled
+    :return: list of two lists of (dx, dy) in cube_directions order, even columns first
+    """
+    parity_offsets = []
+    for parity in range(2):
+        offsets = []
+        for direction in range(len(cube_directions)):
+            neighbor_x, neighbor_y = get_neighbor(parity, 0, direction)
+            offsets.append((neighbor_x - parity, neighbor_y))
+        parity_offsets.append(offsets)
+    return parity_offsets
+
+
+def build_neighbor_table(width: int, height: int) -> array:
+    """
+    Precomputes the six neighbor cell ids of every cell on a width x height map (cell id = x * height + y)
+    Neighbors are stored in cube_directions order at [6 * cell + direction], -1 when out of bounds
+    :param width: int map width
+    :param height: int map height
+    :return: flat array of neighbor cell ids
+    """
+    parity_offsets = neighbor_offsets()
+    table = array('i', [-1]) * (6 * width * height)
+    for x in range(width):
+        offsets = parity_offsets[x % 2]
+        for y in range(height):
+            start = 6 * (x * height + y)
+            for direction, (dx, dy) in enumerate(offsets):
+                neighbor_x = x + dx
+                neighbor_y = y + dy
+                if 0 <= neighbor_x < width and 0 <= neighbor_y < height:
+                    table[start + direction] = neighbor_x * height + neighbor_y
+    return table
+
+
 def cube_distance(cube1: Cube, cube2: Cube) -> int:
     """
     Distance between two tiles in cubic coordinates
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from random import randint, choice
-from typing import TYPE_CHECKING
+from array import array
+from itertools import compress
+from operator import add
+from random import randint, random, sample
+from typing import List, Optional, TYPE_CHECKING
 
 from pygame import draw, Surface
 
 from constants.colors import colors
 from constants.constants import margin, wind_min_count, conditions_min_count
 from constants.enums import Conditions
-from utilities import direction_angle, get_neighbor
+from utilities import direction_angle, neighbor_offsets
 
 if TYPE_CHECKING:
     from game_map import GameMap
@@ -141,18 +144,24 @@ class Weather:
                 self.game_map.engine.message_log.add_message(text, text_color='grass')
     
     def roll_mist(self, game_map: GameMap):
-        new_mist = []
+        """
+        Blows the mist one hex downwind, brings new mist in at the upwind edges and then moves the amount of mist
+            toward the chance of mist for the time of day and weather, by adding or clearing random cells
+        Works on the whole mist plane at once, so a turn costs the same however much mist there is
+        :param game_map: the GameMap
+        :return: None
+        """
         tod_mist = self.game_map.engine.time.get_time_of_day_info['mist']
         weather_mist = weather_effects[self.game_map.weather.conditions]['mist']
         mist_chance = tod_mist + weather_mist
         
+        mist_plane = game_map.terrain.mist
+        game_map.terrain.mist_generation += 1
+        width = game_map.width
+        height = game_map.height
         if self.wind_direction is not None:
             # move mist with wind
-            for x in range(game_map.width):
-                for y in range(game_map.height):
-                    if game_map.terrain[x][y].mist:
-                        new_mist.append(get_neighbor(x, y, self.wind_direction))
-                    game_map.terrain[x][y].mist = False
+            mist_plane[:] = shift_plane(mist_plane, width, height, self.wind_direction)
             # add new mist at edges:
             bottom = True if self.wind_direction in [0, 1, 5] else False
             left = True if self.wind_direction in [1, 2] else False
@@ -160,94 +169,129 @@ class Weather:
             right = True if self.wind_direction in [4, 5] else False
             
             if top:
-                for x in range(game_map.width):
-                    mist = True if randint(0, 99) < mist_chance else False
-                    if mist:
-                        new_mist.append((x, 0))
+                for x in edge_spawns(width, mist_chance):
+                    mist_plane[x * height] = 1
             if right:
-                for y in range(game_map.height):
-                    mist = True if randint(0, 99) < mist_chance else False
-                    if mist:
-                        new_mist.append((game_map.width - 1, y))
+                for y in edge_spawns(height, mist_chance):
+                    mist_plane[(width - 1) * height + y] = 1
             if bottom:
-                for x in range(game_map.width):
-                    mist = True if randint(0, 99) < mist_chance else False
-                    if mist:
-                        new_mist.append((x, game_map.height - 1))
+                for x in edge_spawns(width, mist_chance):
+                    mist_plane[x * height + height - 1] = 1
             if left:
-                for y in range(game_map.height):
-                    mist = True if randint(0, 99) < mist_chance else False
-                    if mist:
-                        new_mist.append((0, y))
-        else:
-            # else collect mist without moving
-            for x in range(game_map.width):
-                for y in range(game_map.height):
-                    if game_map.terrain[x][y].mist:
-                        new_mist.append((x, y))
-                    game_map.terrain[x][y].mist = False
+                for y in edge_spawns(height, mist_chance):
+                    mist_plane[y] = 1
         
         # adjust mist toward current %
+        size = len(mist_plane)
         mist_target = mist_chance * 100
-        mist_actual = (len(new_mist) * 10000) // (game_map.width * game_map.height)
+        mist_actual = (mist_plane.count(1) * 10000) // size
         mist_change = abs((mist_target - mist_actual) // 10)
         if mist_target > mist_actual:
-            for i in range(mist_change):  # might hit a tile with mist already, but who cares?
-                pick_x = randint(0, game_map.width - 1)
-                pick_y = randint(0, game_map.width - 1)
-                if (pick_x, pick_y) not in new_mist:
-                    new_mist.append((pick_x, pick_y))
+            for index in sample(range(size), min(mist_change, size)):  # might hit a tile with mist already
+                mist_plane[index] = 1
         else:
-            for i in range(mist_change):
-                pick = choice(new_mist)
-                new_mist.remove(pick)
-        
-        # add new fog to terrain
-        for x, y in new_mist:
-            if game_map.in_bounds(x, y):
-                game_map.terrain[x][y].mist = True
+            misty = list(compress(range(size), mist_plane))
+            for index in sample(misty, min(mist_change, len(misty))):
+                mist_plane[index] = 0
+
+
+"""
+(dx, dy) step to the neighbor in each direction, for even and odd columns (see utilities.neighbor_offsets)
+"""
+parity_offsets = neighbor_offsets()
+
+
+def shift_plane(plane: bytearray, width: int, height: int, direction: int) -> bytearray:
+    """
+    Moves every cell of a plane to its neighbor in a direction, a whole column slice at a time - the step only
+        depends on the parity of the column. Cells moved off the map are lost, cells moved from off the map are 0
+    :param plane: bytearray with one byte per cell id (x * height + y)
+    :param width: int map width
+    :param height: int map height
+    :param direction: int direction to move in
+    :return: bytearray of the moved plane
+    """
+    shifted = bytearray(len(plane))
+    for x in range(width):
+        dx, dy = parity_offsets[x % 2][direction]
+        target = x + dx
+        if not 0 <= target < width:
+            continue
+        if dy >= 0:
+            shifted[target * height + dy:(target + 1) * height] = plane[x * height:(x + 1) * height - dy]
+        else:
+            shifted[target * height:(target + 1) * height + dy] = plane[x * height - dy:(x + 1) * height]
+    return shifted
+
+
+def edge_spawns(length: int, chance: int) -> List[int]:
+    """
+    Picks the cells along a map edge where new mist blows in
+    :param length: int number of cells along the edge
+    :param chance: int % chance of mist in each cell
+    :return: list of positions along the edge
+    """
+    return [position for position in range(length) if random() * 100 < chance]
 
 
 class Rain:
-    def __init__(self, view_width, view_height):
+    def __init__(self, view_width, view_height, count: int = 100):
+        """
+        Rain drops falling over the viewport - each drop is a line of its speed in length, falling its length every
+            frame. Drop state lives in flat arrays and the rain is drawn on one surface that is reused every frame
+        :param view_width: int width of the viewport
+        :param view_height: int height of the viewport
+        :param count: int number of drops
+        """
         self.width = view_width - 2 * margin
         self.height = view_height - 2 * margin
-        self.locations = self.gen_locations()
+        self.xs = array('i', [0]) * count
+        self.ys = array('i', [0]) * count
+        self.speeds = array('i', [0]) * count
+        self.gen_locations()
+        self.surface: Optional[Surface] = None
     
-    # Loop 50 times and add an object in a random x,y position
     def gen_locations(self):
-        locations = []
-        for i in range(100):
-            x = randint(0, self.width - 1)
-            y = randint(0, self.height - 1)
-            s = randint(10, 20)
-            locations.append((x, y, s))
-        return locations
+        for i in range(len(self.xs)):
+            self.xs[i] = randint(0, self.width - 1)
+            self.ys[i] = randint(0, self.height - 1)
+            self.speeds[i] = randint(10, 20)
+    
+    def fall(self):
+        """
+        Moves every drop down by its speed in one pass over the arrays, then starts the drops that passed the bottom
+            of the viewport over at the top, in a new column at a new speed
+        """
+        ys = self.ys
+        ys[:] = array('i', map(add, ys, self.speeds))
+        height = self.height
+        for i in compress(range(len(ys)), [y > height for y in ys]):
+            self.xs[i] = randint(0, self.width - 1)
+            ys[i] = self.speeds[i] = randint(10, 20)
     
     def render(self, console, conditions):
-        rain_surf = Surface((console.get_width(), console.get_height()))
-        rain_surf.fill(colors['dk_gray'])
         if conditions == Conditions.RAINY:
             alpha = 50
+            background = colors['dk_gray']
         elif conditions == Conditions.STORMY:
             if randint(0, 100) == 0:
                 alpha = 255
-                rain_surf.fill(colors['lt_gray'])
+                background = colors['lt_gray']
             else:
                 alpha = 80
+                background = colors['dk_gray']
         else:
-            alpha = 0
+            # nothing would show, so drops do not move while the sky is clear
+            return
+        
+        rain_surf = self.surface
+        if rain_surf is None or rain_surf.get_size() != console.get_size():
+            rain_surf = self.surface = Surface(console.get_size())
+        rain_surf.fill(background)
         rain_surf.set_alpha(alpha)
         
-        new_loc = []
-        for x, y, s in self.locations:
-            # Draw the line
-            draw.line(rain_surf, colors['white'], (x, y), (x, y - s), 1)
-            # reset if past bottom of viewport
-            if y + s > self.height:
-                x = randint(0, self.width - 1)
-                y = 0
-                s = randint(10, 20)
-            new_loc.append((x, y + s, s))
-        self.locations = new_loc
+        white = colors['white']
+        for x, y, s in zip(self.xs, self.ys, self.speeds):
+            draw.line(rain_surf, white, (x, y), (x, y - s), 1)
+        self.fall()
         console.blit(rain_surf, (0, 0))